@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+아파트 단지 마스터(apt_mst_info) bjd_cd 정렬 색인
+
+전국 apt_mst_info DBF를 스크립트마다 전부 디코딩한 뒤 bjd_cd로 거르지 않도록,
+한 번 스캔해 레코드를 bjd_cd 순으로 정렬한 색인(`.aptidx`)을 원본 옆에 저장합니다.
+
+- 색인에는 정렬된 bjd_cd, 원래 레코드 번호, 정렬 순서의 DBF 레코드 바이트,
+  SHP 포인트 좌표(SHX 오프셋으로 레코드 번호마다 읽음), 시군구(5자리)별 범위 표가 들어갑니다.
+- 한 지역 질의는 범위 표와 이진 탐색으로 구간을 찾고 그 구간의 레코드만 디코딩합니다.
+- 속성과 좌표는 같은 레코드 번호로 묶여 있어, 필터링한 레이어 피처와 DBF 행을
+  순서대로 짝짓다가 어긋나는 일이 없습니다.
+- ZIP(apt_mst_info_YYYYMM_shp.zip) 또는 압축을 푼 .shp 경로 모두 사용할 수 있고,
+  원본의 크기나 수정 시각이 바뀌면 색인을 다시 만듭니다.
+
+사용 예:
+    index = AptMasterIndex.load_or_build('data/apt_mst_info_202410_shp.zip')
+    for record_no, record, point in index.find('1165'):     # 서초구
+        record['apt_nm'], record['bjd_cd'], point           # point: (x, y) 또는 None
+
+    python scripts/apt_master.py data/apt_mst_info_202410_shp.zip --prefix 1165
+"""
+
+import argparse
+import bisect
+import math
+import os
+import pickle
+import struct
+import sys
+import time
+import zipfile
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dbf_reader import DBFHeader, decode_record
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.aptidx'
+
+# 정렬 키 필드
+KEY_FIELD = 'bjd_cd'
+
+# 범위 표 단위 (시군구 코드 자리수)
+SGG_DIGITS = 5
+
+# x, y가 콘텐츠 앞에 있는 shape type (Point, PointZ, PointM)
+POINT_TYPES = (1, 11, 21)
+
+# (레코드 번호, 레코드, (x, y) 또는 None)
+AptRecord = Tuple[int, Dict, Optional[Tuple[float, float]]]
+
+
+def _source_signature(source: Path) -> Tuple:
+    """원본(ZIP 또는 .shp/.shx/.dbf)의 (크기, 수정 시각) 서명"""
+    paths = [source] if source.suffix.lower() == '.zip' else \
+        [source.with_suffix(suffix) for suffix in ('.shp', '.shx', '.dbf')]
+    signature = []
+    for path in paths:
+        stat = path.stat()
+        signature.append((path.suffix, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def _read_source(source: Path) -> Tuple[bytes, bytes, bytes]:
+    """원본의 (DBF, SHP, SHX) 바이트"""
+    if source.suffix.lower() != '.zip':
+        return tuple(source.with_suffix(suffix).read_bytes() for suffix in ('.dbf', '.shp', '.shx'))
+
+    with zipfile.ZipFile(source, 'r') as zf:
+        members = {}
+        for name in zf.namelist():
+            suffix = Path(name).suffix.lower()
+            if suffix in ('.dbf', '.shp', '.shx'):
+                members.setdefault(suffix, name)
+        missing = [suffix for suffix in ('.dbf', '.shp', '.shx') if suffix not in members]
+        if missing:
+            raise FileNotFoundError(f"ZIP에 {', '.join(missing)} 파일이 없습니다: {source}")
+        return tuple(zf.read(members[suffix]) for suffix in ('.dbf', '.shp', '.shx'))
+
+
+def _shp_points(shp: bytes, shx: bytes, count: int) -> array:
+    """SHX 오프셋으로 레코드별 포인트 (x, y) 평탄화 배열 (포인트가 아니면 NaN)"""
+    entries = min(count, (len(shx) - 100) // 8)
+    offsets = struct.unpack(f'>{entries * 2}i', shx[100:100 + entries * 8])[0::2]
+    points = array('d')
+    nan_point = (math.nan, math.nan)
+    for offset in offsets:
+        pos = offset * 2 + 8
+        if pos + 20 <= len(shp) and struct.unpack_from('<i', shp, pos)[0] in POINT_TYPES:
+            points.extend(struct.unpack_from('<2d', shp, pos + 4))
+        else:
+            points.extend(nan_point)
+    for _ in range(count - entries):
+        points.extend(nan_point)
+    return points
+
+
+class AptMasterIndex:
+    """bjd_cd 순으로 정렬한 단지 마스터 색인"""
+
+    def __init__(self, source: Path, signature: Tuple, dbf_header: DBFHeader,
+                 keys: List[str], record_numbers: array, records: bytes, points: array,
+                 sgg_ranges: Dict[str, Tuple[int, int]]):
+        """
+        Args:
+            source: 원본 ZIP 또는 .shp 경로
+            signature: 색인 생성 시점의 원본 서명
+            dbf_header: 원본 DBF 헤더
+            keys: 정렬된 bjd_cd (삭제된 레코드 제외)
+            record_numbers: keys 순서의 원래 레코드 번호 (SHP 레코드 번호와 같음)
+            records: keys 순서의 DBF 레코드 바이트 (레코드 길이 고정)
+            points: keys 순서의 (x, y) 평탄화 배열 (포인트가 없으면 NaN)
+            sgg_ranges: 시군구 코드 → keys 범위 [시작, 끝)
+        """
+        self.source = Path(source)
+        self.signature = signature
+        self.dbf_header = dbf_header
+        self.keys = keys
+        self.record_numbers = record_numbers
+        self.records = records
+        self.points = points
+        self.sgg_ranges = sgg_ranges
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def index_path_for(source: Path) -> Path:
+        """색인 파일 경로 (원본 옆)"""
+        return Path(source).with_suffix(INDEX_SUFFIX)
+
+    def is_stale(self) -> bool:
+        """원본이 색인 생성 후 바뀌었는지 여부"""
+        try:
+            return _source_signature(self.source) != self.signature
+        except OSError:
+            return True
+
+    @classmethod
+    def build(cls, source: str) -> 'AptMasterIndex':
+        """원본 DBF/SHP/SHX를 한 번 읽어 색인 생성"""
+        source = Path(source)
+        signature = _source_signature(source)
+        dbf, shp, shx = _read_source(source)
+
+        header = DBFHeader.parse(dbf)
+        if KEY_FIELD not in header.field_map:
+            raise KeyError(f"DBF에 '{KEY_FIELD}' 필드가 없습니다: {source}")
+        _, key_len, key_offset = header.field_map[KEY_FIELD]
+        record_len = header.record_len
+
+        entries = []
+        for idx in range(header.num_records):
+            pos = header.header_len + idx * record_len
+            if pos + record_len > len(dbf):
+                break
+            if dbf[pos] == 0x2A:  # 삭제된 레코드
+                continue
+            key = dbf[pos + key_offset:pos + key_offset + key_len].decode('ascii', errors='ignore').strip()
+            if key.endswith('.0'):  # 숫자 필드로 저장된 bjd_cd
+                key = key[:-2]
+            entries.append((key, idx))
+        entries.sort()
+
+        all_points = _shp_points(shp, shx, header.num_records)
+        keys = [key for key, _ in entries]
+        record_numbers = array('i', (idx for _, idx in entries))
+        records = b''.join(dbf[header.header_len + idx * record_len:
+                               header.header_len + (idx + 1) * record_len] for _, idx in entries)
+        points = array('d')
+        for _, idx in entries:
+            points.extend(all_points[idx * 2:idx * 2 + 2])
+
+        sgg_ranges = {}
+        for position, key in enumerate(keys):
+            sgg = key[:SGG_DIGITS]
+            start, _ = sgg_ranges.get(sgg, (position, position))
+            sgg_ranges[sgg] = (start, position + 1)
+
+        return cls(source, signature, header, keys, record_numbers, records, points, sgg_ranges)
+
+    @classmethod
+    def load(cls, source: str) -> Optional['AptMasterIndex']:
+        """저장된 색인 로드 (없거나 오래되었거나 형식이 다르면 None)"""
+        index_path = cls.index_path_for(source)
+        if not index_path.exists():
+            return None
+        try:
+            with open(index_path, 'rb') as f:
+                version, index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return None
+        if version != INDEX_VERSION:
+            return None
+        index.source = Path(source)
+        if index.is_stale():
+            return None
+        return index
+
+    def save(self) -> Optional[Path]:
+        """색인 저장 (원본 디렉토리에 쓸 수 없으면 None)"""
+        index_path = self.index_path_for(self.source)
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((INDEX_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"⚠ 색인 저장 실패 (메모리에서만 사용): {e}")
+            return None
+        return index_path
+
+    @classmethod
+    def load_or_build(cls, source: str) -> 'AptMasterIndex':
+        """저장된 색인을 읽고, 없거나 오래되었으면 새로 만들어 저장"""
+        index = cls.load(source)
+        if index is not None:
+            return index
+
+        print(f"🔨 단지 마스터 색인 생성 중: {source}")
+        index = cls.build(source)
+        saved = index.save()
+        if saved:
+            print(f"✓ 색인 저장: {saved} ({len(index):,}개 단지)")
+        return index
+
+    # ------------------------------------------------------------------
+    # 조회
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """bjd_cd가 prefix로 시작하는 정렬 위치 범위 [시작, 끝)"""
+        if len(prefix) >= SGG_DIGITS:
+            low, high = self.sgg_ranges.get(prefix[:SGG_DIGITS], (0, 0))
+        else:
+            low, high = 0, len(self.keys)
+        start = bisect.bisect_left(self.keys, prefix, low, high)
+        stop = bisect.bisect_left(self.keys, prefix + '\uffff', start, high)
+        return start, stop
+
+    def find(self, prefix: str, encoding: str = 'cp949',
+             fields: Optional[Sequence[str]] = None) -> List[AptRecord]:
+        """
+        bjd_cd 접두사(시도/시군구/법정동)에 해당하는 단지
+
+        Args:
+            prefix: bjd_cd 접두사 (예: '1165' 서초구, '1165010800' 서초동)
+            encoding: 문자 필드 인코딩
+            fields: 돌려줄 필드 (None이면 전체)
+
+        Returns:
+            [(레코드 번호, 레코드, (x, y) 또는 None)] - bjd_cd 순 (같은 bjd_cd는 레코드 번호 순)
+        """
+        start, stop = self.prefix_range(prefix)
+        record_len = self.dbf_header.record_len
+        results = []
+        for position in range(start, stop):
+            rec = self.records[position * record_len:(position + 1) * record_len]
+            record = decode_record(rec, self.dbf_header, encoding)
+            if fields is not None:
+                record = {name: record.get(name) for name in fields}
+            x, y = self.points[position * 2:position * 2 + 2]
+            point = None if math.isnan(x) else (x, y)
+            results.append((self.record_numbers[position], record, point))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='아파트 단지 마스터 bjd_cd 색인 조회')
+    parser.add_argument('source', help='apt_mst_info SHP ZIP 또는 .shp 경로')
+    parser.add_argument('--prefix', default='1165', help='bjd_cd 접두사 (기본값: 1165 서초구)')
+    parser.add_argument('--rebuild', action='store_true', help='색인 다시 만들기')
+    parser.add_argument('--sample', type=int, default=5, help='출력할 단지 수 (기본값: 5)')
+    args = parser.parse_args()
+
+    # 스크립트로 실행해도 색인은 모듈 클래스로 저장 (다른 스크립트에서 그대로 로드)
+    from apt_master import AptMasterIndex as index_class
+
+    started = time.perf_counter()
+    if args.rebuild:
+        index = index_class.build(args.source)
+        index.save()
+    else:
+        index = index_class.load_or_build(args.source)
+    print(f"📂 색인: {len(index):,}개 단지, 시군구 {len(index.sgg_ranges):,}개 "
+          f"({time.perf_counter() - started:.3f}초)")
+
+    started = time.perf_counter()
+    complexes = index.find(args.prefix)
+    elapsed = time.perf_counter() - started
+    located = sum(1 for _, _, point in complexes if point)
+    print(f"✅ bjd_cd {args.prefix}*: {len(complexes):,}개 단지 (좌표 {located:,}개), {elapsed * 1000:.1f}ms")
+    for record_no, record, point in complexes[:args.sample]:
+        where = f"({point[0]:.6f}, {point[1]:.6f})" if point else '좌표 없음'
+        print(f"   #{record_no} {record.get('apt_nm')} [{record.get(KEY_FIELD)}] {where}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
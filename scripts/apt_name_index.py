@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+아파트 단지명 n-gram 역색인 (유사 이름 검색)
+
+단지명을 정규화(공백/'아파트'/단지 번호/괄호 설명 제거, 'N차' → 'N')한 뒤 문자 2-gram
+역색인을 만들고, 질의 이름과 gram을 공유하는 후보만 IDF 가중 Jaccard로
+점수를 매겨 상위 k개를 돌려줍니다. 모든 이름 쌍을 비교하는 difflib 방식과 달리
+질의 비용이 공유 gram의 게시 목록 길이에만 비례합니다.
+
+항목은 범위 코드(bjd_cd, 지역코드 등) 순으로 정렬해 두므로, 범위 접두사
+(예: '1165' 서초구, '1165010700' 반포동)로 질의하면 각 게시 목록에서 이분 탐색으로
+해당 구간만 읽습니다.
+
+사용 예:
+    index = AptNameIndex((rec['apt_nm'], rec['bjd_cd'], rec) for rec in records)
+    for rec, score in index.query('래미안 퍼스티지', scope='1165', k=3):
+        print(rec['apt_nm'], score)
+
+벤치마크 (전국 apt_mst_info 단지명):
+    python scripts/apt_name_index.py bench data/apt_mst_info_202410_shp.zip --queries 2000
+"""
+
+import math
+import re
+import sys
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dbf_reader import scan_dbf
+
+# 괄호 안 설명 "(주상복합)", "[101동]"
+_BRACKETS = re.compile(r'[(\[{][^)\]}]*[)\]}]')
+# 단지 번호 "1단지", "제2단지"
+_COMPLEX_NO = re.compile(r'제?(\d+)단지')
+# 차수 "신반포2차" (실거래가 단지명은 "신반포2")
+_PHASE = re.compile(r'(\d+)차')
+# 한글/영문/숫자 외 문자
+_NON_WORD = re.compile(r'[^0-9a-z가-힣]')
+
+# 유사도 최저 점수 (이보다 낮은 후보는 버림)
+DEFAULT_MIN_SCORE = 0.2
+# 양쪽 모두 단지 번호가 있는데 서로 다를 때 점수 배율 (1단지 ↔ 2단지)
+COMPLEX_NO_PENALTY = 0.5
+
+
+def normalize_apt_name(name: str) -> str:
+    """
+    단지명 정규화 (검색용)
+
+    '래미안 퍼스티지 아파트' → '래미안퍼스티지', '잠원동아1단지' → '잠원동아',
+    '신반포2차' → '신반포2'
+    """
+    text = unicodedata.normalize('NFKC', name or '').lower()
+    text = _BRACKETS.sub('', text)
+    text = _NON_WORD.sub('', text).replace('아파트', '')
+    text = _PHASE.sub(r'\1', text)
+    # 단지 번호만 있는 이름("1단지")은 그대로 둠
+    return _COMPLEX_NO.sub('', text) or text
+
+
+def complex_number(name: str) -> str:
+    """단지 번호 ('서초포레스타5단지' → '5', 없으면 '')"""
+    match = _COMPLEX_NO.search(_NON_WORD.sub('', unicodedata.normalize('NFKC', name or '')))
+    return match.group(1) if match else ''
+
+
+def name_grams(normalized: str) -> List[str]:
+    """정규화된 이름 → 문자 2-gram (앞뒤 경계 표시 포함, 한 글자 이름도 색인)"""
+    padded = f"^{normalized}$"
+    return sorted({padded[i:i + 2] for i in range(len(padded) - 1)})
+
+
+def _plain(name: str) -> str:
+    """동점 처리용 비교 문자열 (공백만 제거, 단지 번호 유지)"""
+    return (name or '').replace(' ', '').lower()
+
+
+class AptNameIndex:
+    """
+    단지명 2-gram 역색인
+
+    Args:
+        entries: (단지명, 범위 코드, 값) 반복자. 값은 질의 결과로 돌려줄 객체
+                 (None이면 단지명)
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Any]]):
+        items = []
+        for name, scope, value in entries:
+            if not name:
+                continue
+            items.append((str(scope or ''), name, name if value is None else value))
+        # 범위 코드 순 정렬 → 항목 번호가 범위 구간과 일치
+        items.sort(key=lambda item: item[0])
+
+        self.scopes: List[str] = [scope for scope, _, _ in items]
+        self.names: List[str] = [name for _, name, _ in items]
+        self.values: List[Any] = [value for _, _, value in items]
+        self.complex_nos: List[str] = [complex_number(name) for name in self.names]
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        entry_grams = []
+        for idx, name in enumerate(self.names):
+            grams = name_grams(normalize_apt_name(name))
+            entry_grams.append(grams)
+            for gram in grams:
+                postings[gram].append(idx)  # 항목 번호 순으로 쌓임
+
+        total = max(len(items), 1)
+        self.postings: Dict[str, List[int]] = dict(postings)
+        self.idf: Dict[str, float] = {gram: math.log(1 + total / len(ids))
+                                      for gram, ids in postings.items()}
+        self.weights: List[float] = [sum(self.idf[g] for g in grams) for grams in entry_grams]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def scope_range(self, scope: str = '') -> Tuple[int, int]:
+        """범위 접두사에 해당하는 항목 번호 구간 [lo, hi)"""
+        if not scope:
+            return 0, len(self.scopes)
+        lo = bisect_left(self.scopes, scope)
+        hi = bisect_right(self.scopes, scope + '\uffff', lo)
+        return lo, hi
+
+    def candidates(self, name: str, scope: str = '') -> Dict[int, float]:
+        """질의와 gram을 공유하는 항목 → IDF 가중 Jaccard 점수"""
+        grams = name_grams(normalize_apt_name(name))
+        lo, hi = self.scope_range(scope)
+        if lo >= hi:
+            return {}
+
+        shared: Dict[int, float] = defaultdict(float)
+        query_weight = 0.0
+        for gram in grams:
+            weight = self.idf.get(gram)
+            if weight is None:
+                # 색인에 없는 gram: 분모에만 기여 (최대 IDF와 같은 희귀도로 취급)
+                query_weight += math.log(1 + max(len(self.names), 1))
+                continue
+            query_weight += weight
+            ids = self.postings[gram]
+            start = bisect_left(ids, lo) if lo else 0
+            stop = bisect_left(ids, hi, start) if hi < len(self.names) else len(ids)
+            for idx in ids[start:stop]:
+                shared[idx] += weight
+
+        weights = self.weights
+        return {idx: inter / (query_weight + weights[idx] - inter)
+                for idx, inter in shared.items()}
+
+    def query(self, name: str, scope: str = '', k: int = 5,
+              min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[Any, float]]:
+        """
+        유사한 단지 상위 k개 [(값, 점수)] (점수 0~1, 높은 순)
+
+        단지 번호는 정규화에서 빠지므로, 양쪽 모두 단지 번호가 있고 서로 다르면
+        점수를 COMPLEX_NO_PENALTY 배로 낮춥니다. 점수가 같은 후보는 원래 이름의
+        문자열 유사도로 순서를 정합니다.
+        """
+        scores = self.candidates(name, scope)
+        if not scores:
+            return []
+        pool = sorted((idx for idx, score in scores.items() if score >= min_score),
+                      key=lambda idx: scores[idx], reverse=True)[:max(k * 4, k + 8)]
+
+        number = complex_number(name)
+        if number:
+            for idx in pool:
+                if self.complex_nos[idx] and self.complex_nos[idx] != number:
+                    scores[idx] *= COMPLEX_NO_PENALTY
+            pool = [idx for idx in pool if scores[idx] >= min_score]
+
+        plain = _plain(name)
+        ranked = sorted(pool, key=lambda idx: (round(scores[idx], 6),
+                                               SequenceMatcher(None, plain, _plain(self.names[idx])).ratio()),
+                        reverse=True)
+        return [(self.values[idx], scores[idx]) for idx in ranked[:k]]
+
+    def best(self, name: str, scope: str = '',
+             min_score: float = DEFAULT_MIN_SCORE) -> Optional[Tuple[Any, float]]:
+        """가장 유사한 단지 (없으면 None)"""
+        result = self.query(name, scope, k=1, min_score=min_score)
+        return result[0] if result else None
+
+
+def _load_master_names(path: str) -> List[Tuple[str, str]]:
+    """apt_mst_info DBF(또는 SHP ZIP)에서 (단지명, bjd_cd) 목록"""
+    if path.lower().endswith('.zip'):
+        import zipfile
+        with zipfile.ZipFile(path) as zf:
+            member = next(n for n in zf.namelist() if n.lower().endswith('.dbf'))
+            source = zf.read(member)
+    else:
+        source = path
+    records = scan_dbf(source, fields=['apt_nm', 'bjd_cd'])
+    return [(rec['apt_nm'], str(rec['bjd_cd'] or '')) for rec in records.values() if rec['apt_nm']]
+
+
+def _variant(name: str, i: int) -> str:
+    """질의용 이름 변형 (실거래가 단지명과 단지 마스터명의 차이를 흉내)"""
+    kind = i % 4
+    if kind == 0:
+        return name + ' 아파트'
+    if kind == 1:
+        return ' '.join(name)
+    if kind == 2 and len(name) > 3:
+        return name[1:]
+    return name
+
+
+def benchmark(path: str, num_queries: int = 1000, brute_queries: int = 50, k: int = 5):
+    """전국 단지명 색인 생성/질의 시간과 difflib 전수 비교 대비 속도"""
+    started = time.perf_counter()
+    master = _load_master_names(path)
+    print(f"📂 {path}: 단지 {len(master):,}개 ({time.perf_counter() - started:.2f}초)")
+
+    started = time.perf_counter()
+    index = AptNameIndex((name, bjd_cd, (name, bjd_cd)) for name, bjd_cd in master)
+    build = time.perf_counter() - started
+    print(f"   색인 생성: {build:.2f}초, gram {len(index.postings):,}개")
+
+    step = max(1, len(master) // max(num_queries, 1))
+    samples = master[::step][:num_queries]
+
+    results = {}
+    for label, scope_len in (('전국', 0), ('시군구', 5), ('법정동', 10)):
+        hits = 0
+        started = time.perf_counter()
+        for i, (name, bjd_cd) in enumerate(samples):
+            top = index.query(_variant(name, i), scope=bjd_cd[:scope_len], k=k)
+            hits += any(value == (name, bjd_cd) for value, _ in top)
+        elapsed = time.perf_counter() - started
+        results[label] = elapsed / len(samples)
+        print(f"   질의({label} 범위): {len(samples):,}건 {elapsed:.2f}초 "
+              f"({elapsed / len(samples) * 1000:.2f}ms/건), 상위 {k}개 내 정답 {hits / len(samples):.1%}")
+
+    # difflib 전수 비교 (기존 방식) - 일부 질의만 측정해 건당 시간 추정
+    brute = samples[:brute_queries]
+    started = time.perf_counter()
+    for i, (name, _) in enumerate(brute):
+        query = _plain(_variant(name, i))
+        max(master, key=lambda item: SequenceMatcher(None, query, _plain(item[0])).ratio())
+    per_query = (time.perf_counter() - started) / max(len(brute), 1)
+    print(f"   difflib 전수 비교: {per_query * 1000:.1f}ms/건 "
+          f"(색인 전국 범위 대비 {per_query / results['전국']:.0f}배, "
+          f"시군구 범위 대비 {per_query / results['시군구']:.0f}배)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='아파트 단지명 n-gram 색인')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    bench = sub.add_parser('bench', help='전국 단지명 색인 생성/질의 벤치마크')
+    bench.add_argument('source', help='apt_mst_info DBF 또는 SHP ZIP 경로')
+    bench.add_argument('--queries', type=int, default=1000, help='질의 수 (기본값: 1000)')
+    bench.add_argument('--brute', type=int, default=50, help='difflib 전수 비교 질의 수 (기본값: 50)')
+    bench.add_argument('-k', type=int, default=5, help='상위 후보 수 (기본값: 5)')
+
+    search = sub.add_parser('search', help='단지명 검색')
+    search.add_argument('source', help='apt_mst_info DBF 또는 SHP ZIP 경로')
+    search.add_argument('name', help='검색할 단지명')
+    search.add_argument('--scope', default='', help='bjd_cd 접두사 (예: 1165)')
+    search.add_argument('-k', type=int, default=5, help='상위 후보 수 (기본값: 5)')
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        benchmark(args.source, args.queries, args.brute, args.k)
+    else:
+        index = AptNameIndex((name, bjd_cd, (name, bjd_cd)) for name, bjd_cd in _load_master_names(args.source))
+        for (name, bjd_cd), score in index.query(args.name, args.scope, args.k):
+            print(f"{score:.3f}  {bjd_cd}  {name}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+지적도 자동화 파이프라인 벤치마크
+
+합성 연속지적도 데이터셋(generate_synthetic_cadastral.py)에서 CadastralAutomation의
+1~3단계(필지 추출, 면적 계산, 웹맵 생성)를 크기별로 측정하고, 커밋 간 비교를 위해
+결과를 JSON으로 저장합니다.
+
+사용법:
+    # 1만/10만/100만 필지 측정 (데이터셋은 처음 한 번만 생성)
+    python scripts/benchmark_pipeline.py
+
+    # 특정 크기만 측정하고 이전 결과와 비교
+    python scripts/benchmark_pipeline.py --sizes 10000 100000 --compare output/benchmarks/bench_abc1234.json
+
+결과:
+    output/benchmarks/bench_<커밋>.json
+    output/benchmarks/latest.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DATA_DIR, OUTPUT_DIR
+from cadastral_auto import CadastralAutomation
+from generate_synthetic_cadastral import generate_dataset
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def git_commit() -> str:
+    """현재 커밋 해시 (짧은 형식, git 없으면 'unknown')"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                capture_output=True, text=True, timeout=10)
+        commit = result.stdout.strip()
+        if not commit:
+            return 'unknown'
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               cwd=project_root, capture_output=True, text=True, timeout=10)
+        return commit + ('-dirty' if dirty.stdout.strip() else '')
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+def ensure_dataset(size: int, data_dir: Path, seed: int) -> Path:
+    """합성 데이터셋 준비 (이미 있으면 재사용), 설정 파일 경로 반환"""
+    dataset_dir = data_dir / f"{size}_seed{seed}"
+    config_path = dataset_dir / 'config.yaml'
+    if config_path.exists():
+        return config_path
+
+    print(f"📦 합성 데이터셋 생성: {size:,}필지 → {dataset_dir}")
+    summary = generate_dataset(size, dataset_dir, seed=seed)
+    return summary['config']
+
+
+def run_once(config_path: Path, verbose: bool = False) -> List[Dict]:
+    """1~3단계를 순차 실행하고 단계별 측정값 반환"""
+    automation = CadastralAutomation(str(config_path))
+    sink = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    with sink:
+        with automation.metrics.measure('extract', '1단계 필지 추출'):
+            parcels = automation.step1_extract_parcels()
+        with automation.metrics.measure('areas', '2단계 면적 계산'):
+            automation.step2_calculate_areas(parcels)
+        with automation.metrics.measure('webmap', '3단계 웹맵 생성'):
+            automation.step3_create_webmap(parcels)
+
+    return [step.to_dict() for step in automation.metrics.steps.values()]
+
+
+def run_benchmark(sizes: List[int], data_dir: Path, seed: int = 42,
+                  repeat: int = 1, verbose: bool = False) -> Dict:
+    """크기별 벤치마크 실행 (반복 시 단계별 최소 경과 시간 기록)"""
+    results = []
+    for size in sizes:
+        config_path = ensure_dataset(size, data_dir, seed)
+        print(f"\n⏱  {size:,}필지 측정 중 ({repeat}회)...")
+
+        best = None
+        for _ in range(repeat):
+            steps = run_once(config_path, verbose)
+            if best is None:
+                best = steps
+            else:
+                best = [min(a, b, key=lambda s: s['wall_time']) for a, b in zip(best, steps)]
+
+        for step in best:
+            print(f"   {step['label']}: {step['wall_time']:.3f}초 "
+                  f"(CPU {step['cpu_time']:.3f}초, 레코드 {step['records_scanned']:,})")
+        results.append({'size': size, 'steps': best})
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def save_results(report: Dict, results_dir: Path) -> Path:
+    """벤치마크 결과 저장 (커밋별 파일 + latest.json)"""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"bench_{report['commit']}.json"
+    for target in (path, results_dir / 'latest.json'):
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare_results(current: Dict, baseline: Dict):
+    """두 벤치마크 결과의 단계별 경과 시간 비교 출력"""
+    def index(report):
+        return {(r['size'], s['step']): s for r in report['results'] for s in r['steps']}
+
+    base = index(baseline)
+    print(f"\n📊 비교: {baseline['commit']} → {current['commit']}")
+    print(f"  {'필지':>10} {'단계':<10} {'이전(초)':>10} {'현재(초)':>10} {'배율':>8}")
+    for (size, step), metrics in index(current).items():
+        previous = base.get((size, step))
+        if previous is None:
+            print(f"  {size:>10,} {step:<10} {'-':>10} {metrics['wall_time']:>10.3f} {'-':>8}")
+            continue
+        ratio = metrics['wall_time'] / previous['wall_time'] if previous['wall_time'] else float('inf')
+        marker = ' ⚠' if ratio > 1.1 else ''
+        print(f"  {size:>10,} {step:<10} {previous['wall_time']:>10.3f} "
+              f"{metrics['wall_time']:>10.3f} {ratio:>7.2f}x{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지적도 자동화 파이프라인 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='측정할 필지 수 (기본값: 10000 100000 1000000)')
+    parser.add_argument('--data-dir', default=str(DATA_DIR / 'synthetic'),
+                        help='합성 데이터셋 디렉토리 (기본값: data/synthetic)')
+    parser.add_argument('--results-dir', default=str(OUTPUT_DIR / 'benchmarks'),
+                        help='결과 저장 디렉토리 (기본값: output/benchmarks)')
+    parser.add_argument('--seed', type=int, default=42, help='데이터셋 난수 시드 (기본값: 42)')
+    parser.add_argument('--repeat', type=int, default=1, help='크기별 반복 횟수 (기본값: 1)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 경로')
+    parser.add_argument('--verbose', '-v', action='store_true', help='단계 진행 출력 표시')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, Path(args.data_dir), seed=args.seed,
+                           repeat=args.repeat, verbose=args.verbose)
+    path = save_results(report, Path(args.results_dir))
+    print(f"\n✓ 결과 저장: {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(report, json.load(f))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
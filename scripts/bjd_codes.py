@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+법정동 코드표 (시도/시군구/읍면동/리)
+
+10자리 법정동 코드(PNU 앞 10자리, 아파트 마스터 bjd_cd)를 이름으로, 이름을 코드 접두사로 바꿉니다.
+
+- 코드표는 행정표준코드관리시스템(code.go.kr)의 "법정동코드 전체자료.txt" 형식입니다
+  (탭 구분: 법정동코드, 법정동명, 폐지여부 / UTF-8 또는 CP949).
+  DATA_DIR에 전국 파일(.txt 또는 gzip으로 압축한 .txt.gz)이 있으면 그 파일을, 없으면 저장소에
+  포함된 input/bjd_codes.txt(.gz) (이 저장소가 다루는 서울/용인 일부 지역)를 읽고 경고를 출력합니다.
+- 코드표에 없는 코드는 resolve가 빈 이름을 돌려주고 경고를 출력합니다 (코드마다 한 번).
+- 코드는 정렬된 int64 배열로 두고, 여러 코드를 한 번에 시도(2자리)/시군구(5)/읍면동(8)/리(10)
+  코드로 잘라 searchsorted로 찾습니다 (PNU/bjd_cd 배열 전체를 반복문 없이 변환).
+- 폐지된 코드도 정방향 조회에는 쓰고 (예전 PNU), 이름 → 코드 조회는 기본적으로 존재 코드만 돌려줍니다.
+
+사용법:
+    # 코드 → 이름
+    python scripts/bjd_codes.py resolve 4146136029108210000 1165010800
+
+    # 이름 → 코드 접두사 (PNU 필터)
+    python scripts/bjd_codes.py find 주북리
+    python scripts/bjd_codes.py find "처인구 양지면"
+
+    # 코드에서
+    table = BjdCodeTable.load()
+    names = table.resolve(pnu_array)          # {'sido': [...], 'sigungu': [...], ...}
+    table.find('주북리')                      # [('4146136029', '경기도 용인시 처인구 양지면 주북리')]
+"""
+
+import argparse
+import gzip
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import DATA_DIR
+
+# 전국 코드표 (code.go.kr에서 내려받은 파일, gzip 압축본도 읽음)
+OFFICIAL_PATH = DATA_DIR / '법정동코드 전체자료.txt'
+
+# 저장소에 포함된 코드표 (전국 파일이 없을 때, 서울/용인 일부 지역)
+BUNDLED_PATH = project_root / 'input' / 'bjd_codes.txt'
+
+GZIP_SUFFIX = '.gz'
+
+# 단계와 코드 자리 수 (나머지 자리는 0)
+LEVELS = ('sido', 'sigungu', 'eupmyeondong', 'ri')
+LEVEL_DIGITS = (2, 5, 8, 10)
+
+CODE_DIGITS = 10
+ABOLISHED = '폐지'
+
+_loaded: Dict[Path, 'BjdCodeTable'] = {}
+
+
+def code_level(code: str) -> int:
+    """코드의 단계 (0 시도, 1 시군구, 2 읍면동, 3 리)"""
+    for level, digits in enumerate(LEVEL_DIGITS[:-1]):
+        if not code[digits:].strip('0'):
+            return level
+    return len(LEVEL_DIGITS) - 1
+
+
+def code_prefix(code: str) -> str:
+    """PNU/코드 필터에 쓰는 접두사 ('4146136000' → '41461360', '1165000000' → '11650')"""
+    return code[:LEVEL_DIGITS[code_level(code)]]
+
+
+def read_code_file(path) -> List[Tuple[str, str, bool]]:
+    """코드표 파일 → [(10자리 코드, 법정동명, 존재 여부)] (헤더/형식이 다른 줄은 건너뜀)"""
+    path = Path(path)
+    raw = path.read_bytes()
+    if path.suffix == GZIP_SUFFIX:
+        raw = gzip.decompress(raw)
+    try:
+        text = raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = raw.decode('cp949')
+
+    entries = []
+    for line in text.splitlines():
+        parts = line.split('\t')
+        code = parts[0].strip()
+        if len(parts) < 2 or len(code) != CODE_DIGITS or not code.isdigit():
+            continue
+        status = parts[2].strip() if len(parts) > 2 else ''
+        entries.append((code, parts[1].strip(), status != ABOLISHED))
+    return entries
+
+
+def _existing(path: Path):
+    """경로 또는 그 gzip 압축본 중 있는 파일 (둘 다 없으면 None)"""
+    for candidate in (path, path.with_name(path.name + GZIP_SUFFIX)):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def to_codes(values) -> np.ndarray:
+    """
+    PNU/bjd_cd 배열 → 10자리 법정동 코드 int64 배열 (형식이 다르면 0)
+
+    문자열('4146136029108210000', '1165010800'), 숫자(1165010800, 1165010800.0) 모두 받습니다.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        codes = values.astype(np.int64)
+        # 19자리 PNU는 앞 10자리만
+        codes = np.where(codes >= 10 ** CODE_DIGITS, codes // 10 ** 9, codes)
+        return np.where(codes >= 10 ** (CODE_DIGITS - 1), codes, 0)
+
+    codes, valid = _parse_heads(values.astype(f'U{CODE_DIGITS}'))
+    # 공백이 붙은 값 등은 그 행만 다시 (대부분 없음)
+    retry = np.flatnonzero(~valid)
+    if len(retry):
+        stripped = np.array([str(value).strip() for value in values[retry]], dtype=f'U{CODE_DIGITS}')
+        codes[retry], _ = _parse_heads(stripped)
+    return codes
+
+
+def _parse_heads(heads: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """10자 문자열 배열 → (int64 코드, 10자리 숫자 여부) - 문자 코드 배열에서 자리별로 계산"""
+    digits = heads.view(np.uint32).reshape(len(heads), CODE_DIGITS).astype(np.uint8) - np.uint8(ord('0'))
+    valid = (digits <= 9).all(axis=1)
+    codes = np.zeros(len(heads), dtype=np.int64)
+    for column in range(CODE_DIGITS):
+        codes = codes * 10 + digits[:, column]
+    codes[~valid] = 0
+    return codes, valid
+
+
+class BjdCodeTable:
+    """
+    법정동 코드표
+
+    Args:
+        entries: [(10자리 코드, 법정동명, 존재 여부)] - 같은 코드가 여러 번 나오면 마지막 값
+    """
+
+    def __init__(self, entries: Sequence[Tuple[str, str, bool]]):
+        self.path = None
+        # 이미 경고한 미등록 코드 (같은 코드를 반복해서 경고하지 않음)
+        self._warned = set()
+        by_code = {code: (name, active) for code, name, active in entries}
+        ordered = sorted(by_code)
+        self.codes = np.array([int(code) for code in ordered], dtype=np.int64)
+        self.names = np.array([by_code[code][0] for code in ordered], dtype=object)
+        self.active = np.array([by_code[code][1] for code in ordered], dtype=bool)
+
+        # 단계별 이름 (상위 코드 이름을 뺀 부분, 예: 처인구 → '용인시 처인구', 주북리 → '주북리')
+        self.parts = np.empty(len(ordered), dtype=object)
+        # 마지막 이름 토큰 → 위치 (이름 → 코드 조회)
+        self._by_last: Dict[str, List[int]] = defaultdict(list)
+        for i, code in enumerate(ordered):
+            name = self.names[i]
+            parent = self._parent_name(code, by_code)
+            self.parts[i] = name[len(parent):].strip() if parent and name.startswith(parent) else name
+            tokens = name.split()
+            if tokens:
+                self._by_last[tokens[-1]].append(i)
+
+    @staticmethod
+    def _parent_name(code: str, by_code: Dict[str, Tuple[str, bool]]) -> str:
+        level = code_level(code)
+        for digits in reversed(LEVEL_DIGITS[:level]):
+            parent = code[:digits].ljust(CODE_DIGITS, '0')
+            if parent in by_code:
+                return by_code[parent][0]
+        return ''
+
+    @classmethod
+    def load(cls, path=None) -> 'BjdCodeTable':
+        """코드표 읽기 (경로가 없으면 전국 파일, 없으면 포함된 코드표 / 경로별로 한 번만 읽음)"""
+        fallback = False
+        if path is None:
+            path = _existing(OFFICIAL_PATH)
+            if path is None:
+                path = _existing(BUNDLED_PATH) or BUNDLED_PATH
+                fallback = True
+        path = Path(path)
+        if path not in _loaded:
+            table = cls(read_code_file(path))
+            table.path = path
+            if fallback:
+                print(f"⚠️  전국 법정동 코드표가 없어 포함된 일부 지역 코드표를 사용합니다 "
+                      f"({path}, {len(table):,}개) - 다른 지역 코드는 이름을 찾지 못합니다. "
+                      f"code.go.kr의 '법정동코드 전체자료.txt'를 {OFFICIAL_PATH.parent}에 두세요.")
+            _loaded[path] = table
+        return _loaded[path]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _positions(self, codes: np.ndarray) -> np.ndarray:
+        """코드 배열의 코드표 위치 (없으면 -1)"""
+        if not len(self.codes):
+            return np.full(len(codes), -1, dtype=np.int64)
+        positions = np.searchsorted(self.codes, codes)
+        positions = np.minimum(positions, len(self.codes) - 1)
+        return np.where(self.codes[positions] == codes, positions, -1)
+
+    def resolve(self, values) -> Dict[str, np.ndarray]:
+        """
+        PNU/bjd_cd 배열 → 단계별 이름 배열
+
+        Returns:
+            {'sido', 'sigungu', 'eupmyeondong', 'ri': 이름 배열, 'name': 전체 이름 배열}
+            - 해당 단계가 없거나 코드표에 없으면 빈 문자열
+        """
+        codes = to_codes(values)
+        result = {}
+        upper_digits = 0
+        for level, digits in zip(LEVELS, LEVEL_DIGITS):
+            scale = 10 ** (CODE_DIGITS - digits)
+            level_codes = codes // scale * scale
+            # 이 단계 자리가 모두 0이면 이 단계 없음 (시군구 코드의 읍면동 등)
+            own = (codes // scale) % 10 ** (digits - upper_digits)
+            positions = np.where(own > 0, self._positions(level_codes), -1)
+            upper_digits = digits
+            result[level] = self._take(self.parts, positions)
+        positions = self._positions(codes)
+        result['name'] = self._take(self.names, positions)
+        self._warn_missing(codes[positions < 0], len(codes))
+        return result
+
+    def _warn_missing(self, missing: np.ndarray, total: int):
+        """코드표에 없는 코드 경고 (형식이 다른 값은 0, 코드마다 한 번)"""
+        new = set(np.unique(missing).tolist()) - self._warned
+        if not new:
+            return
+        self._warned |= new
+        examples = ', '.join(str(code) if code else '(형식 오류)' for code in sorted(new)[:5])
+        count = int(np.isin(missing, list(new)).sum())
+        print(f"⚠️  법정동 코드표({self.path or '직접 생성'})에 없는 코드 {count:,}개/{total:,}개: {examples}"
+              f"{' 외' if len(new) > 5 else ''} - 이름을 빈 문자열로 둡니다")
+
+    @staticmethod
+    def _take(names: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        taken = np.full(len(positions), '', dtype=object)
+        found = positions >= 0
+        taken[found] = names[positions[found]]
+        return taken
+
+    def name(self, code) -> str:
+        """코드 하나 → 전체 이름 (없으면 빈 문자열)"""
+        return self.resolve([code])['name'][0]
+
+    def find(self, name: str, active_only: bool = True) -> List[Tuple[str, str]]:
+        """
+        이름 → [(코드 접두사, 전체 이름)]
+
+        마지막 토큰이 같고 앞 토큰들이 순서대로 들어 있는 코드를 찾습니다
+        ('주북리', '양지면 주북리', '처인구 주북리' 모두 주북리).
+        """
+        tokens = name.split()
+        if not tokens:
+            return []
+        matches = []
+        for i in self._by_last.get(tokens[-1], ()):
+            if active_only and not self.active[i]:
+                continue
+            full = self.names[i].split()
+            rest = iter(full[:-1])
+            if all(token in rest for token in tokens[:-1]):
+                code = str(self.codes[i])
+                matches.append((code_prefix(code), self.names[i]))
+        return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='법정동 코드표 조회',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예시:
+  %(prog)s resolve 4146136029108210000 1165010800
+  %(prog)s find 주북리
+  %(prog)s find "처인구 양지면" --all
+        '''
+    )
+    parser.add_argument('--table', help='코드표 경로 (기본값: data/법정동코드 전체자료.txt, 없으면 input/bjd_codes.txt)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    resolve_parser = sub.add_parser('resolve', help='코드(PNU/bjd_cd) → 이름')
+    resolve_parser.add_argument('codes', nargs='+', help='PNU 또는 10자리 법정동 코드')
+
+    find_parser = sub.add_parser('find', help='이름 → 코드 접두사')
+    find_parser.add_argument('name', help='법정동/리 이름 (앞에 상위 이름을 붙일 수 있음)')
+    find_parser.add_argument('--all', action='store_true', help='폐지된 코드 포함')
+
+    args = parser.parse_args()
+
+    table = BjdCodeTable.load(args.table)
+
+    if args.command == 'resolve':
+        names = table.resolve(args.codes)
+        for i, code in enumerate(args.codes):
+            levels = ' / '.join(names[level][i] or '-' for level in LEVELS)
+            status = '✓' if names['name'][i] else '⚠'
+            print(f"{status} {code}: {levels}")
+        return 0
+
+    matches = table.find(args.name, active_only=not args.all)
+    if not matches:
+        print(f"❌ '{args.name}'에 해당하는 법정동 코드가 없습니다 (코드표 {len(table):,}개)")
+        return 1
+    for prefix, full_name in matches:
+        print(f"✓ {prefix:<10} {full_name}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,7 @@ QGIS 기반 한국 지적도 데이터 처리 및 시각화 자동화
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
 import yaml
@@ -19,6 +20,7 @@ from typing import Dict, List, Optional
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
 
 from config import (
     get_data_path,
@@ -28,21 +30,98 @@ from config import (
     OUTPUT_CRS,
     DBF_ENCODING
 )
+from pipeline_dag import PipelineDAG
+from dbf_reader import scan_dbf, read_dbf_header, DBFFilter
+from pipeline_metrics import PipelineMetrics
+from pipeline_profiler import StepProfiler
+from parcel_collection import ParcelCollection
+from source_index import SourceIndex
+from webmap_assets import asset_url, update_manifest, write_asset
+from webmap_chunks import MAX_VISIBLE_CHUNKS, write_geometry_layer, write_viewport_chunks
+
+# 2단계 면적 통계 CSV 컬럼
+AREA_FIELDS = ['jibun', 'pnu', 'category', 'area_sqm', 'area_pyeong']
+
+# 지번 끝에 붙는 지목 접미사
+JIBUN_SUFFIXES = ('전', '답', '대', '임', '잡', '도', '천', '구', '유', '제', '하', '목')
+
+
+def clean_jibun(jibun: str) -> str:
+    """
+    지번 정리 (토지 용도 접미사 제거)
+    예: "123전" → "123"
+    """
+    if jibun.endswith(JIBUN_SUFFIXES):
+        return jibun[:-1]
+    return jibun
+
+
+class ParcelMatcher:
+    """
+    DBF 레코드를 카테고리별 필지 목록과 매칭
+
+    목록 검사를 매 레코드마다 반복하지 않도록 지번 → 카테고리 조회 테이블을
+    한 번 만들어 둡니다. 여러 카테고리에 같은 지번이 있으면 설정 순서상
+    먼저 나온 카테고리가 우선합니다.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]], pnu_filter: Optional[str] = None,
+                 clean_jibun: bool = True, clean_func=None):
+        self.pnu_filter = pnu_filter
+        self.clean_jibun = clean_jibun
+        self.clean_func = clean_func
+        self.rank = {cat: i for i, cat in enumerate(categories)}
+        self.lookup = {}
+        for cat, parcel_list in categories.items():
+            for parcel in parcel_list:
+                self.lookup.setdefault(parcel, cat)
+
+    def match(self, record: Dict) -> Optional[str]:
+        """레코드의 카테고리 반환 (매칭되지 않으면 None)"""
+        # PNU 필터링 (설정된 경우)
+        if self.pnu_filter:
+            pnu = record.get('PNU', '')
+            if not pnu.startswith(self.pnu_filter):
+                return None  # PNU가 일치하지 않으면 건너뛰기
+
+        jibun = record.get('JIBUN', '')
+
+        if self.clean_jibun:
+            jibun_clean = self.clean_func(jibun)
+        else:
+            jibun_clean = jibun
+
+        # 카테고리 찾기 (정리된 지번/원본 지번 중 앞선 카테고리)
+        cat_clean = self.lookup.get(jibun_clean)
+        cat_raw = self.lookup.get(jibun)
+        if cat_clean is None or cat_raw is None:
+            return cat_clean or cat_raw
+        return cat_clean if self.rank[cat_clean] <= self.rank[cat_raw] else cat_raw
 
 
 class CadastralAutomation:
     """지적도 자동화 클래스"""
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: Optional[str] = None, profile: bool = False,
+                 profile_top: int = 25, config: Optional[Dict] = None):
         """
         초기화
 
         Args:
             config_path: YAML 설정 파일 경로
+            profile: 단계별 cProfile/tracemalloc 프로파일 기록 여부
+            profile_top: 프로파일 상위 함수/할당 위치 출력 개수
+            config: 설정 딕셔너리 (빠른 실행 모드처럼 YAML 없이 실행할 때)
         """
-        self.config_path = Path(config_path)
-        self.config = self._load_config()
+        self.config_path = Path(config_path) if config_path else None
+        self.config = config if config is not None else self._load_config()
         self.project_name = self.config['project']['name']
+        self.metrics = PipelineMetrics(self.project_name)
+
+        self.profiler = None
+        if profile:
+            profile_dir = Path(self.config['output']['directory']) / 'profile' / self.project_name
+            self.profiler = StepProfiler(profile_dir, top_n=profile_top)
 
     def _load_config(self) -> Dict:
         """YAML 설정 파일 로드"""
@@ -72,35 +151,11 @@ class CadastralAutomation:
         return parcels
 
     def _clean_jibun(self, jibun: str) -> str:
-        """
-        지번 정리 (토지 용도 접미사 제거)
-        예: "123전" → "123"
-        """
-        suffixes = ['전', '답', '대', '임', '잡', '도', '천', '구', '유', '제', '하', '목']
-        for suffix in suffixes:
-            if jibun.endswith(suffix):
-                return jibun[:-1]
-        return jibun
-
-    def step1_extract_parcels(self):
-        """1단계: 원본 shapefile에서 필지 추출 및 카테고리 분류"""
-        print("\n" + "="*60)
-        print("1단계: 필지 추출 및 카테고리 분류")
-        print("="*60)
-
-        from korea_cadastral import read_dbf, parse_shapefile_geometry
-        import struct
-
-        # 원본 shapefile 경로
-        source_shp = self.config['input']['source_shapefile']
-        source_path = Path(source_shp)
-
-        if not source_path.exists():
-            raise FileNotFoundError(f"원본 shapefile을 찾을 수 없습니다: {source_shp}")
-
-        print(f"✓ 원본 shapefile: {source_shp}")
+        """지번 정리 (토지 용도 접미사 제거)"""
+        return clean_jibun(jibun)
 
-        # 필지 목록 읽기
+    def _load_categories(self) -> Dict[str, List[str]]:
+        """설정의 필지 목록 파일들을 카테고리별로 읽기"""
         parcel_lists = self.config['input'].get('parcel_lists', {})
         categories = {}
 
@@ -116,54 +171,87 @@ class CadastralAutomation:
                 parcels = self._read_parcel_list(all_parcels_file)
                 categories['ALL'] = parcels
 
-        total_parcels = sum(len(p) for p in categories.values())
-        print(f"총 {total_parcels}개 필지 처리 예정")
+        return categories
 
-        # DBF 파일 읽기
-        dbf_path = source_path.with_suffix('.dbf')
-        records = read_dbf(str(dbf_path), encoding=DBF_ENCODING)
-        print(f"✓ DBF 레코드: {len(records)}개")
+    def build_matcher(self, categories: Dict[str, List[str]]) -> 'ParcelMatcher':
+        """카테고리별 필지 목록으로 레코드 매처 생성"""
+        return ParcelMatcher(
+            categories,
+            pnu_filter=self.config.get('input', {}).get('pnu_filter', None),
+            clean_jibun=self.config['processing'].get('clean_jibun', True),
+            clean_func=self._clean_jibun
+        )
 
-        # 필지 매칭 및 추출
-        matched_records = []
-        matched_indices = []
+    def step1_extract_parcels(self, preloaded: Optional[ParcelCollection] = None,
+                              scan_counts: Optional[Dict[str, int]] = None) -> ParcelCollection:
+        """
+        1단계: 원본 shapefile에서 필지 추출 및 카테고리 분류
 
-        # PNU 필터 적용 (옵션)
-        pnu_filter = self.config.get('input', {}).get('pnu_filter', None)
+        Args:
+            preloaded: 배치 실행 시 공유 원본에서 미리 매칭된 필지 컬렉션.
+                       주어지면 원본 DBF/SHP를 다시 읽지 않음
+            scan_counts: preloaded를 만든 공유 스캔의 비용 카운터 (records_scanned, bytes_read)
 
-        for idx, record in records.items():
-            # PNU 필터링 (설정된 경우)
-            if pnu_filter:
-                pnu = record.get('PNU', '')
-                if not pnu.startswith(pnu_filter):
-                    continue  # PNU가 일치하지 않으면 건너뛰기
-
-            jibun = record.get('JIBUN', '')
-
-            if self.config['processing'].get('clean_jibun', True):
-                jibun_clean = self._clean_jibun(jibun)
-            else:
-                jibun_clean = jibun
-
-            # 카테고리 찾기
-            category = None
-            for cat, parcel_list in categories.items():
-                if jibun_clean in parcel_list or jibun in parcel_list:
-                    category = cat
-                    break
+        Returns:
+            필지 컬렉션 (레코드 + 지오메트리 바이트, 2~4단계가 공유)
+        """
+        print("\n" + "="*60)
+        print("1단계: 필지 추출 및 카테고리 분류")
+        print("="*60)
 
-            if category:
-                # 카테고리 정보 추가
-                record['CATEGORY'] = category
-                matched_records.append(record)
-                matched_indices.append(idx)
+        # 원본 shapefile 경로
+        source_shp = self.config['input']['source_shapefile']
+        source_path = Path(source_shp)
 
-        print(f"✓ 매칭된 필지: {len(matched_records)}개")
+        if not source_path.exists():
+            raise FileNotFoundError(f"원본 shapefile을 찾을 수 없습니다: {source_shp}")
 
-        # 지오메트리 파싱 (실제 바이트 읽기)
-        shp_path = source_path
-        matched_geometries = self._read_geometries(shp_path, matched_indices)
-        print(f"✓ 지오메트리 추출 완료")
+        print(f"✓ 원본 shapefile: {source_shp}")
+
+        if preloaded is not None:
+            parcels = preloaded
+            print(f"✓ 공유 원본에서 매칭된 필지: {len(parcels)}개")
+            for key, amount in (scan_counts or {}).items():
+                self.metrics.count(key, amount)
+        else:
+            # 필지 목록 읽기
+            categories = self._load_categories()
+            total_parcels = sum(len(p) for p in categories.values())
+            print(f"총 {total_parcels}개 필지 처리 예정")
+
+            # DBF 파일 읽기 (PNU 필터는 디코딩 전 바이트 단계에서 적용)
+            dbf_path = source_path.with_suffix('.dbf')
+            pnu_filter = self.config.get('input', {}).get('pnu_filter', None)
+            records = scan_dbf(
+                str(dbf_path),
+                where=DBFFilter(prefix={'PNU': pnu_filter}) if pnu_filter else None,
+                encoding=DBF_ENCODING,
+                workers=self.config['processing'].get('scan_workers')
+            )
+            print(f"✓ DBF 레코드: {len(records)}개")
+            self.metrics.count('records_scanned', read_dbf_header(str(dbf_path)).num_records)
+            self.metrics.count('bytes_read', dbf_path.stat().st_size)
+
+            # 필지 매칭 및 추출
+            matcher = self.build_matcher(categories)
+            matched_records = []
+            matched_indices = []
+
+            for idx, record in records.items():
+                category = matcher.match(record)
+                if category:
+                    # 카테고리 정보 추가
+                    record['CATEGORY'] = category
+                    matched_records.append(record)
+                    matched_indices.append(idx)
+
+            print(f"✓ 매칭된 필지: {len(matched_records)}개")
+
+            # 지오메트리 파싱 (실제 바이트 읽기)
+            shp_path = source_path
+            matched_geometries = self._read_geometries(shp_path, matched_indices)
+            parcels = ParcelCollection.from_indexed(matched_records, matched_geometries, matched_indices)
+            print(f"✓ 지오메트리 추출 완료")
 
         # 출력 shapefile 생성
         output_dir = Path(self.config['output']['directory'])
@@ -174,14 +262,15 @@ class CadastralAutomation:
 
         self._write_shapefile(
             output_path,
-            matched_records,
-            matched_geometries,
+            parcels.records,
+            parcels.geometries,
             source_path
         )
+        parcels.shapefile_path = output_path
 
         print(f"✓ 출력: {output_path}")
 
-        return output_path, matched_records
+        return parcels
 
     def _read_geometries(self, shp_path: Path, indices: List[int]) -> Dict[int, tuple]:
         """SHP 파일에서 특정 인덱스의 지오메트리 바이트 읽기"""
@@ -215,10 +304,12 @@ class CadastralAutomation:
                 if len(geometries) >= len(indices):
                     break
 
+            self.metrics.count('bytes_read', f.tell())
+
         return geometries
 
     def _write_shapefile(self, output_path: Path, records: List[Dict],
-                        geometries: Dict[int, tuple], source_path: Path):
+                        geometries: List[tuple], source_path: Path):
         """Shapefile 작성"""
         import struct
 
@@ -242,9 +333,8 @@ class CadastralAutomation:
 
             offset = 50  # 헤더 이후 시작 (words)
 
-            # 지오메트리 레코드 작성
-            for idx in sorted(geometries.keys()):
-                record_header, content = geometries[idx]
+            # 지오메트리 레코드 작성 (레코드 순서)
+            for record_header, content in geometries:
 
                 # SHP에 레코드 작성 (header + content)
                 f_shp.write(record_header)
@@ -324,7 +414,8 @@ class CadastralAutomation:
 
                 # 각 필드 값
                 for field in fields:
-                    value = str(record_data.get(field['name'], ''))
+                    value = record_data.get(field['name'], '')
+                    value = '' if value is None else str(value)
 
                     if field['type'] == 'C':
                         # Character 필드
@@ -346,40 +437,28 @@ class CadastralAutomation:
 
         print(f"  ✅ DBF 파일 작성 완료 ({num_records}개 레코드)")
 
-    def step2_calculate_areas(self, shapefile_path: Path, records: List[Dict]):
+    def step2_calculate_areas(self, parcels: ParcelCollection):
         """2단계: 면적 계산 및 통계 생성"""
         print("\n" + "="*60)
         print("2단계: 면적 계산 및 통계")
         print("="*60)
 
-        from korea_cadastral import sqm_to_pyeong, parse_shapefile_geometry
+        from korea_cadastral import sqm_to_pyeong
         import csv
 
-        # 출력 shapefile에서 면적 계산 (실제 저장된 geometries로부터)
-        geometries = parse_shapefile_geometry(str(shapefile_path))
+        # 1단계에서 읽은 지오메트리로 면적 계산 (출력 shapefile 재파싱 없음)
+        self.metrics.count('records_scanned', len(parcels))
 
         # 면적 계산
         stats = []
         category_totals = {}
 
-        for idx, record in enumerate(records):
-            # 지오메트리 딕셔너리에서 면적 추출
-            area_sqm = geometries.get(idx, 0)
-
-            if self.config['processing'].get('convert_to_pyeong', True):
-                area_pyeong = sqm_to_pyeong(area_sqm)
-            else:
-                area_pyeong = None
-
-            category = record.get('CATEGORY', 'UNKNOWN')
-
-            stats.append({
-                'jibun': record.get('JIBUN', ''),
-                'pnu': record.get('PNU', ''),
-                'category': category,
-                'area_sqm': area_sqm,
-                'area_pyeong': area_pyeong
-            })
+        for idx, record in parcels:
+            row = self._area_row(parcels, idx, record, sqm_to_pyeong)
+            stats.append(row)
+            category = row['category']
+            area_sqm = row['area_sqm']
+            area_pyeong = row['area_pyeong']
 
             # 카테고리별 합계
             if category not in category_totals:
@@ -395,7 +474,7 @@ class CadastralAutomation:
         csv_path = output_dir / f"{self.project_name}_areas.csv"
 
         with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=['jibun', 'pnu', 'category', 'area_sqm', 'area_pyeong'])
+            writer = csv.DictWriter(f, fieldnames=AREA_FIELDS)
             writer.writeheader()
             writer.writerows(stats)
 
@@ -409,7 +488,24 @@ class CadastralAutomation:
 
         return stats
 
-    def step3_create_webmap(self, shapefile_path: Path, records: List[Dict]):
+    def _area_row(self, parcels: ParcelCollection, idx: int, record: Dict, sqm_to_pyeong) -> Dict:
+        """면적 통계 CSV 한 행"""
+        area_sqm = parcels.area(idx)
+
+        if self.config['processing'].get('convert_to_pyeong', True):
+            area_pyeong = sqm_to_pyeong(area_sqm)
+        else:
+            area_pyeong = None
+
+        return {
+            'jibun': record.get('JIBUN', ''),
+            'pnu': record.get('PNU', ''),
+            'category': record.get('CATEGORY', 'UNKNOWN'),
+            'area_sqm': area_sqm,
+            'area_pyeong': area_pyeong
+        }
+
+    def step3_create_webmap(self, parcels: ParcelCollection):
         """3단계: 웹맵 생성 (Leaflet)"""
         if 'webmap' not in self.config['output']['formats']:
             print("\n웹맵 생성 건너뛰기 (설정에서 비활성화됨)")
@@ -430,95 +526,89 @@ class CadastralAutomation:
         # 좌표 변환기 (EPSG:5186 → EPSG:4326)
         transformer = Transformer.from_crs(DEFAULT_CRS, OUTPUT_CRS, always_xy=True)
 
-        # 지오메트리 바이트 읽기 (모든 레코드에 대해)
-        all_indices = list(range(len(records)))
-        geometries_dict = self._read_geometries(shapefile_path, all_indices)
+        # 1단계에서 읽은 지오메트리 사용 (출력 shapefile 재읽기 없음)
+        self.metrics.count('records_scanned', len(parcels))
 
         # GeoJSON 생성
         features = []
 
-        for idx, record in enumerate(records):
-            # 지오메트리 바이트 가져오기
-            if idx not in geometries_dict:
-                continue
-
-            geom_header, geom_content = geometries_dict[idx]
-
-            # Shapefile 지오메트리에서 좌표 추출
+        for idx, record in parcels:
             try:
-                import struct
-
-                # Shape type (4 bytes, 지오메트리 content 시작부분)
-                geom_data = geom_content
-
-                # Shape type (4 bytes)
-                shape_type = struct.unpack('<i', geom_data[0:4])[0]
-
-                if shape_type == 5:  # Polygon
-                    # Bounding box 건너뛰기 (32 bytes)
-                    num_parts = struct.unpack('<i', geom_data[36:40])[0]
-                    num_points = struct.unpack('<i', geom_data[40:44])[0]
-
-                    # Parts array 건너뛰기
-                    points_start = 44 + num_parts * 4
-
-                    # Points array 읽기
-                    coords = []
-                    for i in range(num_points):
-                        offset = points_start + i * 16
-                        x = struct.unpack('<d', geom_data[offset:offset+8])[0]
-                        y = struct.unpack('<d', geom_data[offset+8:offset+16])[0]
-
-                        # 좌표 변환
-                        lon, lat = transformer.transform(x, y)
-                        coords.append([lon, lat])
-
-                    # GeoJSON Feature 생성
-                    feature = {
-                        'type': 'Feature',
-                        'geometry': {
-                            'type': 'Polygon',
-                            'coordinates': [coords]
-                        },
-                        'properties': {
-                            'jibun': record.get('JIBUN', ''),
-                            'pnu': record.get('PNU', ''),
-                            'category': record.get('CATEGORY', 'UNKNOWN'),
-                            'area_sqm': record.get('JIBUN_AREA', 0)
-                        }
-                    }
-
-                    features.append(feature)
-
+                geometry = self._parcel_geometry(parcels, idx, transformer)
             except Exception as e:
                 print(f"  ⚠ 지오메트리 {idx} 파싱 실패: {e}")
                 continue
 
+            if geometry is None:
+                continue
+
+            features.append(self._parcel_feature(record, geometry))
+
         # GeoJSON 저장
         output_dir = Path(self.config['output']['directory']) / 'webmap'
         output_dir.mkdir(parents=True, exist_ok=True)
 
         geojson_path = output_dir / 'parcels.geojson'
 
-        geojson_data = {
-            'type': 'FeatureCollection',
-            'features': features
-        }
+        # 지오메트리 페이로드(카테고리만 포함) + 필지 id 범위별 속성 샤드
+        # (공백 없는 JSON + .gz/.br 압축본)
+        attributes, entries = write_geometry_layer(output_dir, 'parcels', features)
+        geojson_entry = entries['parcels.geojson']
 
-        with open(geojson_path, 'w', encoding='utf-8') as f:
-            json.dump(geojson_data, f, ensure_ascii=False, indent=2)
+        print(f"✓ GeoJSON 생성: {geojson_path} ({len(features)}개 필지, "
+              f"속성 샤드 {len(attributes['shards'])}개)")
 
-        print(f"✓ GeoJSON 생성: {geojson_path} ({len(features)}개 필지)")
+        # 화면 범위 청크 (웹맵은 보이는 청크만 요청)
+        chunk_index, chunk_entries = write_viewport_chunks(output_dir, 'parcels', features, attributes)
+        entries.update(chunk_entries)
+        print(f"✓ 화면 범위 청크: {len(chunk_index['chunks'])}개")
 
-        # HTML 생성
+        # HTML 생성 (콘텐츠 해시가 붙은 URL로 청크 색인 요청)
         html_path = output_dir / 'index.html'
-        self._create_webmap_html(html_path)
+        index_name = 'chunks/parcels/index.json'
+        html_entry = self._create_webmap_html(html_path, asset_url(index_name, entries[index_name]))
+        entries['index.html'] = html_entry
+        update_manifest(output_dir, entries)
 
         print(f"✓ 웹맵 HTML: {html_path}")
+        print(f"✓ 압축본/매니페스트: {output_dir / 'manifest.json'} "
+              f"(GeoJSON {geojson_entry['size']:,} → gzip {geojson_entry['gzip']:,}바이트)")
         print(f"\n💡 웹맵 확인: file://{html_path.absolute()}")
 
-    def _create_webmap_html(self, output_path: Path):
-        """Leaflet 웹맵 HTML 생성"""
+    def _parcel_feature(self, record: Dict, geometry: Dict) -> Dict:
+        """GeoJSON Feature 생성"""
+        return {
+            'type': 'Feature',
+            'geometry': geometry,
+            'properties': {
+                'jibun': record.get('JIBUN', ''),
+                'pnu': record.get('PNU', ''),
+                'category': record.get('CATEGORY', 'UNKNOWN'),
+                'area_sqm': record.get('JIBUN_AREA', 0)
+            }
+        }
+
+    def _parcel_geometry(self, parcels: ParcelCollection, idx: int, transformer) -> Optional[Dict]:
+        """필지 지오메트리를 EPSG:4326 GeoJSON geometry로 변환 (링 단위 일괄 변환)"""
+        geometry = parcels.geojson_geometry(idx, transformer)
+        if geometry is not None:
+            self.metrics.count('vertices_transformed', parcels.num_points(idx))
+        return geometry
+
+    def _create_webmap_html(self, output_path: Path, index_url: str = 'chunks/parcels/index.json') -> Dict:
+        """
+        Leaflet 웹맵 HTML 생성
+
+        캔버스 렌더러로 그리고, 화면 범위와 겹치는 청크만 요청합니다.
+        팝업 속성은 클릭할 때 속성 샤드에서 가져옵니다.
+
+        Args:
+            output_path: index.html 경로
+            index_url: 청크 색인 URL (콘텐츠 해시 포함)
+
+        Returns:
+            매니페스트 항목 (write_asset 참조)
+        """
         import json
 
         style_config = self.config.get('style', {}).get('categories', {})
@@ -603,7 +693,9 @@ class CadastralAutomation:
     </div>
     <div id="map"></div>
     <script>
-        var map = L.map('map');
+        // 캔버스 렌더러: 필지 수만큼 SVG 노드를 만들지 않음
+        var map = L.map('map', { preferCanvas: true });
+        var renderer = L.canvas({ padding: 0.5 });
 
         L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
             attribution: '© OpenStreetMap contributors',
@@ -611,55 +703,115 @@ class CadastralAutomation:
         }).addTo(map);
 
         var categoryColors = ''' + json.dumps(category_colors) + ''';
+        var MAX_VISIBLE_CHUNKS = ''' + str(MAX_VISIBLE_CHUNKS) + ''';
+
+        var chunkIndex = null;
+        var loadedChunks = {};   // 청크 id → 'loading' | L.GeoJSON
+        var attrShards = {};     // 샤드 번호 → Promise({id: 속성})
+        var parcelLayer = L.featureGroup().addTo(map);
+        var overviewLayer = L.layerGroup().addTo(map);
+
+        function parcelStyle(feature) {
+            var category = feature.properties.category || 'UNKNOWN';
+            var colorInfo = categoryColors[category] || {color: '#CCCCCC'};
+            return {
+                fillColor: colorInfo.color,
+                fillOpacity: 0.6,
+                color: '#333',
+                weight: 1
+            };
+        }
+
+        function fetchAttributes(id) {
+            var attributes = chunkIndex.attributes;
+            var shard = Math.floor(id / attributes.shard_size);
+            if (!attrShards[shard]) {
+                attrShards[shard] = fetch(attributes.shards[shard]).then(r => r.json());
+            }
+            return attrShards[shard].then(attrs => attrs[id]);
+        }
+
+        function popupHtml(props) {
+            var category = props.category || 'UNKNOWN';
+            var categoryLabel = (categoryColors[category] || {}).label || category;
+            return '<div style="min-width:200px;">' +
+                '<h4 style="margin:0 0 5px 0;">필지: ' + props.jibun + '</h4>' +
+                '<div><b>PNU:</b> ' + props.pnu + '</div>' +
+                '<div><b>카테고리:</b> ' + categoryLabel + '</div>' +
+                '<div><b>면적:</b> ' + Number(props.area_sqm).toLocaleString() + ' ㎡</div>' +
+                '</div>';
+        }
+
+        function onEachParcel(feature, layer) {
+            layer.on('click', function(e) {
+                var popup = L.popup().setLatLng(e.latlng).setContent('불러오는 중...').openOn(map);
+                fetchAttributes(feature.id)
+                    .then(props => popup.setContent(props ? popupHtml(props) : '속성 없음'))
+                    .catch(err => popup.setContent('속성 로드 실패'));
+            });
+        }
+
+        function intersects(bbox, view) {
+            return bbox[0] <= view.getEast() && bbox[2] >= view.getWest() &&
+                   bbox[1] <= view.getNorth() && bbox[3] >= view.getSouth();
+        }
+
+        function loadChunk(chunk) {
+            if (loadedChunks[chunk.id]) return;
+            loadedChunks[chunk.id] = 'loading';
+            fetch(chunk.url)
+                .then(r => r.json())
+                .then(data => {
+                    loadedChunks[chunk.id] = L.geoJSON(data, {
+                        renderer: renderer,
+                        style: parcelStyle,
+                        onEachFeature: onEachParcel
+                    }).addTo(parcelLayer);
+                })
+                .catch(err => {
+                    delete loadedChunks[chunk.id];
+                    console.error('청크 로드 실패:', chunk.id, err);
+                });
+        }
+
+        function updateChunks() {
+            var view = map.getBounds().pad(0.2);
+            var visible = chunkIndex.chunks.filter(c => intersects(c.bbox, view));
+            overviewLayer.clearLayers();
+
+            if (visible.length > MAX_VISIBLE_CHUNKS) {
+                // 너무 넓은 범위: 청크 윤곽만 표시하고 확대 시 필지 로드
+                visible.forEach(function(c) {
+                    L.rectangle([[c.bbox[1], c.bbox[0]], [c.bbox[3], c.bbox[2]]], {
+                        renderer: renderer, color: '#555', weight: 1, fillOpacity: 0.05
+                    }).bindTooltip(c.count.toLocaleString() + '필지 (확대하면 표시)').addTo(overviewLayer);
+                });
+                return;
+            }
+            visible.forEach(loadChunk);
+        }
 
-        fetch('parcels.geojson')
+        fetch(''' + json.dumps(index_url) + ''')
             .then(r => r.json())
-            .then(data => {
-                var parcelCount = data.features.length;
-                document.getElementById('parcel-count').innerText = parcelCount;
-
-                var parcelLayer = L.geoJSON(data, {
-                    style: function(feature) {
-                        var category = feature.properties.category || 'UNKNOWN';
-                        var colorInfo = categoryColors[category] || {color: '#CCCCCC'};
-
-                        return {
-                            fillColor: colorInfo.color,
-                            fillOpacity: 0.6,
-                            color: '#333',
-                            weight: 1
-                        };
-                    },
-                    onEachFeature: function(feature, layer) {
-                        var props = feature.properties;
-                        var category = props.category || 'UNKNOWN';
-                        var categoryLabel = (categoryColors[category] || {}).label || category;
-
-                        var popupContent = '<div style="min-width:200px;">' +
-                            '<h4 style="margin:0 0 5px 0;">필지: ' + props.jibun + '</h4>' +
-                            '<div><b>PNU:</b> ' + props.pnu + '</div>' +
-                            '<div><b>카테고리:</b> ' + categoryLabel + '</div>' +
-                            '<div><b>면적:</b> ' + Number(props.area_sqm).toLocaleString() + ' ㎡</div>' +
-                            '</div>';
-
-                        layer.bindPopup(popupContent);
-                    }
-                }).addTo(map);
-
-                map.fitBounds(parcelLayer.getBounds());
-                console.log('필지 로드 완료:', parcelCount, '개');
+            .then(index => {
+                chunkIndex = index;
+                document.getElementById('parcel-count').innerText = index.count.toLocaleString();
+                if (!index.bounds) return;
+
+                var b = index.bounds;
+                map.fitBounds([[b[1], b[0]], [b[3], b[2]]]);
+                map.on('moveend', updateChunks);
+                updateChunks();
+                console.log('청크 색인 로드 완료:', index.chunks.length, '개 청크,', index.count, '개 필지');
             })
-            .catch(err => console.error('GeoJSON 로드 실패:', err));
+            .catch(err => console.error('청크 색인 로드 실패:', err));
     </script>
 </body>
 </html>'''
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        return write_asset(output_path, html_content)
 
-        import json
-
-    def step4_create_qgis_outputs(self, shapefile_path: Path):
+    def step4_create_qgis_outputs(self, parcels: ParcelCollection):
         """4단계: QGIS 출력물 생성 (QML, PNG, PDF)"""
         qgis_formats = {'qml', 'png', 'pdf'} & set(self.config['output']['formats'])
 
@@ -675,7 +827,7 @@ class CadastralAutomation:
         print("  Claude Desktop의 QGIS MCP를 통해 생성할 수 있습니다.")
 
         # PyQGIS 스크립트 생성
-        script_path = self._generate_qgis_script(shapefile_path)
+        script_path = self._generate_qgis_script(parcels.shapefile_path)
         print(f"\n생성된 PyQGIS 스크립트: {script_path}")
         print("\nQGIS Python 콘솔에서 다음 명령으로 실행:")
         print(f"  exec(open(r'{script_path}', encoding='utf-8').read())")
@@ -753,40 +905,338 @@ else:
 
         return script_path
 
-    def run(self):
-        """전체 워크플로우 실행"""
+    def build_pipeline(self, preloaded: Optional[ParcelCollection] = None,
+                       scan_counts: Optional[Dict[str, int]] = None) -> PipelineDAG:
+        """
+        단계 의존성 그래프 구성
+
+        1단계(필지 추출) 이후 2~4단계는 서로 독립적이므로 동시에 실행 가능
+        """
+        dag = PipelineDAG()
+        steps = [
+            ('extract', '1단계 필지 추출', [],
+             lambda deps: self.step1_extract_parcels(preloaded, scan_counts)),
+            ('areas', '2단계 면적 계산', ['extract'],
+             lambda deps: self.step2_calculate_areas(deps['extract'])),
+            ('webmap', '3단계 웹맵 생성', ['extract'],
+             lambda deps: self.step3_create_webmap(deps['extract'])),
+            ('qgis', '4단계 QGIS 출력물', ['extract'],
+             lambda deps: self.step4_create_qgis_outputs(deps['extract'])),
+        ]
+        for name, label, depends_on, func in steps:
+            dag.add_step(name, self._measured(name, label, func),
+                         depends_on=depends_on, label=label)
+        return dag
+
+    def _measured(self, name: str, label: str, func):
+        """단계 함수를 실행 비용 측정으로 감싸기"""
+        def wrapper(deps):
+            with self.metrics.measure(name, label):
+                if self.profiler is None:
+                    return func(deps)
+                with self.profiler.profile(name):
+                    return func(deps)
+        return wrapper
+
+    def run(self, preloaded: Optional[ParcelCollection] = None,
+            scan_counts: Optional[Dict[str, int]] = None):
+        """
+        전체 워크플로우 실행
+
+        Args:
+            preloaded: 배치 실행 시 공유 원본에서 미리 매칭된 1단계 입력
+            scan_counts: preloaded를 만든 공유 스캔의 비용 카운터 (1단계 기록용)
+        """
         print("\n" + "🚀 "*20)
         print(f"지적도 자동화 시작: {self.config['project']['display_name']}")
         print("🚀 "*20 + "\n")
 
-        try:
-            # 1단계: 필지 추출
-            shapefile_path, records = self.step1_extract_parcels()
-
-            # 2단계: 면적 계산
-            stats = self.step2_calculate_areas(shapefile_path, records)
+        processing = self.config.get('processing', {})
+        if processing.get('parallel_steps', True):
+            max_workers = processing.get('max_workers')
+        else:
+            max_workers = 1
 
-            # 3단계: 웹맵 생성
-            self.step3_create_webmap(shapefile_path, records)
+        if self.profiler is not None:
+            # tracemalloc은 프로세스 전체를 추적하므로 단계별 구분을 위해 순차 실행
+            max_workers = 1
+            print(f"🔬 프로파일링 모드 (단계 순차 실행): {self.profiler.output_dir}")
 
-            # 4단계: QGIS 출력물
-            self.step4_create_qgis_outputs(shapefile_path)
+        report = self.build_pipeline(preloaded, scan_counts).run(max_workers=max_workers)
+        report.print_summary()
 
-            print("\n" + "✅ "*20)
-            print("자동화 완료!")
-            print("✅ "*20 + "\n")
+        self.metrics.print_summary()
+        metrics_path = Path(self.config['output']['directory']) / f"{self.project_name}_metrics.json"
+        self.metrics.save(metrics_path)
+        print(f"\n✓ 실행 비용 기록: {metrics_path}")
 
-            print(f"출력 디렉토리: {self.config['output']['directory']}")
+        if self.profiler is not None:
+            print(f"✓ 프로파일: {self.profiler.output_dir} ({len(self.profiler.files)}개 파일)")
 
-        except Exception as e:
-            print(f"\n❌ 오류 발생: {e}")
-            import traceback
-            traceback.print_exc()
+        if not report.ok:
+            for result in report.failed:
+                print(f"\n❌ {result.name} 단계 오류: {result.error}")
+                print(result.traceback)
             return 1
 
+        print("\n" + "✅ "*20)
+        print("자동화 완료!")
+        print("✅ "*20 + "\n")
+
+        print(f"출력 디렉토리: {self.config['output']['directory']}")
+
         return 0
 
 
+def run_quick(project_name: str, parcels_file: str, source: str,
+              output_dir: Optional[str] = None, pnu_filter: Optional[str] = None,
+              write_shapefile: bool = False) -> int:
+    """
+    빠른 실행: YAML 설정 없이 필지 목록 하나를 바로 CSV/GeoJSON으로 출력
+
+    원본 색인(.cadidx)으로 목록의 지번에 해당하는 레코드만 오프셋으로 읽고,
+    매칭된 필지를 면적 CSV와 압축 GeoJSON에 한 건씩 바로 씁니다.
+    중간 산출물인 분류 shapefile은 write_shapefile일 때만 만듭니다.
+
+    Args:
+        project_name: 프로젝트 이름 (출력 파일명 접두사)
+        parcels_file: 필지 목록 파일 경로
+        source: 원본 shapefile 경로
+        output_dir: 출력 디렉토리 (None이면 output/<프로젝트>)
+        pnu_filter: PNU 접두사 필터 (법정동 코드 등)
+        write_shapefile: 분류 shapefile도 작성할지 여부
+
+    Returns:
+        종료 코드
+    """
+    import csv
+    import json
+
+    started = time.perf_counter()
+    output_dir = Path(output_dir) if output_dir else get_output_path(project_name)
+    formats = ['csv', 'geojson'] + (['shapefile'] if write_shapefile else [])
+    automation = CadastralAutomation(config={
+        'project': {'name': project_name, 'display_name': project_name, 'location': ''},
+        'input': {'source_shapefile': source, 'all_parcels': parcels_file,
+                  'pnu_filter': pnu_filter},
+        'output': {'directory': str(output_dir), 'formats': formats},
+        'processing': {'clean_jibun': True, 'convert_to_pyeong': True},
+    })
+
+    source_path = Path(source)
+    if not source_path.exists():
+        print(f"❌ 원본 shapefile을 찾을 수 없습니다: {source}")
+        return 1
+
+    categories = automation._load_categories()
+    if not categories.get('ALL'):
+        print(f"❌ 필지 목록이 비어 있습니다: {parcels_file}")
+        return 1
+
+    # 색인에서 후보 레코드만 찾아 해당 DBF 행/SHP 레코드만 읽기
+    index = SourceIndex.load_or_build(source, encoding=DBF_ENCODING)
+    matcher = automation.build_matcher(categories)
+    candidates = index.find_jibuns(categories['ALL'], clean_func=clean_jibun,
+                                   pnu_prefix=pnu_filter)
+
+    records = index.read_records(candidates, encoding=DBF_ENCODING)
+    matched_records = []
+    matched_indices = []
+    for idx in candidates:
+        category = matcher.match(records[idx])
+        if category:
+            records[idx]['CATEGORY'] = category
+            matched_records.append(records[idx])
+            matched_indices.append(idx)
+
+    parcels = ParcelCollection.from_indexed(
+        matched_records, index.read_geometries(matched_indices), matched_indices)
+    print(f"✓ 매칭된 필지: {len(parcels)}개 (원본 {len(index):,}개 레코드 중)")
+
+    try:
+        from korea_cadastral import sqm_to_pyeong
+    except ImportError:
+        sqm_to_pyeong = None
+        automation.config['processing']['convert_to_pyeong'] = False
+        print("⚠ korea_cadastral 미설치: 평 환산을 건너뜁니다")
+
+    try:
+        from pyproj import Transformer
+        transformer = Transformer.from_crs(DEFAULT_CRS, OUTPUT_CRS, always_xy=True)
+    except ImportError:
+        transformer = None
+        print("⚠ pyproj 미설치: GeoJSON 생성을 건너뜁니다 (pip install pyproj)")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = output_dir / f"{project_name}_areas.csv"
+    geojson_path = output_dir / f"{project_name}_parcels.geojson"
+
+    # 필지 단위로 CSV 행과 GeoJSON Feature를 바로 기록 (전체 목록을 메모리에 모으지 않음)
+    written = 0
+    with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f_csv:
+        writer = csv.DictWriter(f_csv, fieldnames=AREA_FIELDS)
+        writer.writeheader()
+
+        f_geo = open(geojson_path, 'w', encoding='utf-8') if transformer else None
+        try:
+            if f_geo:
+                f_geo.write('{"type":"FeatureCollection","features":[')
+            for idx, record in parcels:
+                writer.writerow(automation._area_row(parcels, idx, record, sqm_to_pyeong))
+                if f_geo is None:
+                    continue
+                geometry = automation._parcel_geometry(parcels, idx, transformer)
+                if geometry is None:
+                    continue
+                if written:
+                    f_geo.write(',')
+                json.dump(automation._parcel_feature(record, geometry), f_geo,
+                          ensure_ascii=False, separators=(',', ':'))
+                written += 1
+            if f_geo:
+                f_geo.write(']}')
+        finally:
+            if f_geo:
+                f_geo.close()
+
+    print(f"✓ 면적 통계 CSV: {csv_path}")
+    if transformer:
+        print(f"✓ GeoJSON 생성: {geojson_path} ({written}개 필지)")
+
+    if write_shapefile:
+        shapefile_path = output_dir / f"{project_name}_categorized.shp"
+        automation._write_shapefile(shapefile_path, parcels.records, parcels.geometries, source_path)
+        print(f"✓ 출력: {shapefile_path}")
+
+    print(f"\n✅ 빠른 실행 완료 ({time.perf_counter() - started:.2f}초)")
+    return 0
+
+
+def _run_batch_project(config_path: str, parcels: ParcelCollection, scan_counts: Dict[str, int],
+                       profile: bool = False, profile_top: int = 25) -> int:
+    """배치 작업자: 미리 매칭된 필지로 프로젝트 하나의 출력물 생성"""
+    automation = CadastralAutomation(config_path, profile=profile, profile_top=profile_top)
+    return automation.run(preloaded=parcels, scan_counts=scan_counts)
+
+
+def run_batch(config_paths: List[str], max_workers: Optional[int] = None,
+              profile: bool = False, profile_top: int = 25) -> int:
+    """
+    여러 프로젝트를 원본 데이터셋별로 묶어 일괄 실행
+
+    같은 원본 shapefile을 쓰는 프로젝트들은 DBF를 한 번만 읽고, 한 번의
+    레코드 스캔으로 모든 프로젝트의 필지 목록을 매칭합니다. 프로젝트별
+    출력물 생성(2~4단계 포함)은 프로세스 풀에서 병렬로 실행됩니다.
+
+    Args:
+        config_paths: 프로젝트 설정 파일 경로 목록
+        max_workers: 프로세스 풀 크기 (None이면 CPU 수)
+        profile: 프로젝트별 단계 프로파일 기록 여부
+        profile_top: 프로파일 상위 함수/할당 위치 출력 개수
+
+    Returns:
+        종료 코드 (하나라도 실패하면 1)
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    print("\n" + "="*60)
+    print(f"배치 실행: {len(config_paths)}개 프로젝트")
+    print("="*60)
+
+    # 원본 데이터셋별 그룹화
+    groups = {}
+    for config_path in config_paths:
+        automation = CadastralAutomation(config_path)
+        source = Path(automation.config['input']['source_shapefile']).resolve()
+        groups.setdefault(source, []).append((config_path, automation))
+
+    # 출력 경로 충돌 경고 (같은 디렉토리면 webmap/parcels.geojson을 덮어씀)
+    output_dirs = {}
+    for members in groups.values():
+        for config_path, automation in members:
+            out_dir = Path(automation.config['output']['directory']).resolve()
+            output_dirs.setdefault(out_dir, []).append(automation.project_name)
+    for out_dir, names in output_dirs.items():
+        if len(names) > 1:
+            print(f"⚠ 출력 디렉토리 공유 ({out_dir}): {', '.join(names)} - webmap 출력이 덮어써질 수 있습니다")
+
+    jobs = []
+    failures = []
+
+    for source, members in groups.items():
+        print(f"\n📂 원본: {source} ({len(members)}개 프로젝트)")
+
+        if not source.exists():
+            print(f"❌ 원본 shapefile을 찾을 수 없습니다: {source}")
+            failures.extend(config_path for config_path, _ in members)
+            continue
+
+        matchers = [automation.build_matcher(automation._load_categories())
+                    for _, automation in members]
+
+        # 모든 프로젝트에 PNU 필터가 있으면 공통 접두사를 스캔 단계에 적용
+        pnu_filters = [matcher.pnu_filter for matcher in matchers]
+        common_prefix = os.path.commonprefix(pnu_filters) if all(pnu_filters) else ''
+
+        # 스캔 작업자 수는 그룹에서 처음 지정한 프로젝트 설정 (단일 실행과 같은 키)
+        scan_workers = next((automation.config.get('processing', {}).get('scan_workers')
+                             for _, automation in members
+                             if automation.config.get('processing', {}).get('scan_workers')), None)
+        dbf_path = source.with_suffix('.dbf')
+        records = scan_dbf(
+            str(dbf_path),
+            where=DBFFilter(prefix={'PNU': common_prefix}) if common_prefix else None,
+            encoding=DBF_ENCODING,
+            workers=scan_workers
+        )
+        print(f"✓ DBF 레코드: {len(records)}개 (1회 로드)")
+        # 공유 스캔 비용을 각 프로젝트 1단계 실행 비용에 기록
+        scan_counts = {'records_scanned': read_dbf_header(str(dbf_path)).num_records,
+                       'bytes_read': dbf_path.stat().st_size}
+
+        # 단일 스캔으로 모든 프로젝트 매칭
+        matched = [([], []) for _ in members]
+        for idx, record in records.items():
+            for matcher, (project_records, project_indices) in zip(matchers, matched):
+                category = matcher.match(record)
+                if category:
+                    project_records.append(dict(record, CATEGORY=category))
+                    project_indices.append(idx)
+
+        # 지오메트리도 전체 프로젝트 합집합으로 한 번만 읽기
+        all_indices = sorted({idx for _, indices in matched for idx in indices})
+        geometries = members[0][1]._read_geometries(source, all_indices)
+
+        for (config_path, automation), (project_records, project_indices) in zip(members, matched):
+            parcels = ParcelCollection.from_indexed(project_records, geometries, project_indices)
+            print(f"  ✓ {automation.project_name}: {len(parcels)}개 필지 매칭")
+            jobs.append((config_path, parcels, scan_counts))
+
+    # 프로젝트별 출력물 병렬 생성
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_run_batch_project, config_path, parcels, scan_counts,
+                            profile, profile_top): config_path
+            for config_path, parcels, scan_counts in jobs
+        }
+        for future, config_path in futures.items():
+            try:
+                if future.result() != 0:
+                    failures.append(config_path)
+            except Exception as e:
+                print(f"❌ {config_path}: {e}")
+                failures.append(config_path)
+
+    print("\n" + "="*60)
+    print(f"배치 완료: 성공 {len(config_paths) - len(failures)}개, 실패 {len(failures)}개")
+    for config_path in failures:
+        print(f"  ❌ {config_path}")
+    print("="*60)
+
+    return 1 if failures else 0
+
+
 def main():
     """CLI 진입점"""
     parser = argparse.ArgumentParser(
@@ -797,16 +1247,58 @@ def main():
   # 설정 파일로 실행
   %(prog)s --config projects/myproject/config.yaml
 
-  # 빠른 실행 (간단한 옵션)
+  # 여러 프로젝트 일괄 실행 (같은 원본은 한 번만 로드)
+  %(prog)s batch projects/*/config.yaml
+
+  # 여러 설정 파일을 순서대로 실행하며 단계별 프로파일 기록
+  %(prog)s --config projects/a/config.yaml projects/b/config.yaml --profile
+
+  # 빠른 실행 (YAML 없이 CSV + GeoJSON, 원본 옆에 .cadidx 색인 생성)
   %(prog)s --project-name myproject --parcels input/parcels.txt --source data/source.shp
 
+  # 빠른 실행 + PNU 필터 + 분류 shapefile도 작성
+  %(prog)s -p myproject --parcels input/parcels.txt -s data/source.shp --pnu 4146136029 --write-shapefile
+
 자세한 설정은 config.example.yaml 참조
         '''
     )
 
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['batch'],
+        help='batch: 여러 설정 파일 일괄 실행'
+    )
+
+    parser.add_argument(
+        'configs',
+        nargs='*',
+        help='batch 명령의 설정 파일 경로 목록'
+    )
+
+    parser.add_argument(
+        '--workers', '-j',
+        type=int,
+        help='batch 명령의 병렬 프로세스 수 (기본값: CPU 수)'
+    )
+
     parser.add_argument(
         '--config', '-c',
-        help='YAML 설정 파일 경로'
+        nargs='+',
+        help='YAML 설정 파일 경로 (여러 개면 순서대로 실행)'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='단계별 cProfile/tracemalloc 프로파일 기록 (<출력>/profile/<프로젝트>/)'
+    )
+
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=25,
+        help='프로파일 상위 함수/할당 위치 출력 개수 (기본값: 25)'
     )
 
     parser.add_argument(
@@ -824,18 +1316,44 @@ def main():
         help='원본 shapefile 경로'
     )
 
+    parser.add_argument(
+        '--output', '-o',
+        help='빠른 실행 출력 디렉토리 (기본값: output/<프로젝트>)'
+    )
+
+    parser.add_argument(
+        '--pnu',
+        help='빠른 실행 PNU 접두사 필터 (예: 4146136029)'
+    )
+
+    parser.add_argument(
+        '--write-shapefile',
+        action='store_true',
+        help='빠른 실행에서 분류 shapefile도 작성'
+    )
+
     args = parser.parse_args()
 
+    if args.command == 'batch':
+        if not args.configs:
+            parser.error('batch 명령에는 설정 파일 경로가 하나 이상 필요합니다')
+        return run_batch(args.configs, max_workers=args.workers, profile=args.profile,
+                         profile_top=args.profile_top)
+
     if args.config:
-        # 설정 파일로 실행
-        automation = CadastralAutomation(args.config)
-        return automation.run()
+        # 설정 파일로 실행 (여러 개면 프로젝트별로 순서대로)
+        exit_code = 0
+        for config_path in args.config:
+            automation = CadastralAutomation(config_path, profile=args.profile,
+                                             profile_top=args.profile_top)
+            exit_code = automation.run() or exit_code
+        return exit_code
 
     elif args.project_name and args.parcels and args.source:
-        # TODO: 간단한 옵션으로 임시 설정 생성 후 실행
-        print("❌ 빠른 실행 모드는 추후 구현 예정")
-        print("현재는 --config 옵션을 사용하세요")
-        return 1
+        # 간단한 옵션으로 설정 없이 실행
+        return run_quick(args.project_name, args.parcels, args.source,
+                         output_dir=args.output, pnu_filter=args.pnu,
+                         write_shapefile=args.write_shapefile)
 
     else:
         parser.print_help()
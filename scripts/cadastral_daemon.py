@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+지적도 질의 데몬 (색인 상주)
+
+원본 연속지적도 데이터셋과 PNU/지번/공간 색인을 한 번만 메모리에 올려 두고
+로컬 HTTP(또는 Unix 소켓) JSON API로 필지 목록 추출, PNU 조회, bbox 질의를
+처리합니다. QGIS 스크립트나 웹맵이 스크립트를 매번 새로 띄우지 않고
+밀리초 단위로 질의할 수 있습니다. 원본 파일이 바뀌면 자동으로 다시 읽습니다.
+
+사용법:
+    # 데이터셋 등록 (이름=경로, 이름 생략 시 파일명)
+    python scripts/cadastral_daemon.py --source yongin=data/LSMD_CONT_LDREG_41461_202510.shp
+
+    # 프로젝트 설정 파일의 원본 사용, Unix 소켓으로 서비스
+    python scripts/cadastral_daemon.py --config projects/jubulli/config.yaml --socket /tmp/cadastral.sock
+
+API (모든 응답은 JSON, 좌표는 원본 좌표계 EPSG:5186 기준):
+    GET  /health
+    GET  /datasets
+    GET  /pnu?dataset=yongin&pnu=4146136029&limit=100
+    GET  /bbox?dataset=yongin&bbox=210000,520000,210500,520500[&crs=EPSG:4326][&geometry=1]
+    POST /extract  {"dataset": "yongin", "parcels": ["123", "124-1"], "pnu_filter": "4146136029"}
+                   {"dataset": "yongin", "categories": {"GREEN": [...], "RED": [...]}, "geometry": true}
+
+예:
+    curl 'http://127.0.0.1:8765/pnu?dataset=yongin&pnu=4146136029102420015'
+    curl --unix-socket /tmp/cadastral.sock http://localhost/datasets
+"""
+
+import argparse
+import json
+import math
+import os
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DEFAULT_CRS, OUTPUT_CRS, DBF_ENCODING
+from cadastral_auto import ParcelMatcher, clean_jibun
+from parcel_collection import ParcelCollection
+from source_index import SourceIndex
+from spatial_index import GridIndex
+
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 1000
+
+
+class QueryError(Exception):
+    """잘못된 질의 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class WarmDataset:
+    """메모리에 상주하는 원본 데이터셋 (색인 + 공간 색인)"""
+
+    def __init__(self, name: str, shp_path: str, workers: Optional[int] = None):
+        """
+        Args:
+            name: 데이터셋 이름 (API의 dataset 파라미터)
+            shp_path: 원본 shapefile 경로
+            workers: 색인 생성 시 DBF 스캔 작업자 수
+        """
+        self.name = name
+        self.shp_path = str(Path(shp_path).resolve())
+        self.workers = workers
+        self._reload_lock = threading.Lock()
+        self._state = None
+        self.loaded_at = None
+        self.load()
+
+    def load(self):
+        """색인을 읽고(없으면 생성) 조회 캐시와 공간 색인을 준비"""
+        started = time.perf_counter()
+        index = SourceIndex.load_or_build(self.shp_path, encoding=DBF_ENCODING,
+                                          workers=self.workers)
+        index.warm(clean_jibun)
+        grid = GridIndex(index.bboxes)
+
+        # 질의 스레드는 (index, grid) 쌍을 통째로 참조하므로 참조 교체만 하면 됨
+        self._state = (index, grid)
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        print(f"✓ {self.name}: {len(index):,}개 레코드 로드 "
+              f"({time.perf_counter() - started:.2f}초) - {self.shp_path}")
+
+    def reload_if_changed(self) -> bool:
+        """원본 파일이 바뀌었으면 다시 로드 (다시 로드했으면 True)"""
+        if not self._state[0].is_stale():
+            return False
+        with self._reload_lock:
+            if not self._state[0].is_stale():
+                return False
+            print(f"🔄 {self.name}: 원본 변경 감지, 다시 로드합니다")
+            try:
+                self.load()
+            except (OSError, ValueError, KeyError) as e:
+                # 파일 복사 중 등 일시적 상태면 기존 색인으로 계속 서비스
+                print(f"⚠ {self.name}: 다시 로드 실패 (기존 색인 유지): {e}")
+                return False
+            return True
+
+    def snapshot(self):
+        """현재 (색인, 공간 색인) 쌍"""
+        return self._state
+
+    def info(self) -> Dict:
+        index, grid = self.snapshot()
+        return {
+            'name': self.name,
+            'source': self.shp_path,
+            'records': len(index),
+            'indexed_geometries': len(grid),
+            'extent': list(grid.extent) if grid.extent else None,
+            'loaded_at': self.loaded_at,
+        }
+
+
+def _json_bbox(index: SourceIndex, idx: int) -> Optional[List[float]]:
+    bbox = index.bbox(idx)
+    return None if math.isnan(bbox[0]) else list(bbox)
+
+
+def _limit(params: Dict) -> int:
+    """limit 파라미터 (0 이상의 정수, 없으면 DEFAULT_LIMIT)"""
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        raise QueryError(f"limit 값은 정수여야 합니다: {params.get('limit')!r}")
+    if limit < 0:
+        raise QueryError(f"limit 값은 0 이상이어야 합니다: {limit}")
+    return limit
+
+
+def _jibun_list(value, name: str) -> List[str]:
+    """지번 목록 파라미터 (문자열 하나를 글자 단위로 쪼개지 않도록 목록만 받음)"""
+    if not isinstance(value, list):
+        raise QueryError(f"{name} 값은 지번 목록(JSON 배열)이어야 합니다")
+    return value
+
+
+class CadastralQueryService:
+    """데이터셋 질의 처리 (HTTP 계층과 분리)"""
+
+    def __init__(self, datasets: Dict[str, WarmDataset]):
+        self.datasets = datasets
+        # pyproj Transformer는 스레드 간 공유하지 않음 (요청 스레드별 캐시)
+        self._local = threading.local()
+
+    def _dataset(self, name: Optional[str]) -> WarmDataset:
+        if not name:
+            if len(self.datasets) == 1:
+                return next(iter(self.datasets.values()))
+            raise QueryError("dataset 파라미터가 필요합니다")
+        if name not in self.datasets:
+            raise QueryError(f"데이터셋 없음: {name}", status=404)
+        return self.datasets[name]
+
+    def _transformer(self, source_crs: str, target_crs: str):
+        transformers = self._local.__dict__.setdefault('transformers', {})
+        key = (source_crs, target_crs)
+        if key not in transformers:
+            try:
+                from pyproj import Transformer
+            except ImportError:
+                raise QueryError("좌표 변환에는 pyproj가 필요합니다 (pip install pyproj)", status=501)
+            transformers[key] = Transformer.from_crs(source_crs, target_crs, always_xy=True)
+        return transformers[key]
+
+    def _records(self, index: SourceIndex, idxs: List[int]) -> List[Dict]:
+        records = index.read_records(idxs, encoding=DBF_ENCODING)
+        return [dict(records[idx], idx=idx, bbox=_json_bbox(index, idx)) for idx in idxs]
+
+    def _add_geometry(self, index: SourceIndex, items: List[Dict], crs: Optional[str]):
+        """items에 GeoJSON geometry 추가 (crs가 주어지면 해당 좌표계로 변환)"""
+        idxs = [item['idx'] for item in items]
+        parcels = ParcelCollection.from_indexed(items, index.read_geometries(idxs), idxs)
+        transformer = self._transformer(DEFAULT_CRS, crs) if crs and crs != DEFAULT_CRS else None
+        for i, item in parcels:
+            item['geometry'] = parcels.geojson_geometry(i, transformer)
+
+    def health(self, params: Dict) -> Dict:
+        return {'status': 'ok', 'datasets': len(self.datasets)}
+
+    def list_datasets(self, params: Dict) -> Dict:
+        return {'datasets': [dataset.info() for dataset in self.datasets.values()]}
+
+    def lookup_pnu(self, params: Dict) -> Dict:
+        """PNU 조회 (19자리면 정확히 일치, 짧으면 접두사)"""
+        pnu = params.get('pnu')
+        if not pnu:
+            raise QueryError("pnu 파라미터가 필요합니다")
+        limit = _limit(params)
+
+        index, _ = self._dataset(params.get('dataset')).snapshot()
+        idxs = index.find_pnu_prefix(pnu)
+        total = len(idxs)
+        return {'total': total, 'records': self._records(index, idxs[:limit])}
+
+    def query_bbox(self, params: Dict) -> Dict:
+        """bbox와 겹치는 필지 (crs를 주면 해당 좌표계의 bbox로 해석)"""
+        try:
+            xmin, ymin, xmax, ymax = (float(v) for v in params['bbox'].split(','))
+        except (KeyError, ValueError):
+            raise QueryError("bbox=xmin,ymin,xmax,ymax 형식이 필요합니다")
+        limit = _limit(params)
+        crs = params.get('crs')
+
+        if crs and crs != DEFAULT_CRS:
+            # 네 모서리를 원본 좌표계로 변환한 외접 사각형
+            xs, ys = self._transformer(crs, DEFAULT_CRS).transform(
+                [xmin, xmin, xmax, xmax], [ymin, ymax, ymin, ymax])
+            xmin, ymin, xmax, ymax = min(xs), min(ys), max(xs), max(ys)
+
+        index, grid = self._dataset(params.get('dataset')).snapshot()
+        idxs = grid.query(xmin, ymin, xmax, ymax)
+        records = self._records(index, idxs[:limit])
+        if params.get('geometry') in ('1', 'true', True):
+            self._add_geometry(index, records, crs)
+        return {'total': len(idxs), 'records': records}
+
+    def extract(self, params: Dict) -> Dict:
+        """필지 목록 추출 (cadastral_auto의 매칭 규칙과 동일)"""
+        if params.get('categories'):
+            if not isinstance(params['categories'], dict):
+                raise QueryError("categories는 {분류: 지번 목록} 객체여야 합니다")
+            categories = {str(cat).upper(): _jibun_list(parcels, f"categories.{cat}")
+                          for cat, parcels in params['categories'].items()}
+        elif params.get('parcels'):
+            categories = {'ALL': _jibun_list(params['parcels'], 'parcels')}
+        else:
+            raise QueryError("parcels 또는 categories가 필요합니다")
+
+        pnu_filter = params.get('pnu_filter')
+        matcher = ParcelMatcher(categories, pnu_filter=pnu_filter,
+                                clean_jibun=params.get('clean_jibun', True),
+                                clean_func=clean_jibun)
+
+        index, _ = self._dataset(params.get('dataset')).snapshot()
+        wanted = [jibun for parcels in categories.values() for jibun in parcels]
+        candidates = index.find_jibuns(wanted, clean_func=clean_jibun, pnu_prefix=pnu_filter)
+
+        matched = []
+        for item in self._records(index, candidates):
+            category = matcher.match(item)
+            if category:
+                item['CATEGORY'] = category
+                matched.append(item)
+
+        idxs = [item['idx'] for item in matched]
+        parcels = ParcelCollection.from_indexed(matched, index.read_geometries(idxs), idxs)
+        for i, item in parcels:
+            item['area_sqm'] = parcels.area(i)
+        if params.get('geometry'):
+            self._add_geometry(index, matched, params.get('crs', OUTPUT_CRS))
+
+        found = {item['JIBUN'] for item in matched} | {clean_jibun(item['JIBUN']) for item in matched}
+        missing = [jibun for jibun in wanted if jibun not in found]
+        return {'total': len(matched), 'missing': missing, 'records': matched}
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """JSON API 요청 처리"""
+
+    service: CadastralQueryService = None
+    routes = {
+        ('GET', '/health'): 'health',
+        ('GET', '/datasets'): 'list_datasets',
+        ('GET', '/pnu'): 'lookup_pnu',
+        ('GET', '/bbox'): 'query_bbox',
+        ('POST', '/extract'): 'extract',
+    }
+
+    def _handle(self, method: str):
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            route = self.routes.get((method, url.path.rstrip('/') or '/'))
+            if route is None:
+                raise QueryError(f"알 수 없는 경로: {method} {url.path}", status=404)
+            if method == 'POST':
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    params.update(json.loads(self.rfile.read(length) or b'{}'))
+                except ValueError:
+                    raise QueryError("요청 본문이 올바른 JSON이 아닙니다")
+            result = getattr(self.service, route)(params)
+            status = 200
+        except QueryError as e:
+            result, status = {'error': str(e)}, e.status
+        except Exception as e:
+            result, status = {'error': f"{type(e).__name__}: {e}"}, 500
+
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        body = json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        # 웹맵(다른 포트의 정적 서버)에서도 호출할 수 있도록
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def address_string(self):
+        # Unix 소켓은 클라이언트 주소가 없음
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Unix 소켓 HTTP 서버 (POSIX 전용)"""
+        daemon_threads = True
+
+        def server_bind(self):
+            socketserver.UnixStreamServer.server_bind(self)
+            self.server_name, self.server_port = 'localhost', 0
+
+
+def watch_datasets(datasets: Dict[str, WarmDataset], interval: float, stop: threading.Event):
+    """원본 파일 변경 감시 (interval초마다 크기/수정 시각 확인)"""
+    while not stop.wait(interval):
+        for dataset in datasets.values():
+            dataset.reload_if_changed()
+
+
+def load_datasets(sources: List[str], config_paths: List[str],
+                  workers: Optional[int] = None) -> Dict[str, WarmDataset]:
+    """--source 이름=경로 / --config 설정 파일에서 데이터셋 로드"""
+    import yaml
+
+    entries = []
+    for source in sources:
+        name, sep, path = source.partition('=')
+        if not sep:
+            name, path = Path(source).stem, source
+        entries.append((name, path))
+    for config_path in config_paths:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        entries.append((config['project']['name'], config['input']['source_shapefile']))
+
+    datasets = {}
+    for name, path in entries:
+        resolved = str(Path(path).resolve())
+        # 같은 원본을 쓰는 프로젝트는 색인을 공유
+        shared = next((d for d in datasets.values() if d.shp_path == resolved), None)
+        datasets[name] = shared or WarmDataset(name, path, workers=workers)
+    return datasets
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='지적도 질의 데몬 (색인 상주 JSON API)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예시:
+  %(prog)s --source yongin=data/LSMD_CONT_LDREG_41461_202510.shp
+  %(prog)s --config projects/jubulli/config.yaml --socket /tmp/cadastral.sock
+
+엔드포인트: /health, /datasets, /pnu, /bbox, /extract (POST)
+        '''
+    )
+    parser.add_argument('--source', '-s', action='append', default=[],
+                        help='원본 shapefile (이름=경로, 여러 번 지정 가능)')
+    parser.add_argument('--config', '-c', nargs='+', default=[],
+                        help='프로젝트 설정 파일 (input.source_shapefile 사용)')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'포트 (기본값: {DEFAULT_PORT})')
+    parser.add_argument('--socket', help='Unix 소켓 경로 (지정하면 TCP 대신 사용)')
+    parser.add_argument('--watch-interval', type=float, default=2.0,
+                        help='원본 변경 확인 주기 초 (기본값: 2, 0이면 감시 안 함)')
+    parser.add_argument('--workers', type=int, help='색인 생성 시 DBF 스캔 작업자 수')
+    parser.add_argument('--verbose', '-v', action='store_true', help='요청 로그 출력')
+    args = parser.parse_args()
+
+    if not args.source and not args.config:
+        parser.error('--source 또는 --config로 데이터셋을 하나 이상 지정하세요')
+
+    datasets = load_datasets(args.source, args.config, workers=args.workers)
+    QueryHandler.service = CadastralQueryService(datasets)
+
+    if args.socket:
+        if not hasattr(socketserver, 'UnixStreamServer'):
+            parser.error('이 플랫폼은 Unix 소켓을 지원하지 않습니다')
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = ThreadingUnixHTTPServer(args.socket, QueryHandler)
+        address = f"unix:{args.socket}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), QueryHandler)
+        address = f"http://{args.host}:{args.port}"
+    server.verbose = args.verbose
+
+    stop = threading.Event()
+    if args.watch_interval > 0:
+        threading.Thread(target=watch_datasets, args=(datasets, args.watch_interval, stop),
+                         daemon=True).start()
+
+    print(f"\n🚀 지적도 질의 데몬 시작: {address} ({len(datasets)}개 데이터셋)")
+    print("   종료: Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다")
+    finally:
+        stop.set()
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
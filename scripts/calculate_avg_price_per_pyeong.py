@@ -1,59 +1,76 @@
 """
 서초구 아파트 평균 평당가 계산
-"""
-import csv
-
-csv_path = '/mnt/c/Users/ksj27/PROJECTS/QGIS/data/아파트(매매)_실거래가_20251022152629.csv'
-
-print("=" * 70)
-print("📊 서초구 아파트 평균 평당가 계산")
-print("=" * 70)
-
-# 서초구 거래 데이터 수집
-seocho_transactions = []
 
-with open(csv_path, 'r', encoding='euc-kr') as f:
-    # 헤더 스킵
-    for _ in range(15):
-        f.readline()
+가격 큐브(price_cube.py)의 단지별 셀을 기간/면적대로 합산해 계산합니다 (거래를 다시 읽지 않음).
+거래 저장소에 적재된 거래가 기준입니다 (trade_store.py ingest 또는 molit_trade_api.py --store).
 
-    reader = csv.DictReader(f)
-
-    for row in reader:
-        district = row.get('시군구', '')
+사용법:
+    python scripts/calculate_avg_price_per_pyeong.py                          # 서초구 전체 기간
+    python scripts/calculate_avg_price_per_pyeong.py --months 6 --area 84     # 최근 6개월, 60~85㎡
+"""
+import argparse
+import sys
+from pathlib import Path
 
-        if '서초구' in district:
-            complex_name = row.get('단지명', '')
-            area_sqm = float(row.get('전용면적(㎡)', '0') or '0')
-            price_10k = int(row.get('거래금액(만원)', '0').replace(',', '') or '0')
+sys.path.insert(0, str(Path(__file__).parent))
 
-            if area_sqm > 0 and price_10k > 0:
-                # 평당 가격 계산
-                area_pyeong = area_sqm / 3.3058  # 1평 = 3.3058㎡
-                price_won = price_10k * 10000  # 만원 → 원
-                price_per_pyeong = price_won / area_pyeong
+from price_cube import PriceCube, band_for, months_back
+from trade_store import DEFAULT_STORE_PATH, TradeStore
 
-                seocho_transactions.append({
-                    'complex_name': complex_name,
-                    'area_sqm': area_sqm,
-                    'area_pyeong': area_pyeong,
-                    'price_10k': price_10k,
-                    'price_won': price_won,
-                    'price_per_pyeong': price_per_pyeong
-                })
 
-print(f"\n✅ 서초구 거래 데이터: {len(seocho_transactions)}건")
+def main():
+    parser = argparse.ArgumentParser(description='아파트 평균 평당가 계산 (가격 큐브)')
+    parser.add_argument('--region', default='11650', help='지역코드 (기본값: 11650 서초구)')
+    parser.add_argument('--start', help='시작 계약년월 (YYYYMM)')
+    parser.add_argument('--end', help='끝 계약년월 (YYYYMM, 기본값: 큐브의 마지막 달)')
+    parser.add_argument('--months', type=int, help='끝 달까지 최근 N개월 (--start 대신)')
+    parser.add_argument('--area', type=float, help='전용면적(㎡) - 해당 면적대만')
+    parser.add_argument('--band', help='면적대 라벨 (~60, 60~85, 85~102, 102~135, 135~)')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH),
+                        help='거래 저장소 경로 (기본값: data/apt_trades.sqlite)')
+    args = parser.parse_args()
 
-if len(seocho_transactions) == 0:
-    print("\n⚠️  서초구 거래 데이터가 없습니다!")
-else:
-    # 평균 평당가 계산
-    total_price_per_pyeong = sum(t['price_per_pyeong'] for t in seocho_transactions)
-    avg_price_per_pyeong = total_price_per_pyeong / len(seocho_transactions)
+    print("=" * 70)
+    print("📊 서초구 아파트 평균 평당가 계산")
+    print("=" * 70)
 
-    # 최소/최대 평당가
-    min_transaction = min(seocho_transactions, key=lambda x: x['price_per_pyeong'])
-    max_transaction = max(seocho_transactions, key=lambda x: x['price_per_pyeong'])
+    try:
+        band = band_for(args.area, args.band)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        return 1
+
+    # TradeStore는 없는 경로에 빈 저장소를 만들므로 먼저 확인
+    if not Path(args.store).exists():
+        print(f"\n❌ 거래 저장소가 없습니다: {args.store}")
+        print("   먼저 월별 거래 파일을 적재하세요:")
+        print(f"   python scripts/trade_store.py --db {args.store} ingest data/apt_trade_{args.region}_*.json")
+        print(f"   또는 수집하면서 적재: python scripts/molit_trade_api.py --region {args.region} "
+              f"--start YYYYMM --end YYYYMM --store {args.store}")
+        return 1
+
+    with TradeStore(args.store) as store:
+        cube = PriceCube(store)
+        cube.refresh()
+        end = args.end or cube.latest_month([args.region])
+        start = months_back(end, args.months - 1) if end and args.months else args.start
+        # 단지별 셀 합산 (평당가: 거래별 만원/평)
+        complex_stats = cube.window(start, end, lawd_cds=[args.region],
+                                    bands=[band] if band else None, by=('apt_nm',))
+        total = cube.window(start, end, lawd_cds=[args.region],
+                            bands=[band] if band else None, by=()).get(())
+
+    if not total:
+        print("\n⚠️  서초구 거래 데이터가 없습니다!")
+        print("\n" + "=" * 70)
+        return 0
+
+    print(f"\n✅ 서초구 거래 데이터: {total['count']}건 ({start or '처음'} ~ {end}, 면적대 {band or '전체'})")
+
+    # 만원/평 → 원/평
+    avg_price_per_pyeong = total['price_per_pyeong'] * 10000
+    min_complex, min_stats = min(complex_stats.items(), key=lambda x: x[1]['pyeong_min'])
+    max_complex, max_stats = max(complex_stats.items(), key=lambda x: x[1]['pyeong_max'])
 
     print("\n" + "=" * 70)
     print("📈 서초구 평당가 통계")
@@ -61,39 +78,30 @@ else:
 
     print(f"\n🎯 평균 평당가: {avg_price_per_pyeong:,.0f}원/평")
     print(f"   (약 {avg_price_per_pyeong/10000:,.0f}만원/평)")
+    print(f"   중위 거래가: {total['median']:,.0f}만원")
 
-    print(f"\n📉 최저 평당가: {min_transaction['price_per_pyeong']:,.0f}원/평")
-    print(f"   - 단지: {min_transaction['complex_name']}")
-    print(f"   - 면적: {min_transaction['area_pyeong']:.1f}평 ({min_transaction['area_sqm']:.2f}㎡)")
-    print(f"   - 거래가: {min_transaction['price_10k']:,}만원")
-
-    print(f"\n📈 최고 평당가: {max_transaction['price_per_pyeong']:,.0f}원/평")
-    print(f"   - 단지: {max_transaction['complex_name']}")
-    print(f"   - 면적: {max_transaction['area_pyeong']:.1f}평 ({max_transaction['area_sqm']:.2f}㎡)")
-    print(f"   - 거래가: {max_transaction['price_10k']:,}만원")
-
-    # 단지별 평균 평당가 (거래 건수가 있는 단지만)
-    from collections import defaultdict
-
-    complex_prices = defaultdict(list)
-    for t in seocho_transactions:
-        complex_prices[t['complex_name']].append(t['price_per_pyeong'])
+    print(f"\n📉 최저 평당가: {min_stats['pyeong_min'] * 10000:,.0f}원/평")
+    print(f"   - 단지: {min_complex[0]}")
 
-    complex_avg = {}
-    for complex_name, prices in complex_prices.items():
-        complex_avg[complex_name] = sum(prices) / len(prices)
+    print(f"\n📈 최고 평당가: {max_stats['pyeong_max'] * 10000:,.0f}원/평")
+    print(f"   - 단지: {max_complex[0]}")
 
-    # 평당가 높은 순으로 정렬
-    sorted_complexes = sorted(complex_avg.items(), key=lambda x: x[1], reverse=True)
+    # 단지별 평균 평당가 - 평당가 높은 순
+    sorted_complexes = sorted(complex_stats.items(), key=lambda x: x[1]['price_per_pyeong'], reverse=True)
 
     print("\n" + "=" * 70)
     print("🏢 단지별 평균 평당가 (상위 10개)")
     print("=" * 70)
 
-    for i, (complex_name, avg_price) in enumerate(sorted_complexes[:10], 1):
-        count = len(complex_prices[complex_name])
+    for i, ((complex_name,), stats) in enumerate(sorted_complexes[:10], 1):
+        avg_price = stats['price_per_pyeong'] * 10000
         print(f"\n{i}. {complex_name}")
         print(f"   평균 평당가: {avg_price:,.0f}원/평 ({avg_price/10000:,.0f}만원/평)")
-        print(f"   거래 건수: {count}건")
+        print(f"   거래 건수: {stats['count']}건")
+
+    print("\n" + "=" * 70)
+    return 0
+
 
-print("\n" + "=" * 70)
+if __name__ == '__main__':
+    sys.exit(main())
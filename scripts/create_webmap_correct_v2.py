@@ -81,7 +81,10 @@ if apt_layer.isValid():
             'properties': {
                 'apt_nm': apt_nm,
                 'rdnmadr': rdnmadr,
-                'dngct': dngct
+                'dngct': dngct,
+                # 거래 필지 키 매칭용 (bjd_cd가 숫자 필드면 소수점 제거)
+                'bjd_cd': safe_str(feature['bjd_cd']).split('.')[0],
+                'lnmadr': safe_str(feature['lnmadr'])
             }
         })
 
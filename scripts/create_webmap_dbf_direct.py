@@ -1,7 +1,7 @@
 """
 서초구 지적도 + 아파트 웹맵 (DBF 직접 읽기 버전)
-- ZIP에서 DBF 직접 추출하여 EUC-KR로 읽기
-- shapefile은 좌표만 사용
+- 아파트 마스터는 bjd_cd 색인(apt_master.py)으로 서초구 구간만 EUC-KR로 읽기
+- 좌표는 같은 레코드 번호의 SHP 포인트
 """
 from qgis.core import (
     QgsVectorLayer, QgsProject, QgsCoordinateReferenceSystem,
@@ -9,65 +9,15 @@ from qgis.core import (
 )
 import json
 import os
-import zipfile
-import struct
-
-def read_dbf_with_encoding(dbf_bytes, encoding='euc-kr'):
-    """DBF 파일을 지정된 인코딩으로 읽기"""
-    # DBF 헤더 파싱
-    header = struct.unpack('<BBBBIHH20x', dbf_bytes[:32])
-    num_records = header[4]
-    header_len = header[5]
-    record_len = header[6]
-
-    # 필드 정보 읽기
-    fields = []
-    pos = 32
-    while dbf_bytes[pos] != 0x0D:  # 필드 종료 마커
-        field_info = struct.unpack('<11sc4xBB14x', dbf_bytes[pos:pos+32])
-        field_name = field_info[0].rstrip(b'\x00').decode('ascii')
-        field_type = field_info[1].decode('ascii')
-        field_len = field_info[2]
-        fields.append((field_name, field_type, field_len))
-        pos += 32
-
-    # 레코드 읽기
-    records = []
-    data_start = header_len
-    for i in range(num_records):
-        record_start = data_start + i * record_len
-        record = {}
-        offset = 1  # 첫 바이트는 삭제 마커
-
-        for field_name, field_type, field_len in fields:
-            value_bytes = dbf_bytes[record_start + offset:record_start + offset + field_len]
-
-            if field_type == 'C':  # Character
-                try:
-                    value = value_bytes.decode(encoding).strip()
-                except:
-                    value = value_bytes.decode('utf-8', errors='ignore').strip()
-            elif field_type == 'N':  # Numeric
-                value = value_bytes.decode('ascii').strip()
-                if value:
-                    try:
-                        if '.' in value:
-                            value = float(value)
-                        else:
-                            value = int(value)
-                    except:
-                        value = 0
-                else:
-                    value = 0
-            else:
-                value = value_bytes.decode('ascii', errors='ignore').strip()
-
-            record[field_name] = value
-            offset += field_len
-
-        records.append(record)
-
-    return records
+import sys
+
+# 스크립트 디렉토리 (QGIS 콘솔 exec 실행 시 __file__이 없으므로 고정 경로 사용)
+script_dir = 'C:/Users/ksj27/PROJECTS/QGIS/scripts'
+if '__file__' in globals():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from apt_master import AptMasterIndex
 
 print("=" * 70)
 print("🌐 웹맵 생성 (DBF 직접 읽기 버전)")
@@ -76,74 +26,63 @@ print("=" * 70)
 output_dir = 'C:/Users/ksj27/PROJECTS/QGIS/output/webmap'
 os.makedirs(output_dir, exist_ok=True)
 
-# 1단계: DBF에서 속성 읽기 (EUC-KR)
-print("\n1️⃣  아파트 DBF 직접 읽기 중 (EUC-KR)...")
+# 1단계: 아파트 마스터 색인에서 서초구 읽기 (EUC-KR)
+print("\n1️⃣  아파트 마스터 색인 읽기 중 (EUC-KR)...")
 apt_zip = 'C:/Users/ksj27/PROJECTS/QGIS/data/apt_mst_info_202410_shp.zip'
 
-with zipfile.ZipFile(apt_zip, 'r') as z:
-    dbf_bytes = z.read('apt_mst_info_202410.dbf')
+apt_index = AptMasterIndex.load_or_build(apt_zip)
+print(f"   총 레코드: {len(apt_index):,}개")
 
-dbf_records = read_dbf_with_encoding(dbf_bytes, 'euc-kr')
-print(f"   총 레코드: {len(dbf_records):,}개")
-
-# 서초구만 필터링 (bjd_cd LIKE '1165%')
-seocho_records = [r for r in dbf_records if str(r.get('bjd_cd', '')).startswith('1165')]
+# 서초구만 (bjd_cd LIKE '1165%') - 속성과 좌표가 같은 레코드 번호로 묶여 있음
+seocho_records = apt_index.find('1165')
 print(f"   서초구 레코드: {len(seocho_records):,}개")
 
 # 처음 5개만
 seocho_records = seocho_records[:5]
 
-# 2단계: Shapefile에서 좌표 읽기
+# 2단계: 좌표 (SHP 포인트, 원본 좌표계 그대로)
 print("\n2️⃣  아파트 좌표 읽기 중...")
-apt_shp = 'apt_mst_info_202410.shp'
-apt_path = f'/vsizip/{apt_zip}/{apt_shp}'
-
-apt_layer = QgsVectorLayer(apt_path, 'temp', 'ogr')
-
-if apt_layer.isValid():
-    print(f"   원본 CRS: {apt_layer.crs().authid()}")
-    apt_layer.setSubsetString("bjd_cd LIKE '1165%'")
-
-    # DBF 레코드와 shapefile 피처를 매칭
-    apt_features = []
-    feature_list = list(apt_layer.getFeatures())[:5]
-
-    for i, (feature, dbf_record) in enumerate(zip(feature_list, seocho_records)):
-        geom = feature.geometry()
-        point = geom.asPoint()
-
-        apt_nm = dbf_record.get('apt_nm', '')
-        rdnmadr = dbf_record.get('rdnmadr', '')
-        dngct = dbf_record.get('dngct', 0)
 
-        apt_features.append({
-            'type': 'Feature',
-            'geometry': {
-                'type': 'Point',
-                'coordinates': [point.x(), point.y()]
-            },
-            'properties': {
-                'apt_nm': apt_nm,
-                'rdnmadr': rdnmadr,
-                'dngct': int(dngct) if dngct else 0
-            }
-        })
+apt_features = []
+for i, (record_no, dbf_record, point) in enumerate(seocho_records):
+    if point is None:
+        continue
+
+    apt_nm = dbf_record.get('apt_nm', '')
+    rdnmadr = dbf_record.get('rdnmadr', '')
+    dngct = dbf_record.get('dngct', 0)
+
+    apt_features.append({
+        'type': 'Feature',
+        'geometry': {
+            'type': 'Point',
+            'coordinates': [point[0], point[1]]
+        },
+        'properties': {
+            'apt_nm': apt_nm,
+            'rdnmadr': rdnmadr,
+            'dngct': int(dngct) if dngct else 0,
+            # 거래 필지 키 매칭용
+            'bjd_cd': dbf_record.get('bjd_cd', ''),
+            'lnmadr': dbf_record.get('lnmadr', '')
+        }
+    })
 
-        print(f"   {i+1}. {apt_nm}")
-        print(f"      주소: {rdnmadr}")
-        print(f"      동수: {dngct}개")
-        print(f"      좌표: ({point.x():.6f}, {point.y():.6f})")
+    print(f"   {i+1}. {apt_nm}")
+    print(f"      주소: {rdnmadr}")
+    print(f"      동수: {dngct}개")
+    print(f"      좌표: ({point[0]:.6f}, {point[1]:.6f})")
 
-    apt_geojson = {
-        'type': 'FeatureCollection',
-        'features': apt_features
-    }
+apt_geojson = {
+    'type': 'FeatureCollection',
+    'features': apt_features
+}
 
-    # UTF-8로 저장
-    with open(f'{output_dir}/apartments.geojson', 'w', encoding='utf-8') as f:
-        json.dump(apt_geojson, f, ensure_ascii=False, indent=2)
+# UTF-8로 저장
+with open(f'{output_dir}/apartments.geojson', 'w', encoding='utf-8') as f:
+    json.dump(apt_geojson, f, ensure_ascii=False, indent=2)
 
-    print(f"\n✅ 아파트 GeoJSON 생성: {len(apt_features)}개")
+print(f"\n✅ 아파트 GeoJSON 생성: {len(apt_features)}개")
 
 # 3단계: 지적도 변환
 print("\n3️⃣  서초구 지적도 100개 변환 중...")
@@ -53,7 +53,10 @@ if apt_layer.isValid():
             'properties': {
                 'apt_nm': str(feature['apt_nm'] or ''),
                 'rdnmadr': str(feature['rdnmadr'] or ''),
-                'dngct': int(feature['dngct']) if feature['dngct'] else 0
+                'dngct': int(feature['dngct']) if feature['dngct'] else 0,
+                # 거래 필지 키 매칭용 (bjd_cd가 숫자 필드면 소수점 제거)
+                'bjd_cd': str(feature['bjd_cd'] or '').split('.')[0],
+                'lnmadr': str(feature['lnmadr'] or '')
             }
         })
         
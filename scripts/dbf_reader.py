@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+고정 길이 DBF 레코드 병렬 스캔 리더
+
+DBF 레코드는 고정 길이이므로 레코드 범위를 청크로 나누어 여러 프로세스에서
+동시에 필터링/디코딩할 수 있습니다. 각 작업자는 같은 파일을 읽기 전용
+mmap으로 열어 OS 페이지 캐시를 공유하고, 결과는 레코드 순서대로 병합됩니다.
+
+필터는 디코딩 전에 원시 바이트 단계에서 적용되므로, 전국 단위 파일에서
+일부 지역만 뽑는 경우 대부분의 레코드는 디코딩하지 않습니다.
+
+사용법:
+    from dbf_reader import scan_dbf, DBFFilter
+
+    records = scan_dbf('LSMD_CONT_LDREG_41461.dbf',
+                       where=DBFFilter(prefix={'PNU': '4146136029'}),
+                       workers=8)
+
+벤치마크:
+    python scripts/dbf_reader.py bench data/apt_mst_info_202410.dbf --field bjd_cd --prefix 1165
+"""
+
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# 이보다 레코드가 적으면 프로세스 기동 비용이 더 커서 단일 프로세스로 스캔
+PARALLEL_MIN_RECORDS = 50000
+
+# 작업자당 청크 수 (작업량 불균형 완화)
+CHUNKS_PER_WORKER = 4
+
+
+class DBFHeader:
+    """DBF 헤더 (레코드 수, 길이, 필드 구조)"""
+
+    def __init__(self, num_records: int, header_len: int, record_len: int,
+                 fields: List[Tuple[str, str, int, int]]):
+        """
+        Args:
+            num_records: 레코드 수
+            header_len: 헤더 길이 (바이트, 첫 레코드 시작 위치)
+            record_len: 레코드 길이 (삭제 마커 1바이트 포함)
+            fields: (필드명, 타입, 길이, 레코드 내 오프셋) 목록
+        """
+        self.num_records = num_records
+        self.header_len = header_len
+        self.record_len = record_len
+        self.fields = fields
+        self.field_map = {name: (f_type, length, offset)
+                          for name, f_type, length, offset in fields}
+
+    @classmethod
+    def parse(cls, data: bytes) -> 'DBFHeader':
+        """헤더 바이트 파싱 (파일 앞부분 또는 전체 바이트)"""
+        header = struct.unpack('<BBBBIHH20x', data[:32])
+        num_records = header[4]
+        header_len = header[5]
+        record_len = header[6]
+
+        fields = []
+        pos = 32
+        offset = 1  # 첫 바이트는 삭제 마커
+        while pos < header_len and data[pos] != 0x0D:
+            name = data[pos:pos+11].split(b'\x00')[0].decode('ascii')
+            f_type = chr(data[pos+11])
+            length = data[pos+16]
+            fields.append((name, f_type, length, offset))
+            offset += length
+            pos += 32
+
+        return cls(num_records, header_len, record_len, fields)
+
+
+def read_dbf_header(path: str) -> DBFHeader:
+    """DBF 파일 헤더 읽기"""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        header_len = struct.unpack('<H', head[8:10])[0]
+        return DBFHeader.parse(head + f.read(header_len - 32))
+
+
+class DBFFilter:
+    """
+    원시 바이트 단계 레코드 필터 (프로세스 간 전달 가능)
+
+    Args:
+        prefix: {필드명: 접두사} - 필드 값이 접두사로 시작하는 레코드만
+        values: {필드명: 값 목록} - 필드 값이 목록에 있는 레코드만
+        encoding: 비교 값 인코딩
+    """
+
+    def __init__(self, prefix: Optional[Dict[str, str]] = None,
+                 values: Optional[Dict[str, Iterable[str]]] = None,
+                 encoding: str = 'cp949'):
+        self.prefix = {name: str(p).encode(encoding) for name, p in (prefix or {}).items()}
+        self.values = {name: {str(v).encode(encoding) for v in vals}
+                       for name, vals in (values or {}).items()}
+
+    def compile(self, header: DBFHeader) -> List[Tuple[int, int, str, object]]:
+        """필드명을 레코드 내 바이트 범위로 변환"""
+        tests = []
+        for name, expected in self.prefix.items():
+            if name not in header.field_map:
+                raise KeyError(f"DBF에 '{name}' 필드가 없습니다")
+            _, length, offset = header.field_map[name]
+            tests.append((offset, offset + length, 'prefix', expected))
+        for name, expected in self.values.items():
+            if name not in header.field_map:
+                raise KeyError(f"DBF에 '{name}' 필드가 없습니다")
+            _, length, offset = header.field_map[name]
+            tests.append((offset, offset + length, 'values', expected))
+        return tests
+
+
+def _decode_value(raw: bytes, f_type: str, encoding: str):
+    """필드 값 디코딩 (C: 문자열, N/F: 숫자, 그 외: 문자열)"""
+    if f_type == 'C':
+        try:
+            return raw.decode(encoding).strip()
+        except UnicodeDecodeError:
+            return raw.decode(encoding, errors='ignore').strip()
+    if f_type in ('N', 'F'):
+        text = raw.decode('ascii', errors='ignore').strip()
+        if not text or text.startswith('*'):
+            return None
+        try:
+            return float(text) if '.' in text else int(text)
+        except ValueError:
+            return None
+    return raw.decode('ascii', errors='ignore').strip()
+
+
+def decode_record(rec: bytes, header: DBFHeader, encoding: str = 'cp949') -> Dict:
+    """레코드 바이트 하나를 {필드명: 값}으로 디코딩"""
+    return {name: _decode_value(rec[offset:offset + length], f_type, encoding)
+            for name, f_type, length, offset in header.fields}
+
+
+def _scan_range(buf, header: DBFHeader, start: int, stop: int,
+                tests: list, encoding: str, fields: Optional[List[str]]) -> List[Tuple[int, Dict]]:
+    """레코드 범위 [start, stop) 필터링 및 디코딩"""
+    header_len = header.header_len
+    record_len = header.record_len
+    if fields is None:
+        decode_fields = [(name, f_type, offset, offset + length)
+                         for name, f_type, length, offset in header.fields]
+    else:
+        decode_fields = [(name, header.field_map[name][0], header.field_map[name][2],
+                          header.field_map[name][2] + header.field_map[name][1])
+                         for name in fields]
+
+    results = []
+    for idx in range(start, stop):
+        pos = header_len + idx * record_len
+        rec = buf[pos:pos + record_len]
+        if len(rec) < record_len:
+            break
+        if rec[0] == 0x2A:  # 삭제된 레코드
+            continue
+
+        matched = True
+        for begin, end, kind, expected in tests:
+            raw = rec[begin:end].strip(b' \x00')
+            if kind == 'prefix':
+                if not raw.startswith(expected):
+                    matched = False
+                    break
+            elif raw not in expected:
+                matched = False
+                break
+        if not matched:
+            continue
+
+        record = {}
+        for name, f_type, begin, end in decode_fields:
+            record[name] = _decode_value(rec[begin:end], f_type, encoding)
+        results.append((idx, record))
+
+    return results
+
+
+def _scan_file_chunk(path: str, header: DBFHeader, start: int, stop: int,
+                     tests: list, encoding: str, fields: Optional[List[str]]) -> List[Tuple[int, Dict]]:
+    """작업자 프로세스: 파일을 mmap으로 열어 청크 스캔"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return _scan_range(buf, header, start, stop, tests, encoding, fields)
+
+
+def _chunk_ranges(num_records: int, chunks: int) -> List[Tuple[int, int]]:
+    """레코드 범위를 균등한 청크로 분할"""
+    size = max(1, -(-num_records // chunks))
+    return [(start, min(start + size, num_records)) for start in range(0, num_records, size)]
+
+
+def _process_context():
+    """
+    작업자 프로세스 시작 방식 (forkserver, 없으면 spawn)
+
+    scan_dbf는 파이프라인 DAG의 작업 스레드에서도 호출되므로, 여러 스레드가 있는
+    프로세스를 fork하지 않습니다 (다른 스레드가 잡고 있던 잠금이 자식에서 풀리지 않음).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def scan_dbf(source: Union[str, bytes], where: Optional[DBFFilter] = None,
+             encoding: str = 'cp949', workers: Optional[int] = None,
+             fields: Optional[List[str]] = None) -> Dict[int, Dict]:
+    """
+    DBF 레코드 스캔 (필터 + 디코딩, 레코드 순서 유지)
+
+    Args:
+        source: DBF 파일 경로 또는 DBF 전체 바이트 (ZIP에서 읽은 경우 등)
+        where: 원시 바이트 필터 (None이면 전체 레코드)
+        encoding: 문자 필드 인코딩
+        workers: 작업자 프로세스 수 (None이면 CPU 수, 1이면 단일 프로세스).
+                 바이트 입력은 항상 단일 프로세스로 스캔
+        fields: 디코딩할 필드 목록 (None이면 전체 필드)
+
+    Returns:
+        {레코드 번호(0부터): 레코드 딕셔너리} - 레코드 번호는 SHP 레코드 순서와 같음
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        header = DBFHeader.parse(bytes(source[:32 + 32 * 256]))
+        tests = where.compile(header) if where else []
+        return dict(_scan_range(source, header, 0, header.num_records, tests, encoding, fields))
+
+    path = str(source)
+    header = read_dbf_header(path)
+    tests = where.compile(header) if where else []
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or header.num_records < PARALLEL_MIN_RECORDS:
+        return dict(_scan_file_chunk(path, header, 0, header.num_records, tests, encoding, fields))
+
+    ranges = _chunk_ranges(header.num_records, workers * CHUNKS_PER_WORKER)
+    records = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_process_context()) as executor:
+        futures = [executor.submit(_scan_file_chunk, path, header, start, stop,
+                                   tests, encoding, fields)
+                   for start, stop in ranges]
+        # 청크 제출 순서대로 병합 → 레코드 순서 유지
+        for future in futures:
+            records.update(future.result())
+    return records
+
+
+def benchmark(path: str, field: str, prefix: str, max_workers: int = 8,
+              encoding: str = 'cp949'):
+    """작업자 수별 필터 스캔 처리량 측정 (scan_dbf 그대로, 프로세스 시작 비용 포함)"""
+    header = read_dbf_header(path)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    where = DBFFilter(prefix={field: prefix}, encoding=encoding)
+
+    print(f"📂 {path}")
+    print(f"   레코드: {header.num_records:,}개 ({size_mb:,.1f}MB), 필터: {field} LIKE '{prefix}%'")
+    if header.num_records < PARALLEL_MIN_RECORDS:
+        print(f"⚠️  레코드가 {PARALLEL_MIN_RECORDS:,}개 미만이라 scan_dbf는 작업자 수와 관계없이 단일 프로세스로 스캔합니다")
+    print(f"\n{'작업자':>6} {'소요(초)':>10} {'레코드/초':>14} {'MB/초':>8} {'배속':>6}  매칭")
+
+    base = None
+    workers = 1
+    while workers <= max_workers:
+        started = time.perf_counter()
+        records = scan_dbf(path, where=where, encoding=encoding, workers=workers)
+        elapsed = time.perf_counter() - started
+        base = base or elapsed
+        print(f"{workers:>6} {elapsed:>10.3f} {header.num_records / elapsed:>14,.0f} "
+              f"{size_mb / elapsed:>8.1f} {base / elapsed:>5.1f}x  {len(records):,}")
+        workers *= 2
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DBF 병렬 스캔 벤치마크')
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help='작업자 수별 필터 스캔 처리량 측정')
+    bench.add_argument('dbf', help='DBF 파일 경로')
+    bench.add_argument('--field', required=True, help='필터 필드명 (예: PNU, bjd_cd)')
+    bench.add_argument('--prefix', required=True, help='필터 접두사 (예: 1165)')
+    bench.add_argument('--max-workers', type=int, default=8, help='최대 작업자 수 (기본값: 8)')
+    bench.add_argument('--encoding', default='cp949', help='문자 인코딩 (기본값: cp949)')
+    args = parser.parse_args()
+
+    benchmark(args.dbf, args.field, args.prefix, args.max_workers, args.encoding)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,67 +5,20 @@
 인코딩: EUC-KR
 검증: 파일 존재 여부 사전 확인
 """
-import csv
 import json
-import zipfile
-import struct
 import os
+import sys
 from collections import defaultdict
 from qgis.core import QgsVectorLayer
 
-def read_dbf_with_encoding(dbf_bytes, encoding='euc-kr'):
-    """DBF 파일을 지정된 인코딩으로 읽기"""
-    header = struct.unpack('<BBBBIHH20x', dbf_bytes[:32])
-    num_records = header[4]
-    header_len = header[5]
-    record_len = header[6]
-
-    fields = []
-    pos = 32
-    while dbf_bytes[pos] != 0x0D:
-        field_info = struct.unpack('<11sc4xBB14x', dbf_bytes[pos:pos+32])
-        field_name = field_info[0].rstrip(b'\x00').decode('ascii')
-        field_type = field_info[1].decode('ascii')
-        field_len = field_info[2]
-        fields.append((field_name, field_type, field_len))
-        pos += 32
-
-    records = []
-    data_start = header_len
-    for i in range(num_records):
-        record_start = data_start + i * record_len
-        record = {}
-        offset = 1
-
-        for field_name, field_type, field_len in fields:
-            value_bytes = dbf_bytes[record_start + offset:record_start + offset + field_len]
-
-            if field_type == 'C':
-                try:
-                    value = value_bytes.decode(encoding).strip()
-                except:
-                    value = value_bytes.decode('utf-8', errors='ignore').strip()
-            elif field_type == 'N':
-                value = value_bytes.decode('ascii').strip()
-                if value:
-                    try:
-                        if '.' in value:
-                            value = float(value)
-                        else:
-                            value = int(value)
-                    except:
-                        value = 0
-                else:
-                    value = 0
-            else:
-                value = value_bytes.decode('ascii', errors='ignore').strip()
-
-            record[field_name] = value
-            offset += field_len
-
-        records.append(record)
-
-    return records
+# 스크립트 디렉토리 (QGIS 콘솔 exec 실행 시 __file__이 없으므로 고정 경로 사용)
+script_dir = 'C:/Users/ksj27/PROJECTS/QGIS/scripts'
+if '__file__' in globals():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from apt_master import AptMasterIndex
+from trade_csv import iter_batches
 
 def format_price_korean(price_10k):
     """가격을 한국식 표기로 변환"""
@@ -114,29 +67,22 @@ if not os.path.exists(output_dir):
 print("\n1️⃣  CSV에서 서초구 거래 추출 중...")
 transactions_by_complex = defaultdict(list)
 
-with open(csv_path, 'r', encoding='euc-kr') as f:
-    for _ in range(15):
-        f.readline()
-
-    reader = csv.DictReader(f)
-
-    for row in reader:
-        district = row.get('시군구', '')
-
-        if '서초구' in district:
-            complex_name = row.get('단지명', '')
-
-            if complex_name:
-                transaction = {
-                    'complex_name': complex_name,
-                    'area_sqm': float(row.get('전용면적(㎡)', '0') or '0'),
-                    'contract_ym': row.get('계약년월', ''),
-                    'contract_day': row.get('계약일', '').strip(),
-                    'price_10k': int(row.get('거래금액(만원)', '0').replace(',', '') or '0'),
-                    'floor': row.get('층', ''),
-                    'road_name': row.get('도로명', '')
-                }
-                transactions_by_complex[complex_name].append(transaction)
+# 헤더 위치는 자동으로 찾고, 서초구 행만 파싱 (trade_csv.py)
+columns = ['단지명', '전용면적(㎡)', '계약년월', '계약일', '거래금액(만원)', '층', '도로명']
+for batch in iter_batches(csv_path, districts=['서초구'], columns=columns):
+    for complex_name, area_sqm, contract_ym, contract_day, price_10k, floor, road_name in zip(
+            *(batch[column] for column in columns)):
+        if complex_name:
+            transaction = {
+                'complex_name': complex_name,
+                'area_sqm': area_sqm or 0.0,
+                'contract_ym': str(contract_ym or ''),
+                'contract_day': f"{contract_day:02d}" if contract_day else '',
+                'price_10k': price_10k or 0,
+                'floor': '' if floor is None else str(floor),
+                'road_name': road_name
+            }
+            transactions_by_complex[complex_name].append(transaction)
 
 print(f"   ✅ 서초구 아파트 단지: {len(transactions_by_complex)}개")
 print(f"   ✅ 총 거래: {sum(len(v) for v in transactions_by_complex.values())}건")
@@ -148,29 +94,12 @@ if len(transactions_by_complex) == 0:
 # 2단계: 아파트 마스터에서 좌표 찾기
 print("\n2️⃣  아파트 마스터에서 좌표 찾기...")
 
-# DBF 읽기
-with zipfile.ZipFile(apt_zip, 'r') as z:
-    dbf_bytes = z.read('apt_mst_info_202410.dbf')
-
-all_apt_records = read_dbf_with_encoding(dbf_bytes, 'euc-kr')
-seocho_apt_records = [
-    r for r in all_apt_records
-    if str(r.get('bjd_cd', '')).startswith('1165')
-]
+# bjd_cd 정렬 색인에서 서초구 구간만 읽기 (속성과 좌표가 같은 레코드 번호로 묶여 있음)
+apt_index = AptMasterIndex.load_or_build(apt_zip)
+seocho_apt_records = apt_index.find('1165')
 
 print(f"   ✅ 서초구 아파트 마스터: {len(seocho_apt_records):,}개")
 
-# Shapefile 읽기
-apt_shp = 'apt_mst_info_202410.shp'
-apt_path = f'/vsizip/{apt_zip}/{apt_shp}'
-apt_layer = QgsVectorLayer(apt_path, 'temp', 'ogr')
-
-if not apt_layer.isValid():
-    print("   ❌ Shapefile 로드 실패")
-    raise Exception("Shapefile load failed")
-
-apt_layer.setSubsetString("bjd_cd LIKE '1165%'")
-
 # 3단계: 매칭 및 GeoJSON 생성
 print("\n3️⃣  거래 데이터와 매칭 중...")
 
@@ -178,19 +107,17 @@ apt_features = []
 matched_count = 0
 unmatched_complexes = set(transactions_by_complex.keys())
 
-for feature in apt_layer.getFeatures():
-    fid = feature.id()
-    if fid < len(seocho_apt_records):
-        dbf_record = seocho_apt_records[fid]
+for record_no, dbf_record, point in seocho_apt_records:
+    if point is not None:
         apt_nm = dbf_record.get('apt_nm', '')
 
-        geom = feature.geometry()
-        point = geom.asPoint()
-
         properties = {
             'apt_nm': apt_nm,
             'rdnmadr': dbf_record.get('rdnmadr', ''),
-            'dngct': int(dbf_record.get('dngct', 0))
+            'dngct': int(dbf_record.get('dngct') or 0),
+            # 거래 필지 키 매칭용
+            'bjd_cd': dbf_record.get('bjd_cd', ''),
+            'lnmadr': dbf_record.get('lnmadr', '')
         }
 
         if apt_nm in transactions_by_complex:
@@ -231,7 +158,7 @@ for feature in apt_layer.getFeatures():
             'type': 'Feature',
             'geometry': {
                 'type': 'Point',
-                'coordinates': [point.x(), point.y()]
+                'coordinates': [point[0], point[1]]
             },
             'properties': properties
         })
@@ -118,6 +118,18 @@ with open(csv_path, 'r', encoding='euc-kr') as f:
 print(f"   ✅ 서초구 아파트 단지: {len(transactions_by_complex)}개")
 print(f"   ✅ 총 거래: {sum(len(v) for v in transactions_by_complex.values())}건")
 
+# 단지별 최근 거래 3개: 전체 거래를 계약일 역순으로 한 번 정렬해서 단지마다 앞에서 3건
+# (같은 날 거래는 CSV 순서 유지 - 피처마다 단지 거래를 다시 정렬하지 않음)
+recent_by_complex = defaultdict(list)
+for t in sorted(
+    (t for trans_list in transactions_by_complex.values() for t in trans_list),
+    key=lambda x: (x['contract_ym'], x['contract_day']),
+    reverse=True
+):
+    recent = recent_by_complex[t['complex_name']]
+    if len(recent) < 3:
+        recent.append(t)
+
 # 2단계: 아파트 마스터에서 좌표 찾기
 print("\n2️⃣  아파트 마스터에서 좌표 찾기...")
 
@@ -174,11 +186,7 @@ for feature in apt_layer.getFeatures():
             trans_list = transactions_by_complex[apt_nm]
 
             # 최근 거래 3개
-            sorted_trans = sorted(
-                trans_list,
-                key=lambda x: (x['contract_ym'], x['contract_day']),
-                reverse=True
-            )[:3]
+            sorted_trans = recent_by_complex[apt_nm]
 
             # 평균 가격
             avg_price = sum(t['price_10k'] for t in sorted_trans) / len(sorted_trans)
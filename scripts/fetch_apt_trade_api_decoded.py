@@ -7,8 +7,10 @@
 
 import urllib.request
 import urllib.parse
-import xml.etree.ElementTree as ET
-import json
+import os
+
+from trade_response_cache import ResponseCache
+from trade_stream import TRADE_FIELDS, ApiError, TradeFileWriter, TradeStreamParser
 
 # API 설정 - Decoding 버전 사용
 SERVICE_KEY_DECODED = "UTbePYIP4ncyCP2hgiw146sprZ18xCv7Ca5xxNf0CNR1tM3PI7Rldtr08mQQ1a4htR/PhCPWLdAbidhgI7IDIQ=="
@@ -17,6 +19,12 @@ BASE_URL = "http://apis.data.go.kr/1613000/RTMSDataSvcAptTradeDev/getRTMSDataSvc
 # 지역코드
 LAWD_CD_SEOCHO = "11650"  # 서울특별시 서초구
 
+# 응답 캐시 (마감된 달은 다시 받지 않음, MOLIT_OFFLINE=1이면 캐시만 사용)
+response_cache = ResponseCache(offline=os.getenv('MOLIT_OFFLINE') == '1')
+
+# 예전 API 응답은 태그 이름이 한글 (출력 키와 같음)
+KOREAN_TAG_FIELDS = tuple((key, key) for key, _ in TRADE_FIELDS)
+
 def fetch_apartment_trades(lawd_cd=LAWD_CD_SEOCHO, deal_ymd="202410", page_no=1, num_of_rows=10):
     """
     아파트 매매 실거래가 조회
@@ -26,6 +34,9 @@ def fetch_apartment_trades(lawd_cd=LAWD_CD_SEOCHO, deal_ymd="202410", page_no=1,
         deal_ymd: 계약년월 (YYYYMM)
         page_no: 페이지번호
         num_of_rows: 한 페이지 결과 수
+
+    Returns:
+        기록한 거래 수 (실패 시 None)
     """
 
     # 모든 파라미터를 urlencode로 처리 (serviceKey 포함)
@@ -48,80 +59,45 @@ def fetch_apartment_trades(lawd_cd=LAWD_CD_SEOCHO, deal_ymd="202410", page_no=1,
 
     try:
         req = urllib.request.Request(full_url)
-        with urllib.request.urlopen(req, timeout=30) as response:
+        cache_key = response_cache.key(BASE_URL, lawd_cd, deal_ymd, page_no, num_of_rows)
+        with response_cache.urlopen(req, cache_key, timeout=30) as response:
             status_code = response.getcode()
             print(f"\n✅ 응답 코드: {status_code}")
 
-            if status_code == 200:
-                # XML 파싱
-                response_data = response.read()
-                xml_content = response_data.decode('utf-8')
-
-                # XML 저장
-                xml_file = f'/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_trade_{deal_ymd}_raw.xml'
-                with open(xml_file, 'w', encoding='utf-8') as f:
-                    f.write(xml_content)
-                print(f"💾 XML 저장: {xml_file}")
-
-                # XML 파싱
-                root = ET.fromstring(response_data)
-
-                # 응답 헤더 확인
-                result_code = root.findtext('.//resultCode')
-                result_msg = root.findtext('.//resultMsg')
-
-                print(f"\n결과 코드: {result_code}")
-                print(f"결과 메시지: {result_msg}")
-
-                if result_code == "00":  # 정상
-                    # 데이터 파싱
-                    items = root.findall('.//item')
-                    print(f"\n📊 조회 결과: {len(items)}건")
-
-                    trades = []
-                    for item in items:
-                        trade = {
-                            '아파트': item.findtext('아파트', ''),
-                            '법정동': item.findtext('법정동', ''),
-                            '거래금액': item.findtext('거래금액', '').strip(),
-                            '건축년도': item.findtext('건축년도', ''),
-                            '년': item.findtext('년', ''),
-                            '월': item.findtext('월', ''),
-                            '일': item.findtext('일', ''),
-                            '전용면적': item.findtext('전용면적', ''),
-                            '지번': item.findtext('지번', ''),
-                            '지역코드': item.findtext('지역코드', ''),
-                            '층': item.findtext('층', ''),
-                            '도로명': item.findtext('도로명', ''),
-                            '해제사유발생일': item.findtext('해제사유발생일', ''),
-                        }
-                        trades.append(trade)
-
-                    # JSON 저장
-                    json_file = f'/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_trade_{deal_ymd}.json'
-                    with open(json_file, 'w', encoding='utf-8') as f:
-                        json.dump(trades, f, ensure_ascii=False, indent=2)
-                    print(f"💾 JSON 저장: {json_file}")
-
-                    # 샘플 출력
-                    if trades:
-                        print(f"\n샘플 데이터 (첫 3건):")
-                        for i, trade in enumerate(trades[:3], 1):
-                            print(f"\n{i}. {trade['아파트']}")
-                            print(f"   위치: {trade['법정동']} {trade['지번']}")
-                            print(f"   거래금액: {trade['거래금액']}만원")
-                            print(f"   면적: {trade['전용면적']}㎡")
-                            print(f"   층: {trade['층']}층")
-                            print(f"   거래일: {trade['년']}-{trade['월']}-{trade['일']}")
-
-                    return trades
-                else:
-                    print(f"❌ API 오류: {result_msg}")
-                    return None
-            else:
+            if status_code != 200:
                 print(f"❌ HTTP 오류: {status_code}")
                 return None
 
+            # 응답을 읽는 대로 파싱해 JSON에 바로 기록 (원본 XML은 응답 캐시에 보관)
+            json_file = f'/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_trade_{deal_ymd}.json'
+            parser = TradeStreamParser(response, KOREAN_TAG_FIELDS)
+            samples = []
+            with TradeFileWriter(json_file) as writer:
+                for trade in parser:
+                    writer.write(trade)
+                    if len(samples) < 3:
+                        samples.append(trade)
+
+        print(f"\n결과 코드: {parser.result_code}")
+        print(f"📊 조회 결과: {parser.rows}건 (전체 {parser.total_count}건)")
+        print(f"💾 JSON 저장: {json_file}")
+
+        # 샘플 출력
+        if samples:
+            print(f"\n샘플 데이터 (첫 3건):")
+            for i, trade in enumerate(samples, 1):
+                print(f"\n{i}. {trade['아파트']}")
+                print(f"   위치: {trade['법정동']} {trade['지번']}")
+                print(f"   거래금액: {trade['거래금액']}만원")
+                print(f"   면적: {trade['전용면적']}㎡")
+                print(f"   층: {trade['층']}층")
+                print(f"   거래일: {trade['년']}-{trade['월']}-{trade['일']}")
+
+        return parser.rows
+
+    except ApiError as e:
+        print(f"❌ {e}")
+        return None
     except urllib.error.HTTPError as e:
         print(f"\n❌ HTTP 오류: {e.code}")
         print(f"응답 내용: {e.read().decode('utf-8')[:500]}")
@@ -140,7 +116,10 @@ if __name__ == "__main__":
     # 2024년 10월 데이터만 테스트
     result = fetch_apartment_trades(deal_ymd="202410", num_of_rows=10)
 
-    if result:
-        print(f"\n✅ 성공: {len(result)}건 조회")
+    if result is not None:
+        print(f"\n✅ 성공: {result}건 조회")
     else:
         print(f"\n❌ 실패")
+
+    print(f"\n📦 {response_cache.report()}")
+    response_cache.flush_stats()
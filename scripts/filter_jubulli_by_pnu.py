@@ -10,6 +10,16 @@ from qgis.core import (
 )
 from qgis.utils import iface
 import csv
+import os
+import sys
+
+# 스크립트 디렉토리 (QGIS 콘솔 exec 실행 시 __file__이 없으므로 고정 경로 사용)
+script_dir = 'C:/Users/ksj27/PROJECTS/QGIS/scripts'
+if '__file__' in globals():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from bjd_codes import BjdCodeTable
 
 # 1. 연속지적도 로드
 cadastral_path = 'C:/Users/ksj27/PROJECTS/QGIS/data/원본_shapefile/용인시_처인구/LSMD_CONT_LDREG_41461_202510.shp'
@@ -22,9 +32,13 @@ if not cadastral_layer.isValid():
 print(f"✅ 연속지적도 로드 완료: {cadastral_layer.featureCount()}개 필지")
 
 # 2. PNU 코드로 주북리 필터링
-# PNU 구조: 41461 (처인구) + 101 (양지면) + 00 (주북리) + 1 (지목코드) + ...
-# 주북리 PNU 패�n: 41461101001...
-jubulli_pnu_prefix = '41461101001'
+# PNU 구조: 41461 (처인구) + 360 (양지면) + 29 (주북리) + 1 (일반/산) + 본번 4 + 부번 4
+# 주북리 PNU 접두사는 법정동 코드표에서 찾기 (4146136029)
+jubulli_matches = BjdCodeTable.load().find('처인구 주북리')
+if not jubulli_matches:
+    print("❌ 법정동 코드표에서 주북리를 찾을 수 없습니다")
+    exit(1)
+jubulli_pnu_prefix = jubulli_matches[0][0]
 
 filter_expr = f'"PNU" LIKE \'{jubulli_pnu_prefix}%\''
 cadastral_layer.setSubsetString(filter_expr)
@@ -2,12 +2,19 @@
 # -*- coding: utf-8 -*-
 """
 양지면의 모든 리 코드 찾기
+
+양지면 PNU 접두사와 리 이름은 법정동 코드표(bjd_codes.py)에서 찾습니다.
 """
 
 import struct
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bjd_codes import BjdCodeTable
+
 def read_dbf(dbf_path, encoding='cp949'):
     """DBF 파일 파싱"""
     with open(dbf_path, 'rb') as f:
@@ -64,27 +71,30 @@ print("📖 DBF 파일 읽는 중...")
 records = read_dbf(str(dbf_path))
 print(f"✅ {len(records):,}개 레코드 로드\n")
 
-# Find all Yangji-myeon (101) PNU codes
-yangji_pnu_prefix = '41461101'
+# 양지면 PNU 접두사 (코드표: 처인구 양지면 → 41461360)
+bjd_table = BjdCodeTable.load()
+yangji_pnu_prefix = bjd_table.find('처인구 양지면')[0][0]
 yangji_records = [r for r in records if str(r.get('PNU', '')).startswith(yangji_pnu_prefix)]
-print(f"✅ 양지면 필지: {len(yangji_records):,}개\n")
+print(f"✅ 양지면 필지 (PNU {yangji_pnu_prefix}...): {len(yangji_records):,}개\n")
 
-# Group by 리 code (3 digits after myeon code)
+# 리 코드 (PNU 앞 10자리 법정동 코드)별로 묶기
 ri_codes = defaultdict(list)
 for r in yangji_records:
     pnu = r.get('PNU', '')
-    if len(pnu) >= 11:
-        ri_code = pnu[5:8]  # Extract 리 code
-        ri_codes[ri_code].append(r)
+    if len(pnu) >= 10:
+        ri_codes[pnu[:10]].append(r)
+
+ri_list = sorted(ri_codes.keys())
+ri_names = bjd_table.resolve(ri_list)['ri']
 
 print("📋 양지면 리 코드 목록:")
-print(f"{'리코드':<10} {'필지수':>10} {'샘플 지번':<30}")
-print("-" * 55)
-for ri_code in sorted(ri_codes.keys()):
+print(f"{'리코드':<12} {'리':<8} {'필지수':>10} {'샘플 지번':<30}")
+print("-" * 70)
+for ri_code, ri_name in zip(ri_list, ri_names):
     parcels = ri_codes[ri_code]
     sample_jibun = parcels[0].get('JIBUN', '') if parcels else ''
     sample_pnu = parcels[0].get('PNU', '') if parcels else ''
-    print(f"{ri_code:<10} {len(parcels):>10,}개  {sample_jibun:<15} (PNU: {sample_pnu})")
+    print(f"{ri_code:<12} {ri_name or '?':<8} {len(parcels):>10,}개  {sample_jibun:<15} (PNU: {sample_pnu})")
 
 # Search for 821 parcels in all ri codes
 print("\n" + "=" * 60)
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+합성 연속지적도 (LSMD_CONT_LDREG 형식) 데이터셋 생성기
+
+성능 측정용으로 실제 연속지적도와 같은 구조의 shapefile을 만듭니다.
+
+- EPSG:5186 좌표의 인접 필지 N개 (격자 꼭짓점을 공유하도록 흔들어 배치)
+- cp949 DBF: PNU(19자리), JIBUN("123-4대", "산12임"), BCHK, SGG_OID, COL_ADM_SE, JIBUN_AREA
+- PNU와 (지목을 뺀) 지번은 모두 고유 (본번이 4자리를 넘으면 다음 리 코드로 나누어 배치)
+- 다중 파트 필지 (도로로 나뉜 필지)와 구멍이 있는 필지 포함
+- 카테고리별 필지 목록 (green/blue/red) 및 프로젝트 설정 파일
+
+사용법:
+    python scripts/generate_synthetic_cadastral.py --parcels 100000 --output data/synthetic/100k
+"""
+
+import argparse
+import math
+import os
+import random
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+
+# 기본 위치: 용인시 처인구 양지면 부근 (EPSG:5186)
+DEFAULT_ORIGIN = (210000.0, 520000.0)
+DEFAULT_BJD_CODE = '4146136029'  # 용인시 처인구 양지면 주북리
+
+# PNU 본번 자리 수 상한 (넘으면 다음 법정동 코드)
+MAX_BONBUN = 9999
+
+PRJ_5186 = (
+    'PROJCS["Korea_2000_Korea_Central_Belt_2010",GEOGCS["GCS_Korea_2000",'
+    'DATUM["D_Korea_2000",SPHEROID["GRS_1980",6378137.0,298.257222101]],'
+    'PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],'
+    'PROJECTION["Transverse_Mercator"],PARAMETER["False_Easting",200000.0],'
+    'PARAMETER["False_Northing",600000.0],PARAMETER["Central_Meridian",127.0],'
+    'PARAMETER["Scale_Factor",1.0],PARAMETER["Latitude_Of_Origin",38.0],UNIT["Meter",1.0]]'
+)
+
+# 지목 접미사 (실제 연속지적도 JIBUN 필드 형식)
+LAND_USE = ['전', '답', '대', '임', '잡', '도', '천', '구', '유', '제', '하', '목']
+
+DBF_FIELDS = [
+    ('PNU', 'C', 19, 0),
+    ('JIBUN', 'C', 30, 0),
+    ('BCHK', 'C', 1, 0),
+    ('SGG_OID', 'N', 10, 0),
+    ('COL_ADM_SE', 'C', 5, 0),
+    ('JIBUN_AREA', 'N', 19, 9),
+]
+
+
+def _ring_area(ring: List[Tuple[float, float]]) -> float:
+    """링 면적 (shoelace, 시계 방향이면 양수)"""
+    total = 0.0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        total += x1 * y2 - x2 * y1
+    return -total / 2
+
+
+def next_bjd_code(code: str) -> str:
+    """다음 리 코드 (리 99 다음은 다음 읍면동의 리 01)"""
+    emd, ri = int(code[:8]), int(code[8:])
+    if ri < 99:
+        return f"{emd:08d}{ri + 1:02d}"
+    return f"{emd + 1:08d}01"
+
+
+def _lerp(a, b, t):
+    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+
+
+def _polygon_content(rings: List[List[Tuple[float, float]]]) -> bytes:
+    """Polygon(5) 레코드 콘텐츠 바이트"""
+    points = [pt for ring in rings for pt in ring]
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+
+    parts = []
+    start = 0
+    for ring in rings:
+        parts.append(start)
+        start += len(ring)
+
+    content = struct.pack('<i4d', 5, min(xs), min(ys), max(xs), max(ys))
+    content += struct.pack('<ii', len(rings), len(points))
+    content += struct.pack(f'<{len(parts)}i', *parts)
+    content += struct.pack(f'<{len(points) * 2}d', *[c for pt in points for c in pt])
+    return content
+
+
+def _shape_header(file_length_bytes: int, bbox: Tuple[float, float, float, float]) -> bytes:
+    """SHP/SHX 100바이트 헤더"""
+    header = struct.pack('>7i', 9994, 0, 0, 0, 0, 0, file_length_bytes // 2)
+    header += struct.pack('<2i', 1000, 5)
+    header += struct.pack('<8d', bbox[0], bbox[1], bbox[2], bbox[3], 0, 0, 0, 0)
+    return header
+
+
+def _dbf_header(num_records: int) -> bytes:
+    """DBF 헤더 + 필드 디스크립터"""
+    header_len = 32 + 32 * len(DBF_FIELDS) + 1
+    record_len = 1 + sum(length for _, _, length, _ in DBF_FIELDS)
+
+    data = bytearray(32)
+    data[0] = 0x03
+    data[1:4] = bytes([125, 10, 1])
+    data[4:8] = struct.pack('<I', num_records)
+    data[8:10] = struct.pack('<H', header_len)
+    data[10:12] = struct.pack('<H', record_len)
+    data[29] = 0x79  # 언어 드라이버: cp949
+
+    for name, f_type, length, decimal in DBF_FIELDS:
+        desc = bytearray(32)
+        desc[0:len(name)] = name.encode('ascii')
+        desc[11] = ord(f_type)
+        desc[16] = length
+        desc[17] = decimal
+        data += desc
+    data += b'\r'
+    return bytes(data)
+
+
+def _dbf_record(values: Dict[str, str]) -> bytes:
+    """DBF 레코드 바이트 (C: 왼쪽 정렬, N: 오른쪽 정렬)"""
+    out = bytearray(b' ')
+    for name, f_type, length, _ in DBF_FIELDS:
+        raw = values[name].encode('cp949')[:length]
+        out += raw.rjust(length) if f_type == 'N' else raw.ljust(length)
+    return bytes(out)
+
+
+def generate_dataset(num_parcels: int, output_dir: Path, seed: int = 42,
+                     cell_size: float = 30.0, multipart_ratio: float = 0.02,
+                     hole_ratio: float = 0.01, list_ratio: float = 0.01,
+                     bjd_code: str = DEFAULT_BJD_CODE,
+                     origin: Tuple[float, float] = DEFAULT_ORIGIN) -> Dict:
+    """
+    합성 데이터셋 생성
+
+    Args:
+        num_parcels: 필지 수
+        output_dir: 출력 디렉토리
+        seed: 난수 시드 (같은 시드 → 같은 데이터)
+        cell_size: 필지 격자 크기 (m)
+        multipart_ratio: 다중 파트 필지 비율
+        hole_ratio: 구멍 있는 필지 비율
+        list_ratio: 필지 목록(green/blue/red)에 넣을 필지 비율
+        bjd_code: PNU 앞 10자리 법정동 코드 (본번이 MAX_BONBUN을 넘으면 다음 리 코드로 이어짐)
+        origin: 격자 원점 (EPSG:5186)
+
+    Returns:
+        생성 요약 (경로, 필지 수, 목록 크기 등)
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sgg_code = bjd_code[:5]
+    base = output_dir / f"LSMD_CONT_LDREG_{sgg_code}_SYNTH"
+    cols = max(1, math.ceil(math.sqrt(num_parcels)))
+    rows = math.ceil(num_parcels / cols)
+
+    # 인접 필지가 꼭짓점을 공유하도록 격자 꼭짓점을 한 번만 흔들어 둠
+    jitter = cell_size * 0.2
+
+    vertex_rows = {}
+
+    def vertex(c, r):
+        # 격자 행 단위로 꼭짓점 생성 (현재 행과 다음 행만 유지)
+        if r not in vertex_rows:
+            local = random.Random(seed * 1000003 + r)
+            row = []
+            for col in range(cols + 1):
+                dx = local.uniform(-jitter, jitter) if 0 < col < cols else 0.0
+                dy = local.uniform(-jitter, jitter) if 0 < r < rows else 0.0
+                row.append((origin[0] + col * cell_size + dx, origin[1] + r * cell_size + dy))
+            vertex_rows[r] = row
+            vertex_rows.pop(r - 2, None)
+        return vertex_rows[r][c]
+
+    shx_length = 100 + 8 * num_parcels
+    bbox = (origin[0], origin[1], origin[0] + cols * cell_size, origin[1] + rows * cell_size)
+
+    jibuns = []
+    multipart_count = 0
+    hole_count = 0
+    bonbun_next = 1
+    next_bubun: Dict[Tuple[bool, int], int] = {}
+    codes = [bjd_code]
+
+    with open(base.with_suffix('.shp'), 'wb') as f_shp, \
+            open(base.with_suffix('.shx'), 'wb') as f_shx, \
+            open(base.with_suffix('.dbf'), 'wb') as f_dbf:
+        # SHP 길이는 마지막에 채움
+        f_shp.write(_shape_header(100, bbox))
+        f_shx.write(_shape_header(shx_length, bbox))
+        f_dbf.write(_dbf_header(num_parcels))
+
+        offset = 50
+        for idx in range(num_parcels):
+            c, r = idx % cols, idx // cols
+            # 시계 방향 외곽 링 (좌하 → 좌상 → 우상 → 우하)
+            ll, ul, ur, lr = vertex(c, r), vertex(c, r + 1), vertex(c + 1, r + 1), vertex(c + 1, r)
+
+            kind = rng.random()
+            if kind < multipart_ratio:
+                # 가운데 도로로 나뉜 두 파트
+                multipart_count += 1
+                left = [ll, ul, _lerp(ul, ur, 0.45), _lerp(ll, lr, 0.45), ll]
+                right = [_lerp(ll, lr, 0.55), _lerp(ul, ur, 0.55), ur, lr, _lerp(ll, lr, 0.55)]
+                rings = [left, right]
+            elif kind < multipart_ratio + hole_ratio:
+                # 가운데 구멍 (반시계 방향 내부 링)
+                hole_count += 1
+                cx = (ll[0] + ur[0]) / 2
+                cy = (ll[1] + ur[1]) / 2
+                h = cell_size * 0.15
+                hole = [(cx - h, cy - h), (cx + h, cy - h), (cx + h, cy + h), (cx - h, cy + h), (cx - h, cy - h)]
+                rings = [[ll, ul, ur, lr, ll], hole]
+            else:
+                rings = [[ll, ul, ur, lr, ll]]
+
+            content = _polygon_content(rings)
+            length_words = len(content) // 2
+            f_shp.write(struct.pack('>2i', idx + 1, length_words))
+            f_shp.write(content)
+            f_shx.write(struct.pack('>2i', offset, length_words))
+            offset += 4 + length_words
+
+            # 지번: 대부분 본번만, 일부 부번, 5%는 산 지번
+            # (산 여부, 본번)마다 다음 부번을 세어 같은 지번/PNU가 두 번 나오지 않도록 함
+            mountain = rng.random() < 0.05
+            if rng.random() < 0.3 and bonbun_next > 1:
+                bonbun = bonbun_next - 1
+            else:
+                bonbun = bonbun_next
+                bonbun_next += 1
+            # 본번 4자리를 넘으면 다음 법정동(리)으로 넘어가고 본번은 1부터 (부번은 이어서)
+            if bonbun > MAX_BONBUN:
+                block = (bonbun - 1) // MAX_BONBUN
+                while len(codes) <= block:
+                    codes.append(next_bjd_code(codes[-1]))
+                bonbun = (bonbun - 1) % MAX_BONBUN + 1
+            else:
+                block = 0
+            bubun = next_bubun.get((mountain, bonbun), 0)
+            next_bubun[(mountain, bonbun)] = bubun + 1
+
+            land_use = '임' if mountain else rng.choice(LAND_USE)
+            number = f"{bonbun}-{bubun}" if bubun else f"{bonbun}"
+            jibun = f"{'산' if mountain else ''}{number}{land_use}"
+            jibuns.append((f"{'산' if mountain else ''}{number}", jibun))
+
+            area = sum(_ring_area(ring) for ring in rings)
+            f_dbf.write(_dbf_record({
+                'PNU': f"{codes[block]}{2 if mountain else 1}{bonbun:04d}{bubun:04d}",
+                'JIBUN': jibun,
+                'BCHK': '1',
+                'SGG_OID': str(idx + 1),
+                'COL_ADM_SE': sgg_code,
+                'JIBUN_AREA': f"{area:.9f}",
+            }))
+
+        f_dbf.write(b'\x1a')
+
+        shp_length = f_shp.tell()
+        f_shp.seek(0)
+        f_shp.write(_shape_header(shp_length, bbox))
+
+    base.with_suffix('.prj').write_text(PRJ_5186, encoding='ascii')
+    base.with_suffix('.cpg').write_text('CP949', encoding='ascii')
+
+    # 카테고리별 필지 목록 (지목 접미사 제거된 지번, 중복 없이)
+    unique = list(dict.fromkeys(clean for clean, _ in jibuns))
+    sample_size = max(1, int(len(unique) * list_ratio))
+    sample = rng.sample(unique, min(sample_size, len(unique)))
+    split = [sample[:len(sample) // 3], sample[len(sample) // 3:2 * len(sample) // 3],
+             sample[2 * len(sample) // 3:]]
+
+    list_dir = output_dir / 'lists'
+    list_dir.mkdir(exist_ok=True)
+    parcel_lists = {}
+    for category, parcels in zip(('green', 'blue', 'red'), split):
+        path = list_dir / f"{category}_list.txt"
+        path.write_text('\n'.join(parcels) + '\n', encoding='utf-8')
+        parcel_lists[category] = str(path)
+
+    # 프로젝트 설정 파일 (여러 법정동에 걸치면 공통 접두사로 필터, 지번은 전체에서 겹치지 않음)
+    pnu_filter = os.path.commonprefix(codes)
+    name = f"synthetic_{num_parcels}"
+    config = {
+        'project': {
+            'name': name,
+            'display_name': f"합성 데이터 {num_parcels:,}필지",
+            'location': '합성 데이터셋',
+        },
+        'input': {
+            'source_shapefile': str(base.with_suffix('.shp')),
+            'pnu_filter': pnu_filter,
+            'parcel_lists': parcel_lists,
+        },
+        'output': {
+            'directory': str(output_dir / 'output'),
+            'formats': ['shapefile', 'csv', 'webmap'],
+        },
+        'style': {
+            'categories': {
+                'green': {'color': '#90EE90', 'label': '녹색', 'opacity': 0.6},
+                'blue': {'color': '#87CEEB', 'label': '파란색', 'opacity': 0.6},
+                'red': {'color': '#FFB6C1', 'label': '빨간색', 'opacity': 0.6},
+            }
+        },
+        'processing': {
+            'clean_jibun': True,
+            'convert_to_pyeong': True,
+        },
+    }
+    config_path = output_dir / 'config.yaml'
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.dump(config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+
+    return {
+        'shapefile': base.with_suffix('.shp'),
+        'config': config_path,
+        'parcels': num_parcels,
+        'multipart': multipart_count,
+        'holes': hole_count,
+        'listed': len(sample),
+        'bjd_codes': codes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 연속지적도 데이터셋 생성')
+    parser.add_argument('--parcels', '-n', type=int, default=10000, help='필지 수 (기본값: 10000)')
+    parser.add_argument('--output', '-o', required=True, help='출력 디렉토리')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드 (기본값: 42)')
+    parser.add_argument('--list-ratio', type=float, default=0.01,
+                        help='필지 목록에 넣을 필지 비율 (기본값: 0.01)')
+    parser.add_argument('--bjd-code', default=DEFAULT_BJD_CODE,
+                        help=f'PNU 앞 10자리 법정동 코드 (기본값: {DEFAULT_BJD_CODE})')
+    args = parser.parse_args()
+
+    summary = generate_dataset(args.parcels, Path(args.output), seed=args.seed,
+                               list_ratio=args.list_ratio, bjd_code=args.bjd_code)
+
+    print(f"✅ 합성 shapefile: {summary['shapefile']}")
+    print(f"   필지: {summary['parcels']:,}개 (다중 파트 {summary['multipart']:,}, 구멍 {summary['holes']:,})")
+    print(f"   필지 목록: {summary['listed']:,}개")
+    print(f"   법정동 코드: {summary['bjd_codes'][0]}" +
+          (f" ~ {summary['bjd_codes'][-1]} ({len(summary['bjd_codes'])}개)" if len(summary['bjd_codes']) > 1 else ''))
+    print(f"   설정 파일: {summary['config']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,22 @@
 
 CSV 구조:
 - 인코딩: EUC-KR
-- 헤더 라인: 16
+- 헤더 라인: 16 (안내 문구 줄 수가 달라도 trade_csv.py가 헤더 행을 찾음)
 - 주요 필드: 시군구, 단지명, 전용면적(㎡), 계약년월, 거래금액(만원), 층, 도로명
 """
-import csv
 import json
+import sys
 from collections import defaultdict
 from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from apt_name_index import AptNameIndex
+from trade_csv import iter_batches
+
+# 단지명 색인에서 뽑을 후보 수 (후보만 SequenceMatcher로 비교)
+CANDIDATES = 10
 
 def clean_apartment_name(name):
     """아파트 이름 정규화 (매칭 정확도 향상)"""
@@ -46,34 +55,34 @@ def format_price_korean(price_10k):
     else:
         return f"{man:,}만원"
 
-def read_transaction_csv(csv_path):
-    """실거래가 CSV 읽기"""
-    transactions = []
+def read_transaction_csv(csv_path, districts=None):
+    """
+    실거래가 CSV 읽기 (헤더 위치 자동 탐색, 블록 단위 파싱 - trade_csv.py)
 
-    with open(csv_path, 'r', encoding='euc-kr') as f:
-        # 헤더까지 스킵 (15줄)
-        for _ in range(15):
-            f.readline()
-
-        # CSV 파싱
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            transaction = {
-                'district': row.get('시군구', ''),
-                'complex_name': row.get('단지명', ''),
-                'area_sqm': float(row.get('전용면적(㎡)', '0') or '0'),
-                'contract_ym': row.get('계약년월', ''),
-                'contract_day': row.get('계약일', '').strip(),
-                'price_10k': parse_price(row.get('거래금액(만원)', '')),
-                'floor': row.get('층', ''),
-                'build_year': row.get('건축년도', ''),
-                'road_name': row.get('도로명', '')
-            }
+    Args:
+        csv_path: 실거래가 공개시스템 CSV 내보내기
+        districts: 시군구 조건 (예: ['서초구'], None이면 전체)
+    """
+    transactions = []
+    columns = ['시군구', '단지명', '전용면적(㎡)', '계약년월', '계약일', '거래금액(만원)', '층', '건축년도', '도로명']
 
+    for batch in iter_batches(csv_path, districts=districts, columns=columns):
+        for district, complex_name, area_sqm, contract_ym, contract_day, price_10k, floor, build_year, road_name in zip(
+                *(batch[column] for column in columns)):
             # 유효한 거래만 추가
-            if transaction['price_10k'] is not None:
-                transactions.append(transaction)
+            if price_10k is None:
+                continue
+            transactions.append({
+                'district': district,
+                'complex_name': complex_name,
+                'area_sqm': area_sqm or 0.0,
+                'contract_ym': str(contract_ym or ''),
+                'contract_day': f"{contract_day:02d}" if contract_day else '',
+                'price_10k': price_10k,
+                'floor': '' if floor is None else str(floor),
+                'build_year': '' if build_year is None else str(build_year),
+                'road_name': road_name
+            })
 
     print(f"✅ 총 {len(transactions):,}개 거래 데이터 읽기 완료")
     return transactions
@@ -99,6 +108,8 @@ def match_apartments_with_transactions(apartment_geojson_path, transactions):
 
     # 거래 데이터를 단지명별로 그룹화
     trans_by_complex = group_transactions_by_complex(transactions)
+    name_index = AptNameIndex((name, '', None) for name in trans_by_complex)
+    complex_order = {name: i for i, name in enumerate(trans_by_complex)}
 
     print(f"\n📊 매칭 시작...")
     print(f"   아파트: {len(geojson['features'])}개")
@@ -118,7 +129,10 @@ def match_apartments_with_transactions(apartment_geojson_path, transactions):
         best_match = None
         best_score = 0.0
 
-        for complex_name, trans_list in trans_by_complex.items():
+        # 이름이 비슷한 후보만 비교 (전체 단지와 쌍마다 비교하지 않음, 동점은 기존처럼 먼저 나온 단지)
+        candidates = [name for name, _ in name_index.query(apt_name, k=CANDIDATES)]
+        for complex_name in sorted(candidates, key=complex_order.get):
+            trans_list = trans_by_complex[complex_name]
             complex_name_clean = clean_apartment_name(complex_name)
             score = fuzzy_match_score(apt_name_clean, complex_name_clean)
 
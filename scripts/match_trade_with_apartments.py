@@ -4,20 +4,55 @@
 아파트 실거래가 데이터와 아파트 위치 데이터를 매칭하여 GeoJSON 생성
 """
 
+import argparse
 import json
-import zipfile
-import struct
-from collections import defaultdict
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from apt_master import AptMasterIndex
+from apt_name_index import AptNameIndex
+from molit_trade_api import month_range
+from trade_complex_join import ComplexIndex, join_trades, print_report
+from trade_stats import apartment_statistics, trade_frame
+from trade_store import DEFAULT_STORE_PATH, TradeStore
+
+# 단지명 유사도 매칭 최저 점수 (apt_name_index IDF 가중 Jaccard)
+NAME_MATCH_MIN_SCORE = 0.6
+
+# 아파트 마스터 (apt_mst_info SHP ZIP)
+APT_MASTER_ZIP = '/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_mst_info_202410_shp.zip'
+
+def load_trade_data(lawd_cd='11650', start='202408', end='202410', store_path=None):
+    """
+    실거래가 데이터 로드 (해제된 거래 제외)
+
+    거래 저장소(trade_store.py)가 있으면 지역/기간 범위만 질의하고,
+    없으면 월별 거래 파일을 읽습니다.
+
+    Args:
+        lawd_cd: 지역코드 (11650=서초구)
+        start, end: 계약년월 범위 YYYYMM (양끝 포함)
+        store_path: 거래 저장소 경로 (기본값: data/apt_trades.sqlite)
+    """
+    store_path = Path(store_path or DEFAULT_STORE_PATH)
+    if store_path.exists():
+        with TradeStore(store_path) as store:
+            all_trades = list(store.query([lawd_cd], start, end))
+        print(f"✅ 저장소: {lawd_cd} {start}~{end} {len(all_trades)}건 로드")
+        return all_trades
 
-def load_trade_data():
-    """실거래가 데이터 로드 (3개월치)"""
     all_trades = []
-
-    for month in ['202410', '202409', '202408']:
-        json_file = f'/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_trade_{month}.json'
+    for month in reversed(month_range(start, end)):
+        # molit_trade_api.py 수집 파일 (지역코드 포함) 우선, 없으면 예전 파일명
+        json_file = f'/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_trade_{lawd_cd}_{month}.json'
+        if not os.path.exists(json_file):
+            json_file = f'/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_trade_{month}.json'
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
-                trades = json.load(f)
+                trades = [t for t in json.load(f) if not str(t.get('해제사유발생일') or '').strip()]
                 all_trades.extend(trades)
                 print(f"✅ {month}: {len(trades)}건 로드")
         except Exception as e:
@@ -26,109 +61,29 @@ def load_trade_data():
     return all_trades
 
 def aggregate_trades_by_apartment(trades):
-    """아파트별로 거래 데이터 집계"""
-    apt_trades = defaultdict(list)
-
-    for trade in trades:
-        apt_name = trade.get('아파트', '').strip()
-        if apt_name:
-            # 거래금액을 숫자로 변환 (쉼표 제거 후 정수 변환)
-            price_str = trade.get('거래금액', '0').replace(',', '').strip()
-            try:
-                price = int(price_str)
-            except:
-                price = 0
-
-            area_raw = trade.get('전용면적', '')
-            try:
-                area_sqm = float(area_raw) if area_raw else None
-            except ValueError:
-                area_sqm = None
-
-            apt_trades[apt_name].append({
-                '거래금액': price,
-                '거래금액_원본': trade.get('거래금액', ''),
-                '거래일': f"{trade.get('년', '')}-{trade.get('월', '').zfill(2)}-{trade.get('일', '').zfill(2)}",
-                '전용면적': area_sqm,
-                '전용면적_원본': area_raw,
-                '층': trade.get('층', ''),
-                '법정동': trade.get('법정동', ''),
-                '지번': trade.get('지번', ''),
-                '건축년도': trade.get('건축년도', ''),
-            })
-
-    return apt_trades
+    """아파트별로 거래 데이터 집계 (단지명이 빈 거래는 제외한 컬럼 프레임)"""
+    return trade_frame(trades)
 
 
 def load_apartment_attributes():
-    """Shapefile DBF에서 단지 메타데이터 읽기 (세대수 등)"""
-    zip_path = '/mnt/c/Users/ksj27/PROJECTS/QGIS/data/apt_mst_info_202410_shp.zip'
+    """단지 마스터 색인에서 서초구 단지 메타데이터 읽기 (세대수 등)"""
     attributes = {}
 
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            dbf_bytes = zf.read('apt_mst_info_202410.dbf')
+        index = AptMasterIndex.load_or_build(APT_MASTER_ZIP)
     except Exception as e:
         print(f"⚠️  아파트 DBF 로드 실패: {e}")
         return attributes
 
-    header = struct.unpack('<BBBBIHH20x', dbf_bytes[:32])
-    num_records = header[4]
-    header_len = header[5]
-    record_len = header[6]
-
-    fields = []
-    pos = 32
-    while dbf_bytes[pos] != 0x0D:
-        name = dbf_bytes[pos:pos+11].rstrip(b'\x00').decode('ascii')
-        f_type = chr(dbf_bytes[pos+11])
-        length = dbf_bytes[pos+16]
-        fields.append((name, f_type, length))
-        pos += 32
-
-    name_to_idx = {name: idx for idx, (name, _, _) in enumerate(fields)}
-
-    def get_value(raw, f_type):
-        if f_type == 'C':
-            try:
-                return raw.decode('cp949').strip()
-            except UnicodeDecodeError:
-                return raw.decode('latin-1', errors='ignore').strip()
-        else:
-            text = raw.decode('ascii', errors='ignore').strip()
-            if not text:
-                return None
-            if text == '*********':
-                return None
-            try:
-                return float(text) if '.' in text else int(text)
-            except ValueError:
-                return None
-
-    for i in range(num_records):
-        rec = dbf_bytes[header_len + i * record_len: header_len + (i + 1) * record_len]
-        if rec[0:1] != b' ':
-            continue
-
-        values = []
-        offset = 1
-        for name, f_type, length in fields:
-            raw = rec[offset:offset+length]
-            offset += length
-            values.append(get_value(raw, f_type))
-
-        bjd_cd = values[name_to_idx.get('bjd_cd', -1)]
-        apt_name = values[name_to_idx.get('apt_nm', -1)]
-
+    # 서초구만 (bjd_cd 정렬 색인에서 해당 구간만 디코딩)
+    for _, record, _ in index.find('1165', fields=['apt_nm', 'bjd_cd', 'elcty_capa', 'dngct']):
+        bjd_cd = record['bjd_cd']
+        apt_name = record['apt_nm']
         if not apt_name or not bjd_cd:
             continue
 
-        # 서초구만 필터링
-        if not str(bjd_cd).startswith('1165'):
-            continue
-
-        household = values[name_to_idx.get('elcty_capa', -1)]
-        dong_count = values[name_to_idx.get('dngct', -1)]
+        household = record['elcty_capa']
+        dong_count = record['dngct']
 
         key = (apt_name, str(bjd_cd))
         attributes[key] = {
@@ -140,48 +95,97 @@ def load_apartment_attributes():
     return attributes
 
 def calculate_statistics(apt_trades):
-    """아파트별 거래 통계 계산"""
-    apt_stats = {}
+    """
+    아파트별 거래 통계 계산 (거래내역은 계약일 기준 최근 5건)
 
-    for apt_name, trades in apt_trades.items():
-        prices = [t['거래금액'] for t in trades if t['거래금액'] > 0]
+    Args:
+        apt_trades: aggregate_trades_by_apartment 결과
+    """
+    return apartment_statistics(apt_trades)
 
-        if not prices:
+def load_master_complexes(lawd_cd):
+    """단지 마스터 색인에서 지역 단지 레코드 (apt_nm, bjd_cd, lnmadr) - 읽을 수 없으면 None"""
+    try:
+        index = AptMasterIndex.load_or_build(APT_MASTER_ZIP)
+    except Exception as e:
+        print(f"⚠️  아파트 마스터 로드 실패: {e}")
+        return None
+    return [record for _, record, _ in index.find(lawd_cd, fields=['apt_nm', 'bjd_cd', 'lnmadr'])]
+
+
+def feature_lookup(features):
+    """
+    마스터 단지 레코드 → 피처 번호 찾기
+
+    피처에 bjd_cd가 있으면 (단지명, bjd_cd)로, 없으면 피처 중 하나뿐인 단지명으로 찾습니다.
+    """
+    by_key = {}
+    name_counts = {}
+    for i, feature in enumerate(features):
+        props = feature['properties']
+        apt_nm = props.get('apt_nm', '')
+        bjd_cd = str(props.get('bjd_cd') or '')
+        if bjd_cd:
+            by_key.setdefault((apt_nm, bjd_cd), i)
+        name_counts.setdefault(apt_nm, []).append(i)
+    by_name = {apt_nm: ids[0] for apt_nm, ids in name_counts.items() if len(ids) == 1}
+
+    def lookup(record):
+        key = (record.get('apt_nm', ''), str(record.get('bjd_cd') or ''))
+        if key in by_key:
+            return by_key[key]
+        return by_name.get(key[0])
+
+    return lookup
+
+
+def match_lots(features, trades, lawd_cd='11650'):
+    """
+    거래를 단지 필지 키(법정동코드, 본번, 부번)로 정확 매칭해 단지별 통계 계산
+
+    필지 키는 단지 마스터 레코드(bjd_cd, 지번주소 lnmadr)로 만들고, 매칭된 마스터 단지를
+    피처에 연결합니다. 마스터를 읽을 수 없으면 피처 속성으로 만듭니다.
+
+    Returns:
+        {피처 번호: 통계} - 필지가 일치한 거래가 있는 단지만
+    """
+    complexes = load_master_complexes(lawd_cd)
+    if complexes is None:
+        complexes = [feature['properties'] for feature in features]
+        positions = {id(props): i for i, props in enumerate(complexes)}
+        to_feature = lambda record: positions.get(id(record))
+    else:
+        to_feature = feature_lookup(features)
+
+    index = ComplexIndex(complexes)
+    matches, report = join_trades(trades, index)
+    print_report(report)
+
+    feature_ids = {}
+    matched = []
+    for trade, record in matches:
+        if record is None:
             continue
-
-        # 전용면적(㎡) 리스트
-        areas_sqm = [t.get('전용면적') for t in trades if isinstance(t.get('전용면적'), (int, float)) and t['전용면적'] > 0]
-
-        avg_area_sqm = sum(areas_sqm) / len(areas_sqm) if areas_sqm else None
-        avg_area_pyeong = (avg_area_sqm / 3.3058) if avg_area_sqm else None
-
-        # 건축년도(가장 빈도 높은 값 사용, 없으면 None)
-        build_years = []
-        for t in trades:
-            by = t.get('건축년도')
-            if by and by.isdigit():
-                build_years.append(int(by))
-
-        build_year = None
-        if build_years:
-            from collections import Counter
-            build_year = Counter(build_years).most_common(1)[0][0]
-
-        apt_stats[apt_name] = {
-            '거래건수': len(trades),
-            '최고가': max(prices),
-            '최저가': min(prices),
-            '평균가': int(sum(prices) / len(prices)),
-            '거래내역': trades[:5],  # 최근 5건만 저장
-            '건축년도': build_year,
-            '평균면적_㎡': avg_area_sqm,
-            '평균면적_평': avg_area_pyeong
-        }
-
-    return apt_stats
-
-def match_with_geojson(apt_stats):
-    """아파트 위치 데이터(GeoJSON)와 매칭"""
+        if id(record) not in feature_ids:
+            feature_ids[id(record)] = to_feature(record)
+        if feature_ids[id(record)] is not None:
+            matched.append((trade, feature_ids[id(record)]))
+    if not matched:
+        return {}
+    # 한 단지의 거래는 거래 단지명이 달라도 피처 번호로 묶어서 통계
+    lot_trades = [trade for trade, _ in matched]
+    frame = trade_frame(lot_trades, keys=[i for _, i in matched])
+    return apartment_statistics(frame)
+
+def match_with_geojson(apt_stats, lawd_cd='11650', trades=None):
+    """
+    아파트 위치 데이터(GeoJSON)와 매칭
+
+    trades가 있으면 먼저 필지 키로 정확 매칭합니다 (trade_complex_join.py).
+    필지가 일치하지 않은 단지는 단지명이 정확히 같으면 바로 매칭하고, 아니면 거래 단지명
+    n-gram 색인에서 가장 유사한 단지를 찾습니다. 거래 데이터의 지역(lawd_cd) 밖에 있는
+    단지(bjd_cd 앞 5자리가 다른 단지)는 유사 매칭하지 않습니다.
+    """
     geojson_file = '/mnt/c/Users/ksj27/PROJECTS/QGIS/output/webmap/apartments.geojson'
 
     with open(geojson_file, 'r', encoding='utf-8') as f:
@@ -190,29 +194,33 @@ def match_with_geojson(apt_stats):
     print(f"\n📍 기존 아파트 위치 데이터: {len(geojson_data['features'])}개")
 
     attribute_map = load_apartment_attributes()
+    lot_stats = match_lots(geojson_data['features'], trades, lawd_cd) if trades else {}
+    name_index = AptNameIndex((apt_nm, lawd_cd, None) for apt_nm in apt_stats)
 
     matched = 0
+    matched_by_lot = 0
     unmatched_apartments = []
 
-    for feature in geojson_data['features']:
+    for i, feature in enumerate(geojson_data['features']):
         apt_nm = feature['properties']['apt_nm']
         bjd_cd = str(feature['properties'].get('bjd_cd', ''))
 
-        # 아파트 이름으로 직접 매칭 시도
-        if apt_nm in apt_stats:
+        if i in lot_stats:
+            # 필지 키 정확 매칭
+            feature['properties']['거래통계'] = lot_stats[i]
+            matched += 1
+            matched_by_lot += 1
+        elif apt_nm in apt_stats:
+            # 아파트 이름으로 직접 매칭
             feature['properties']['거래통계'] = apt_stats[apt_nm]
             matched += 1
         else:
-            # 부분 매칭 시도 (예: "서초꽃마을1502" -> "서초꽃마을")
-            matched_any = False
-            for trade_apt_nm in apt_stats.keys():
-                if trade_apt_nm in apt_nm or apt_nm in trade_apt_nm:
-                    feature['properties']['거래통계'] = apt_stats[trade_apt_nm]
-                    matched += 1
-                    matched_any = True
-                    break
-
-            if not matched_any:
+            # 유사 이름 매칭 (예: "반포자이아파트" -> "반포자이", "신반포2차" -> "신반포2")
+            best = name_index.best(apt_nm, scope=bjd_cd[:5], min_score=NAME_MATCH_MIN_SCORE)
+            if best:
+                feature['properties']['거래통계'] = apt_stats[best[0]]
+                matched += 1
+            else:
                 unmatched_apartments.append(apt_nm)
 
         # 세대수 / 동수 보강
@@ -224,7 +232,7 @@ def match_with_geojson(apt_stats):
             if attr.get('dngct') is not None:
                 feature['properties']['dngct'] = attr['dngct']
 
-    print(f"✅ 매칭 성공: {matched}개")
+    print(f"✅ 매칭 성공: {matched}개 (필지 키 {matched_by_lot}개, 단지명 {matched - matched_by_lot}개)")
     print(f"❌ 매칭 실패: {len(unmatched_apartments)}개")
 
     if unmatched_apartments[:10]:
@@ -245,19 +253,26 @@ def save_result(geojson_data):
     return output_file
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='아파트 실거래가 데이터 매칭 및 GeoJSON 생성')
+    parser.add_argument('--region', default='11650', help='지역코드 (기본값: 11650 서초구)')
+    parser.add_argument('--start', default='202408', help='시작 계약년월 (기본값: 202408)')
+    parser.add_argument('--end', default='202410', help='끝 계약년월 (기본값: 202410)')
+    parser.add_argument('--store', help='거래 저장소 경로 (기본값: data/apt_trades.sqlite)')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("아파트 실거래가 데이터 매칭 및 GeoJSON 생성")
     print("=" * 70)
 
     # 1. 실거래가 데이터 로드
     print("\n[1/5] 실거래가 데이터 로드 중...")
-    trades = load_trade_data()
+    trades = load_trade_data(args.region, args.start, args.end, args.store)
     print(f"총 {len(trades)}건의 거래 데이터 로드 완료")
 
     # 2. 아파트별 집계
     print("\n[2/5] 아파트별 거래 집계 중...")
     apt_trades = aggregate_trades_by_apartment(trades)
-    print(f"총 {len(apt_trades)}개 아파트의 거래 데이터 집계 완료")
+    print(f"총 {apt_trades['단지'].nunique()}개 아파트의 거래 데이터 집계 완료")
 
     # 3. 통계 계산
     print("\n[3/5] 통계 계산 중...")
@@ -272,7 +287,7 @@ if __name__ == "__main__":
 
     # 4. GeoJSON과 매칭
     print("\n[4/5] 아파트 위치 데이터와 매칭 중...")
-    geojson_data = match_with_geojson(apt_stats)
+    geojson_data = match_with_geojson(apt_stats, args.region, trades)
 
     # 5. 결과 저장
     print("\n[5/5] 결과 저장 중...")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+실거래가 API 로컬 스텁 서버 (기록된 응답 재생)
+
+input/molit_stub/<LAWD_CD>_<DEAL_YMD>.xml에 기록해 둔 API 응답을 읽어
+pageNo/numOfRows에 맞게 잘라서 돌려줍니다. totalCount는 기록된 전체 건수를 유지하므로
+수집기의 페이지 처리, 동시 요청, 재시도를 인증키나 네트워크 없이 확인할 수 있습니다.
+
+- 기록이 없는 지역/월은 정상 코드에 0건으로 응답합니다 (실제 API와 동일).
+- serviceKey가 없으면 인증 오류(30)로 응답합니다.
+- --fail-rate로 일부 요청에 HTTP 503 또는 호출 한도 초과(22) 응답을 섞을 수 있습니다.
+
+사용법:
+    python scripts/molit_stub_server.py --port 8780 --fail-rate 0.2
+    python scripts/molit_trade_api.py --base-url http://127.0.0.1:8780/getRTMSDataSvcAptTradeDev \\
+        --region 11650 --start 202409 --end 202410 --rows 25
+
+    # 또는 수집기에서 바로 (임의 포트로 띄우고 끝나면 종료)
+    python scripts/molit_trade_api.py --stub --region 11650 --start 202409 --end 202410
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import INPUT_DIR
+
+FIXTURE_DIR = INPUT_DIR / 'molit_stub'
+ENDPOINT = '/getRTMSDataSvcAptTradeDev'
+
+ERROR_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>\
+<returnAuthMsg>{message}</returnAuthMsg><returnReasonCode>{code}</returnReasonCode>\
+</cmmMsgHeader></OpenAPI_ServiceResponse>'''
+
+
+class RecordedResponses:
+    """기록된 응답 (파일별 <item> 목록을 처음 요청 시 읽어 둠)"""
+
+    def __init__(self, fixture_dir: Path):
+        self.fixture_dir = Path(fixture_dir)
+        self._items: Dict[str, List[ET.Element]] = {}
+        self._lock = threading.Lock()
+
+    def items(self, lawd_cd: str, deal_ymd: str) -> List[ET.Element]:
+        key = f"{lawd_cd}_{deal_ymd}"
+        with self._lock:
+            if key not in self._items:
+                path = self.fixture_dir / f"{key}.xml"
+                self._items[key] = list(ET.parse(path).getroot().iter('item')) if path.exists() else []
+            return self._items[key]
+
+    def page(self, lawd_cd: str, deal_ymd: str, page_no: int, num_of_rows: int) -> bytes:
+        """요청 페이지 응답 XML"""
+        items = self.items(lawd_cd, deal_ymd)
+        start = (page_no - 1) * num_of_rows
+
+        response = ET.Element('response')
+        header = ET.SubElement(response, 'header')
+        ET.SubElement(header, 'resultCode').text = '000'
+        ET.SubElement(header, 'resultMsg').text = 'OK'
+        body = ET.SubElement(response, 'body')
+        items_el = ET.SubElement(body, 'items')
+        items_el.extend(items[start:start + num_of_rows])
+        ET.SubElement(body, 'numOfRows').text = str(num_of_rows)
+        ET.SubElement(body, 'pageNo').text = str(page_no)
+        ET.SubElement(body, 'totalCount').text = str(len(items))
+        return ET.tostring(response, encoding='utf-8', xml_declaration=True)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """GET <ENDPOINT>?serviceKey=...&LAWD_CD=...&DEAL_YMD=...&pageNo=...&numOfRows=..."""
+
+    recorded: RecordedResponses = None
+    fail_rate = 0.0
+    latency = 0.0
+    verbose = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not url.path.endswith(ENDPOINT):
+            self._send(404, b'Not Found', 'text/plain')
+            return
+        if self.fail_rate and random.random() < self.fail_rate:
+            if random.random() < 0.5:
+                self._send(503, b'Service Unavailable', 'text/plain')
+            else:
+                self._send_error('22', 'LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR')
+            return
+        if not params.get('serviceKey'):
+            self._send_error('30', 'SERVICE_KEY_IS_NOT_REGISTERED_ERROR')
+            return
+
+        try:
+            page_no = max(1, int(params.get('pageNo', 1)))
+            num_of_rows = max(1, int(params.get('numOfRows', 10)))
+        except ValueError:
+            self._send_error('10', 'INVALID_REQUEST_PARAMETER_ERROR')
+            return
+        body = self.recorded.page(params.get('LAWD_CD', ''), params.get('DEAL_YMD', ''),
+                                   page_no, num_of_rows)
+        self._send(200, body, 'application/xml; charset=utf-8')
+
+    def _send_error(self, code: str, message: str):
+        self._send(200, ERROR_TEMPLATE.format(code=code, message=message).encode('utf-8'),
+                   'application/xml; charset=utf-8')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+class StubServer:
+    """백그라운드 스레드에서 도는 스텁 서버"""
+
+    def __init__(self, server: ThreadingHTTPServer, thread: threading.Thread):
+        self.server = server
+        self.thread = thread
+        host, port = server.server_address[:2]
+        self.url = f"http://{host}:{port}{ENDPOINT}"
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def _make_handler(fixture_dir: Path, fail_rate: float, latency: float, verbose: bool):
+    return type('StubHandler', (StubHandler,), {
+        'recorded': RecordedResponses(fixture_dir),
+        'fail_rate': fail_rate,
+        'latency': latency,
+        'verbose': verbose,
+    })
+
+
+def start_stub_server(fixture_dir: Optional[Path] = None, host: str = '127.0.0.1', port: int = 0,
+                      fail_rate: float = 0.0, latency: float = 0.0) -> StubServer:
+    """스텁 서버를 백그라운드로 시작 (port=0이면 빈 포트)"""
+    handler = _make_handler(fixture_dir or FIXTURE_DIR, fail_rate, latency, False)
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return StubServer(server, thread)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실거래가 API 로컬 스텁 서버 (기록된 응답 재생)')
+    parser.add_argument('--fixtures', default=str(FIXTURE_DIR),
+                        help='기록된 응답 디렉토리 (기본값: input/molit_stub/)')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8780, help='포트 (기본값: 8780)')
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='일시 오류(503/호출 한도 초과)로 응답할 비율 (0~1)')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 초')
+    parser.add_argument('--verbose', '-v', action='store_true', help='요청 로그 출력')
+    args = parser.parse_args()
+
+    handler = _make_handler(Path(args.fixtures), args.fail_rate, args.latency, args.verbose)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    fixtures = sorted(p.stem for p in Path(args.fixtures).glob('*.xml'))
+    print(f"🚀 실거래가 스텁 서버: http://{args.host}:{args.port}{ENDPOINT}")
+    print(f"   기록된 응답 {len(fixtures)}개: {', '.join(fixtures)}")
+    print("   종료: Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
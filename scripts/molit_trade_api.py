@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+국토교통부 아파트 매매 실거래가 API 병렬 수집기
+
+지역(LAWD_CD) × 계약년월(DEAL_YMD) 작업을 asyncio로 동시에 처리합니다.
+
+- 첫 페이지의 totalCount를 보고 나머지 페이지를 모두 받으므로 거래가 많은 달도 잘리지 않습니다.
+- 동시 요청 수(--concurrency)와 초당 요청 수(--rate)를 제한해 API 호출 한도를 지킵니다.
+- 일시적인 오류(HTTP 429/5xx, 연결 오류, 호출 한도 초과 응답)는 지수 백오프로 재시도합니다.
+- 응답은 iterparse로 읽는 대로 타입이 지정된 거래 행으로 바꿔 월별 파일에 기록합니다
+  (trade_stream.py 참조, 페이지 크기와 상관없이 메모리 사용량 일정).
+- 받은 응답은 디스크 캐시(data/molit_cache)에 저장해 마감된 달은 다시 받지 않습니다
+  (trade_response_cache.py 참조, --offline이면 캐시만 사용).
+
+HTTP 요청은 표준 라이브러리 urllib을 작업 스레드에서 실행하므로 추가 패키지가 필요 없습니다.
+
+사용법:
+    # 서초구 2024-01 ~ 2024-10 수집 (월별 data/apt_trade_11650_YYYYMM.json)
+    python scripts/molit_trade_api.py --region 11650 --start 202401 --end 202410
+
+    # 여러 지역, 동시 요청/초당 요청 수 지정
+    python scripts/molit_trade_api.py -r 11650 -r 11680 --start 202301 --end 202410 --concurrency 8 --rate 20
+
+    # 수집하면서 로컬 저장소(data/apt_trades.sqlite)에 적재
+    python scripts/molit_trade_api.py --region 11650 --start 202301 --end 202410 --store
+
+    # 네트워크 없이 캐시된 응답만으로 다시 만들기
+    python scripts/molit_trade_api.py --region 11650 --start 202301 --end 202410 --offline
+
+    # 기록된 응답을 재생하는 로컬 스텁 서버로 확인 (input/molit_stub/)
+    python scripts/molit_trade_api.py --stub --region 11650 --start 202409 --end 202410 --rows 25
+
+인증키는 환경변수(.env) MOLIT_SERVICE_KEY(인코딩된 키)로 바꿀 수 있습니다.
+"""
+
+import argparse
+import asyncio
+import http.client
+import math
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DATA_DIR
+from fetch_apt_trade_api import BASE_URL, LAWD_CD_SEOCHO, SERVICE_KEY
+from trade_response_cache import DEFAULT_CACHE_DIR, RECENT_TTL, CacheMiss, ResponseCache
+from trade_store import DEFAULT_STORE_PATH, TradeStore
+from trade_stream import ApiError, TradeFileWriter, TradeStreamParser, write_jsonl
+
+# API가 허용하는 페이지당 최대 결과 수
+DEFAULT_ROWS = 1000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 10.0
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 1.0
+DEFAULT_TIMEOUT = 30.0
+
+RETRYABLE_HTTP_STATUS = (429, 500, 502, 503, 504)
+
+
+def build_url(base_url: str, service_key: str, lawd_cd: str, deal_ymd: str,
+              page_no: int, num_of_rows: int) -> str:
+    """요청 URL (serviceKey는 이미 인코딩된 키를 그대로 붙임)"""
+    query = urllib.parse.urlencode({
+        'LAWD_CD': lawd_cd,
+        'DEAL_YMD': deal_ymd,
+        'pageNo': str(page_no),
+        'numOfRows': str(num_of_rows),
+    })
+    return f"{base_url}?serviceKey={service_key}&{query}"
+
+
+def month_range(start: str, end: str) -> List[str]:
+    """YYYYMM ~ YYYYMM (양끝 포함)"""
+    year, month = int(start[:4]), int(start[4:6])
+    end_key = int(end[:4]) * 12 + int(end[4:6])
+    months = []
+    while year * 12 + month <= end_key:
+        months.append(f"{year:04d}{month:02d}")
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return months
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (요청 시작 시각을 1/rate초 간격으로 배정)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class MolitTradeFetcher:
+    """지역 × 월 실거래가 병렬 수집기"""
+
+    def __init__(self, output_dir: Path = DATA_DIR, base_url: str = BASE_URL,
+                 service_key: str = SERVICE_KEY,
+                 concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 num_of_rows: int = DEFAULT_ROWS, max_retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, timeout: float = DEFAULT_TIMEOUT,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            output_dir: 월별 거래 파일 디렉토리
+            base_url: API 주소 (스텁 서버 확인 시 로컬 주소)
+            service_key: 인코딩된 인증키
+            concurrency: 동시 요청 수
+            rate: 초당 최대 요청 수 (0이면 제한 없음)
+            num_of_rows: 페이지당 결과 수
+            max_retries: 요청당 최대 재시도 횟수
+            backoff: 첫 재시도 대기 초 (재시도마다 두 배 + 무작위 지연)
+            timeout: 요청 타임아웃 초
+            cache: 응답 캐시 (None이면 캐시 안 함)
+        """
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url
+        self.service_key = service_key
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.num_of_rows = num_of_rows
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.stats = {'requests': 0, 'retries': 0, 'pages': 0, 'rows': 0, 'bytes': 0}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[RateLimiter] = None
+
+    def _ingest(self, response, part_path: Path) -> Tuple[int, int, int]:
+        """응답 스트림 → 페이지 임시 파일 (작업 스레드에서 실행) → (행 수, totalCount, 읽은 바이트)"""
+        with response:
+            parser = TradeStreamParser(response)
+            rows = write_jsonl(parser, part_path)
+        return rows, parser.total_count, parser.bytes_read
+
+    def _download(self, url: str, key: Dict, part_path: Path) -> Tuple[int, int, int]:
+        """HTTP GET 후 스트리밍 파싱 (작업 스레드에서 실행, 캐시가 있으면 읽는 대로 저장)"""
+        try:
+            response = urllib.request.urlopen(url, timeout=self.timeout)
+            if self.cache is not None:
+                response = self.cache.record(response, key)
+            return self._ingest(response, part_path)
+        except urllib.error.HTTPError as e:
+            raise ApiError(f"HTTP 오류 {e.code}", code=str(e.code),
+                           retryable=e.code in RETRYABLE_HTTP_STATUS)
+        except (OSError, http.client.HTTPException) as e:
+            # 연결 실패, 타임아웃, 전송 중 끊김
+            raise ApiError(f"연결 오류: {getattr(e, 'reason', e)}", retryable=True)
+
+    async def fetch_page(self, lawd_cd: str, deal_ymd: str, page_no: int,
+                         part_path: Path) -> Tuple[int, int]:
+        """
+        한 페이지를 part_path에 기록 (동시 요청/초당 요청 제한, 실패 시 백오프 재시도)
+
+        Returns:
+            (행 수, totalCount)
+        """
+        url = build_url(self.base_url, self.service_key, lawd_cd, deal_ymd, page_no, self.num_of_rows)
+        key = ResponseCache.key(self.base_url, lawd_cd, deal_ymd, page_no, self.num_of_rows)
+
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                try:
+                    cached = None
+                    if self.cache is not None:
+                        try:
+                            cached = self.cache.open(key)
+                        except CacheMiss as e:
+                            raise ApiError(str(e), code='offline')
+
+                    if cached is not None:
+                        rows, total, _ = await asyncio.to_thread(self._ingest, cached, part_path)
+                    else:
+                        await self._limiter.wait()
+                        self.stats['requests'] += 1
+                        rows, total, size = await asyncio.to_thread(self._download, url, key, part_path)
+                        self.stats['bytes'] += size
+                    self.stats['pages'] += 1
+                    self.stats['rows'] += rows
+                    return rows, total
+                except ApiError as e:
+                    if not e.retryable or attempt >= self.max_retries:
+                        raise ApiError(f"{lawd_cd} {deal_ymd} p{page_no}: {e}", code=e.code)
+                    error = e
+            # 세마포어를 놓고 대기해야 다른 작업이 진행됨
+            delay = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+            attempt += 1
+            self.stats['retries'] += 1
+            print(f"  ⚠ {lawd_cd} {deal_ymd} p{page_no}: {error} - {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def fetch_month(self, lawd_cd: str, deal_ymd: str) -> int:
+        """
+        한 지역 한 달 전체 (totalCount까지 모든 페이지)를 월별 파일로 기록
+
+        페이지는 동시에 받아 페이지별 임시 파일에 기록한 뒤 페이지 순서대로 이어 붙입니다.
+
+        Returns:
+            기록한 거래 수
+        """
+        path = trade_file(self.output_dir, lawd_cd, deal_ymd)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        def part(page: int) -> Path:
+            return path.with_name(f".{path.stem}.p{page}.jsonl")
+
+        parts = [part(1)]
+        try:
+            rows, total = await self.fetch_page(lawd_cd, deal_ymd, 1, parts[0])
+            pages = math.ceil(total / self.num_of_rows) if total else 1
+            if pages > 1:
+                parts += [part(page) for page in range(2, pages + 1)]
+                rest = await asyncio.gather(*(self.fetch_page(lawd_cd, deal_ymd, page, part(page))
+                                              for page in range(2, pages + 1)))
+                rows += sum(page_rows for page_rows, _ in rest)
+
+            if total and rows != total:
+                print(f"  ⚠ {lawd_cd} {deal_ymd}: totalCount {total}건 중 {rows}건 수신")
+            await asyncio.to_thread(merge_parts, path, parts)
+            return rows
+        finally:
+            for part_path in parts:
+                if part_path.exists():
+                    part_path.unlink()
+
+    async def fetch_all(self, jobs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[int]]:
+        """
+        (지역코드, 계약년월) 작업 전체 수집
+
+        Returns:
+            {(지역코드, 계약년월): 기록한 거래 수 (실패 시 None)}
+        """
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = RateLimiter(self.rate)
+        jobs = list(jobs)
+
+        async def run(job):
+            try:
+                return await self.fetch_month(*job)
+            except ApiError as e:
+                print(f"  ❌ {e}")
+                return None
+
+        results = await asyncio.gather(*(run(job) for job in jobs))
+        return dict(zip(jobs, results))
+
+    def run(self, jobs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[int]]:
+        """fetch_all 동기 실행"""
+        return asyncio.run(self.fetch_all(jobs))
+
+
+def merge_parts(path: Path, parts: List[Path]):
+    """페이지 임시 파일을 순서대로 이어 월별 JSON 배열 파일로 기록"""
+    with TradeFileWriter(path) as writer:
+        for part_path in parts:
+            writer.write_lines(part_path)
+
+
+def trade_file(output_dir: Path, lawd_cd: str, deal_ymd: str) -> Path:
+    """지역/월별 거래 JSON 경로"""
+    return Path(output_dir) / f"apt_trade_{lawd_cd}_{deal_ymd}.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='국토교통부 아파트 매매 실거래가 병렬 수집',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예시:
+  %(prog)s --region 11650 --start 202401 --end 202410
+  %(prog)s -r 11650 -r 11680 --start 202301 --end 202410 --concurrency 8 --rate 20
+  %(prog)s --stub --region 11650 --start 202409 --end 202410 --rows 25
+        '''
+    )
+    parser.add_argument('--region', '-r', action='append',
+                        help=f'지역코드 LAWD_CD (여러 번 지정 가능, 기본값: {LAWD_CD_SEOCHO})')
+    parser.add_argument('--start', required=True, help='시작 계약년월 (YYYYMM)')
+    parser.add_argument('--end', help='끝 계약년월 (YYYYMM, 기본값: 시작과 같음)')
+    parser.add_argument('--output', '-o', default=str(DATA_DIR), help='출력 디렉토리 (기본값: data/)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'동시 요청 수 (기본값: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f'초당 최대 요청 수 (기본값: {DEFAULT_RATE:g}, 0이면 제한 없음)')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS,
+                        help=f'페이지당 결과 수 (기본값: {DEFAULT_ROWS})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'요청당 최대 재시도 횟수 (기본값: {DEFAULT_RETRIES})')
+    parser.add_argument('--base-url', default=BASE_URL, help='API 주소')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR),
+                        help='응답 캐시 디렉토리 (기본값: data/molit_cache)')
+    parser.add_argument('--no-cache', action='store_true', help='응답 캐시 사용 안 함')
+    parser.add_argument('--offline', action='store_true',
+                        help='네트워크 없이 캐시된 응답만 사용 (만료된 항목 포함)')
+    parser.add_argument('--recent-ttl', type=float, default=RECENT_TTL / 3600,
+                        help=f'최근 두 달 응답 유효 시간 (시간, 기본값: {RECENT_TTL / 3600:g})')
+    parser.add_argument('--store', nargs='?', const=str(DEFAULT_STORE_PATH),
+                        help='수집한 월별 파일을 거래 저장소에 적재 (경로 생략 시 data/apt_trades.sqlite)')
+    parser.add_argument('--stub', action='store_true',
+                        help='기록된 응답(input/molit_stub/)을 재생하는 로컬 스텁 서버 사용')
+    args = parser.parse_args()
+
+    regions = args.region or [LAWD_CD_SEOCHO]
+    months = month_range(args.start, args.end or args.start)
+    if not months:
+        parser.error('--start가 --end보다 늦습니다')
+    if args.offline and args.no_cache:
+        parser.error('--offline은 캐시가 필요합니다 (--no-cache와 함께 쓸 수 없음)')
+
+    base_url = args.base_url
+    stub = None
+    if args.stub and not args.offline:
+        from molit_stub_server import start_stub_server
+        stub = start_stub_server()
+        base_url = stub.url
+
+    cache = None
+    if not args.no_cache:
+        # 스텁 응답이 실제 API 응답 캐시에 섞이지 않도록 별도 디렉토리
+        cache_dir = Path(args.cache_dir) / 'stub' if args.stub else Path(args.cache_dir)
+        cache = ResponseCache(cache_dir, offline=args.offline, recent_ttl=args.recent_ttl * 3600)
+
+    fetcher = MolitTradeFetcher(
+        output_dir=args.output,
+        base_url=base_url,
+        service_key=os.getenv('MOLIT_SERVICE_KEY', SERVICE_KEY),
+        concurrency=args.concurrency,
+        rate=args.rate,
+        num_of_rows=args.rows,
+        max_retries=args.retries,
+        cache=cache,
+    )
+
+    jobs = [(region, month) for region in regions for month in months]
+    print(f"📡 실거래가 수집: {len(regions)}개 지역 × {len(months)}개월 = {len(jobs)}개 작업")
+    print(f"   동시 요청 {fetcher.concurrency}, 초당 {args.rate:g}회, 페이지당 {args.rows}건")
+
+    start_time = time.time()
+    try:
+        results = fetcher.run(jobs)
+    finally:
+        if stub:
+            stub.shutdown()
+    elapsed = time.time() - start_time
+
+    failed = 0
+    for (region, month), rows in results.items():
+        if rows is None:
+            failed += 1
+            continue
+        print(f"  ✓ {region} {month}: {rows}건 → {trade_file(args.output, region, month).name}")
+
+    stats = fetcher.stats
+    print(f"\n✅ 완료: {len(jobs) - failed}/{len(jobs)}개 작업, {stats['rows']:,}건, "
+          f"{stats['pages']}페이지 ({elapsed:.1f}초)")
+    print(f"   요청 {stats['requests']}회 (재시도 {stats['retries']}회), "
+          f"{stats['bytes'] / 1024:.0f}KB 수신")
+    if cache is not None:
+        print(f"   {cache.report()}")
+        cache.flush_stats()
+
+    if args.store:
+        with TradeStore(args.store) as store:
+            inserted = cancelled = 0
+            for (region, month), rows in results.items():
+                if rows is not None:
+                    counts = store.ingest_file(trade_file(args.output, region, month))
+                    inserted += counts['inserted']
+                    cancelled += counts['cancelled']
+        print(f"💾 저장소 적재: 신규 {inserted:,}건, 해제 반영 {cancelled}건 → {args.store}")
+
+    if failed:
+        print(f"❌ 실패 {failed}개 작업")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
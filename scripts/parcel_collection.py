@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계 간 공유되는 메모리 내 필지 컬렉션
+
+1단계가 원본에서 읽은 DBF 레코드와 SHP 지오메트리 바이트를 한 번만 보관하고,
+2단계(면적 계산)와 3단계(웹맵 생성)는 방금 쓴 출력 shapefile을 다시 읽지 않고
+이 컬렉션에서 바로 면적/좌표를 얻습니다. 디스크 출력물은 결과물(sink)일 뿐
+다음 단계의 입력이 아닙니다.
+"""
+
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 폴리곤 계열 shape type (Z/M 변형도 XY 배치는 동일)
+POLYGON_TYPES = (5, 15, 25)
+
+Ring = List[Tuple[float, float]]
+
+
+def parse_polygon_rings(content: bytes) -> List[Ring]:
+    """
+    SHP 레코드 콘텐츠에서 링 목록 추출
+
+    Args:
+        content: 레코드 헤더(8바이트)를 제외한 콘텐츠 바이트
+
+    Returns:
+        링 목록 (각 링은 (x, y) 목록). 폴리곤이 아니면 빈 목록
+    """
+    if len(content) < 44:
+        return []
+
+    shape_type = struct.unpack_from('<i', content, 0)[0]
+    if shape_type not in POLYGON_TYPES:
+        return []
+
+    # Bounding box(32 bytes) 다음 파트 수, 점 수
+    num_parts, num_points = struct.unpack_from('<ii', content, 36)
+    parts = list(struct.unpack_from(f'<{num_parts}i', content, 44)) + [num_points]
+    coords = struct.unpack_from(f'<{num_points * 2}d', content, 44 + num_parts * 4)
+
+    rings = []
+    for start, end in zip(parts, parts[1:]):
+        rings.append([(coords[2 * i], coords[2 * i + 1]) for i in range(start, end)])
+    return rings
+
+
+def ring_signed_area(ring: Ring) -> float:
+    """링 부호 면적 (shapefile 규칙: 시계 방향 외곽 링이면 양수, 구멍이면 음수)"""
+    total = 0.0
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        total += x1 * y2 - x2 * y1
+    return -total / 2
+
+
+def group_polygons(rings: List[Ring]) -> List[List[Ring]]:
+    """
+    링을 폴리곤 단위로 묶기 (외곽 링 + 뒤따르는 구멍 링)
+
+    shapefile은 외곽 링을 시계 방향, 구멍을 반시계 방향으로 저장합니다.
+    """
+    polygons = []
+    for ring in rings:
+        if ring_signed_area(ring) >= 0 or not polygons:
+            polygons.append([ring])
+        else:
+            polygons[-1].append(ring)
+    return polygons
+
+
+class ParcelCollection:
+    """필지 레코드 + 지오메트리 바이트 (레코드 순서 정렬)"""
+
+    def __init__(self, records: List[Dict], geometries: List[Tuple[bytes, bytes]],
+                 source_indices: Optional[List[int]] = None,
+                 shapefile_path: Optional[Path] = None):
+        """
+        Args:
+            records: DBF 레코드 목록 (CATEGORY 포함)
+            geometries: records와 같은 순서의 (레코드 헤더, 콘텐츠) 바이트 목록
+            source_indices: 원본 shapefile 레코드 번호 (0부터)
+            shapefile_path: 출력 shapefile 경로 (쓰지 않았으면 None)
+        """
+        if len(records) != len(geometries):
+            raise ValueError(f"레코드 수({len(records)})와 지오메트리 수({len(geometries)})가 다릅니다")
+        self.records = records
+        self.geometries = geometries
+        self.source_indices = source_indices or list(range(len(records)))
+        self.shapefile_path = shapefile_path
+        self._rings: Dict[int, List[Ring]] = {}
+
+    @classmethod
+    def from_indexed(cls, records: List[Dict], geometries: Dict[int, tuple],
+                     indices: List[int]) -> 'ParcelCollection':
+        """원본 레코드 번호로 색인된 지오메트리 딕셔너리에서 생성"""
+        return cls(records, [geometries[idx] for idx in indices], list(indices))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Tuple[int, Dict]]:
+        return iter(enumerate(self.records))
+
+    def rings(self, i: int) -> List[Ring]:
+        """i번째 필지의 링 목록 (파싱 결과 캐시)"""
+        if i not in self._rings:
+            self._rings[i] = parse_polygon_rings(self.geometries[i][1])
+        return self._rings[i]
+
+    def polygons(self, i: int) -> List[List[Ring]]:
+        """i번째 필지의 폴리곤 목록 (외곽 링 + 구멍)"""
+        return group_polygons(self.rings(i))
+
+    def area(self, i: int) -> float:
+        """i번째 필지 면적 (㎡, 구멍 제외)"""
+        return abs(sum(ring_signed_area(ring) for ring in self.rings(i)))
+
+    def bbox(self, i: int) -> Optional[Tuple[float, float, float, float]]:
+        """i번째 필지 경계 (레코드 콘텐츠의 bbox 필드)"""
+        content = self.geometries[i][1]
+        if len(content) < 36 or struct.unpack_from('<i', content, 0)[0] not in POLYGON_TYPES:
+            return None
+        return struct.unpack_from('<4d', content, 4)
+
+    def geojson_geometry(self, i: int, transformer=None) -> Optional[Dict]:
+        """
+        i번째 필지의 GeoJSON geometry
+
+        외곽 링이 하나면 Polygon(구멍 포함), 여러 개면 MultiPolygon.
+        transformer(pyproj Transformer)가 주어지면 링 단위로 한 번에 좌표 변환
+
+        Returns:
+            GeoJSON geometry (폴리곤이 아니면 None)
+        """
+        polygons = self.polygons(i)
+        if not polygons:
+            return None
+
+        converted = []
+        for polygon in polygons:
+            rings = []
+            for ring in polygon:
+                if transformer is None:
+                    rings.append([[x, y] for x, y in ring])
+                else:
+                    lons, lats = transformer.transform([pt[0] for pt in ring], [pt[1] for pt in ring])
+                    rings.append([[lon, lat] for lon, lat in zip(lons, lats)])
+            converted.append(rings)
+
+        if len(converted) == 1:
+            return {'type': 'Polygon', 'coordinates': converted[0]}
+        return {'type': 'MultiPolygon', 'coordinates': converted}
+
+    def num_points(self, i: int) -> int:
+        """i번째 필지의 꼭짓점 수"""
+        content = self.geometries[i][1]
+        if len(content) < 44:
+            return 0
+        return struct.unpack_from('<i', content, 40)[0]
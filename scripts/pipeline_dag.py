@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계 의존성 그래프 (DAG) 실행기
+
+각 단계를 이름과 의존 단계로 선언하면, 의존성이 모두 충족된 단계들을
+스레드 풀에서 동시에 실행합니다.
+
+- 단계별 실패는 해당 단계와 그 하위 단계에만 전파됩니다.
+  (독립적인 단계는 계속 실행)
+- 실행 후 단계별 소요 시간과 임계 경로(critical path) 시간을 보고합니다.
+
+사용 예:
+    dag = PipelineDAG()
+    dag.add_step('extract', lambda deps: step1())
+    dag.add_step('areas', lambda deps: step2(*deps['extract']), depends_on=['extract'])
+    report = dag.run(max_workers=3)
+    report.print_summary()
+"""
+
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# 단계 상태
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+
+class PipelineStep:
+    """DAG의 단일 단계"""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any],
+                 depends_on: Iterable[str] = (), label: Optional[str] = None):
+        """
+        Args:
+            name: 단계 이름 (DAG 내에서 고유)
+            func: 실행 함수. 의존 단계 결과 딕셔너리 {단계명: 결과}를 인자로 받음
+            depends_on: 의존 단계 이름 목록
+            label: 출력용 표시 이름 (없으면 name 사용)
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.label = label or name
+
+
+class StepResult:
+    """단계 실행 결과"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = None
+        self.value = None
+        self.error = None
+        self.traceback = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self) -> float:
+        """단계 소요 시간 (초)"""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class DAGRunReport:
+    """DAG 실행 보고서 (단계별 결과 + 임계 경로)"""
+
+    def __init__(self, steps: Dict[str, PipelineStep], order: List[str],
+                 results: Dict[str, StepResult], wall_time: float):
+        self.steps = steps
+        self.order = order
+        self.results = results
+        self.wall_time = wall_time
+        self.critical_path, self.critical_path_time = self._critical_path()
+
+    @property
+    def failed(self) -> List[StepResult]:
+        """실패한 단계 결과 목록"""
+        return [self.results[name] for name in self.order
+                if self.results[name].status == STATUS_FAILED]
+
+    @property
+    def ok(self) -> bool:
+        """모든 단계 성공 여부"""
+        return all(r.status == STATUS_OK for r in self.results.values())
+
+    def _critical_path(self):
+        """
+        실제 소요 시간 기준 가장 긴 의존 경로 계산
+
+        Returns:
+            (경로 단계 이름 목록, 경로 총 소요 시간)
+        """
+        best = {}
+        prev = {}
+        for name in self.order:
+            parent = None
+            parent_time = 0.0
+            for dep in self.steps[name].depends_on:
+                if best[dep] > parent_time or parent is None:
+                    parent, parent_time = dep, best[dep]
+            best[name] = parent_time + self.results[name].duration
+            prev[name] = parent
+
+        if not best:
+            return [], 0.0
+
+        end = max(best, key=best.get)
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = prev[node]
+        path.reverse()
+        return path, best[end]
+
+    def print_summary(self):
+        """단계별 실행 결과 출력"""
+        icons = {STATUS_OK: '✓', STATUS_FAILED: '❌', STATUS_SKIPPED: '⏭'}
+
+        print("\n단계별 실행 결과:")
+        for name in self.order:
+            result = self.results[name]
+            label = self.steps[name].label
+            line = f"  {icons.get(result.status, '?')} {label}: {result.duration:.2f}초"
+            if result.status == STATUS_FAILED:
+                line += f" - {type(result.error).__name__}: {result.error}"
+            elif result.status == STATUS_SKIPPED:
+                line += f" - 선행 단계 실패로 건너뜀 ({result.error})"
+            print(line)
+
+        path_labels = ' → '.join(self.steps[name].label for name in self.critical_path)
+        print(f"\n전체 소요 시간: {self.wall_time:.2f}초")
+        print(f"임계 경로: {path_labels} ({self.critical_path_time:.2f}초)")
+
+
+class PipelineDAG:
+    """의존성 그래프 기반 단계 스케줄러"""
+
+    def __init__(self):
+        self.steps: Dict[str, PipelineStep] = {}
+
+    def add_step(self, name: str, func: Callable[[Dict[str, Any]], Any],
+                 depends_on: Iterable[str] = (), label: Optional[str] = None) -> PipelineStep:
+        """단계 등록"""
+        if name in self.steps:
+            raise ValueError(f"중복된 단계 이름: {name}")
+        step = PipelineStep(name, func, depends_on, label)
+        self.steps[name] = step
+        return step
+
+    def topological_order(self) -> List[str]:
+        """
+        위상 정렬 (등록 순서를 최대한 유지)
+
+        Raises:
+            ValueError: 존재하지 않는 의존 단계 또는 순환 의존성이 있는 경우
+        """
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"'{step.name}' 단계의 의존 단계 '{dep}'가 없습니다")
+
+        order = []
+        done = set()
+        remaining = list(self.steps)
+        while remaining:
+            ready = [name for name in remaining
+                     if all(dep in done for dep in self.steps[name].depends_on)]
+            if not ready:
+                raise ValueError(f"순환 의존성이 있습니다: {', '.join(remaining)}")
+            for name in ready:
+                order.append(name)
+                done.add(name)
+                remaining.remove(name)
+        return order
+
+    def _execute(self, step: PipelineStep, inputs: Dict[str, Any],
+                 result: StepResult) -> StepResult:
+        """단계 하나 실행 (예외는 결과에 기록)"""
+        result.started = time.perf_counter()
+        try:
+            result.value = step.func(inputs)
+            result.status = STATUS_OK
+        except Exception as e:
+            result.status = STATUS_FAILED
+            result.error = e
+            result.traceback = traceback.format_exc()
+        result.finished = time.perf_counter()
+        return result
+
+    def run(self, max_workers: Optional[int] = None) -> DAGRunReport:
+        """
+        DAG 실행
+
+        Args:
+            max_workers: 동시 실행 단계 수 (1이면 순차 실행, None이면 단계 수)
+
+        Returns:
+            DAGRunReport
+        """
+        order = self.topological_order()
+        results = {name: StepResult(name) for name in order}
+        pending = list(order)
+        running = {}
+
+        workers = max_workers or max(1, len(order))
+        wall_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                # 선행 단계 실패 → 하위 단계 건너뛰기
+                for name in list(pending):
+                    deps = self.steps[name].depends_on
+                    bad = [d for d in deps
+                           if results[d].status in (STATUS_FAILED, STATUS_SKIPPED)]
+                    if bad:
+                        results[name].status = STATUS_SKIPPED
+                        results[name].error = ', '.join(bad)
+                        pending.remove(name)
+
+                # 의존성이 충족된 단계 제출
+                for name in list(pending):
+                    if len(running) >= workers:
+                        break
+                    step = self.steps[name]
+                    if all(results[d].status == STATUS_OK for d in step.depends_on):
+                        inputs = {d: results[d].value for d in step.depends_on}
+                        future = executor.submit(self._execute, step, inputs, results[name])
+                        running[future] = name
+                        pending.remove(name)
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+
+        wall_time = time.perf_counter() - wall_start
+        return DAGRunReport(self.steps, order, results, wall_time)
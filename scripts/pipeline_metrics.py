@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 실행 비용 측정
+
+단계마다 다음 값을 기록합니다:
+- wall_time: 경과 시간 (초)
+- cpu_time: 단계 스레드 CPU 시간 + 그동안 종료된 하위 프로세스 CPU 시간 (초)
+- records_scanned / records_per_sec: 스캔한 레코드 수와 초당 처리량
+- bytes_read: 읽은 바이트 수
+- vertices_transformed: 좌표 변환한 꼭짓점 수
+- rss_growth: 단계 동안 프로세스 최대 메모리(high-water mark)가 늘어난 양 (바이트).
+  앞 단계가 이미 더 많이 썼으면 0이고, 동시에 실행된 단계의 사용량도 포함될 수 있음
+- process_peak_rss: 단계 종료 시점까지의 프로세스 최대 메모리 (누적, 바이트)
+
+단계 코드는 현재 스레드의 단계에 카운터를 더하기만 하므로 (레코드 단위가 아닌
+단계 단위 집계) 측정 오버헤드는 무시할 수준입니다.
+
+사용 예:
+    metrics = PipelineMetrics('jubulli')
+    with metrics.measure('extract', '1단계 필지 추출'):
+        ...
+        metrics.count('records_scanned', len(records))
+    metrics.print_summary()
+    metrics.save('output/jubulli_metrics.json')
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+COUNTERS = ('records_scanned', 'bytes_read', 'vertices_transformed')
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """프로세스 최대 상주 메모리 (바이트, 측정 불가 시 None)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+        except (AttributeError, OSError):
+            pass
+
+    return None
+
+
+def _children_cpu() -> float:
+    """종료된 하위 프로세스의 누적 CPU 시간"""
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+class StepMetrics:
+    """단일 단계 측정값"""
+
+    def __init__(self, name: str, label: Optional[str] = None):
+        self.name = name
+        self.label = label or name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.rss_growth = None
+        self.process_peak_rss = None
+        self.counters = {key: 0 for key in COUNTERS}
+
+    @property
+    def records_per_sec(self) -> Optional[float]:
+        """초당 스캔 레코드 수"""
+        if not self.counters['records_scanned'] or not self.wall_time:
+            return None
+        return self.counters['records_scanned'] / self.wall_time
+
+    def to_dict(self) -> Dict:
+        """JSON 저장용 딕셔너리"""
+        data = {
+            'step': self.name,
+            'label': self.label,
+            'wall_time': round(self.wall_time, 4),
+            'cpu_time': round(self.cpu_time, 4),
+            'records_per_sec': round(self.records_per_sec, 1) if self.records_per_sec else None,
+            'rss_growth': self.rss_growth,
+            'process_peak_rss': self.process_peak_rss,
+        }
+        data.update(self.counters)
+        return data
+
+
+class PipelineMetrics:
+    """프로젝트 단위 단계별 측정 기록기 (스레드 안전)"""
+
+    def __init__(self, project_name: str):
+        self.project_name = project_name
+        self.steps: Dict[str, StepMetrics] = {}
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name: str, label: Optional[str] = None):
+        """블록 실행을 단계 name으로 측정 (현재 스레드의 활성 단계로 설정)"""
+        step = StepMetrics(name, label)
+        with self._lock:
+            self.steps[name] = step
+
+        previous = getattr(self._local, 'step', None)
+        self._local.step = step
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        children_start = _children_cpu()
+        peak_start = peak_rss_bytes()
+        try:
+            yield step
+        finally:
+            step.wall_time = time.perf_counter() - wall_start
+            step.cpu_time = (time.thread_time() - cpu_start) + (_children_cpu() - children_start)
+            step.process_peak_rss = peak_rss_bytes()
+            if peak_start is not None and step.process_peak_rss is not None:
+                step.rss_growth = step.process_peak_rss - peak_start
+            self._local.step = previous
+
+    def count(self, key: str, amount: int = 1):
+        """현재 스레드의 활성 단계 카운터 증가 (측정 중이 아니면 무시)"""
+        step = getattr(self._local, 'step', None)
+        if step is not None:
+            step.counters[key] = step.counters.get(key, 0) + amount
+
+    def to_dict(self) -> Dict:
+        """JSON 저장용 딕셔너리"""
+        return {
+            'project': self.project_name,
+            'started_at': self.started_at,
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'cpu_count': os.cpu_count(),
+            'steps': [step.to_dict() for step in self.steps.values()],
+        }
+
+    def save(self, path: Path) -> Path:
+        """측정 결과 JSON 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def print_summary(self):
+        """단계별 측정값 표 출력"""
+        def fmt_bytes(value):
+            if value is None:
+                return '-'
+            for unit in ('B', 'KB', 'MB', 'GB'):
+                if value < 1024 or unit == 'GB':
+                    return f"{value:,.0f}{unit}" if unit == 'B' else f"{value:,.1f}{unit}"
+                value /= 1024
+
+        print("\n단계별 실행 비용:")
+        print(f"  {'단계':<18} {'경과(초)':>9} {'CPU(초)':>9} {'레코드':>10} "
+              f"{'레코드/초':>12} {'읽은 크기':>10} {'변환 좌표':>10} {'RSS 증가':>10} {'누적 최대 RSS':>12}")
+        for step in self.steps.values():
+            rate = f"{step.records_per_sec:,.0f}" if step.records_per_sec else '-'
+            print(f"  {step.label:<18} {step.wall_time:>9.3f} {step.cpu_time:>9.3f} "
+                  f"{step.counters['records_scanned']:>10,} {rate:>12} "
+                  f"{fmt_bytes(step.counters['bytes_read']):>10} "
+                  f"{step.counters['vertices_transformed']:>10,} {fmt_bytes(step.rss_growth):>10} "
+                  f"{fmt_bytes(step.process_peak_rss):>12}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 심층 프로파일링 (cProfile + tracemalloc)
+
+`cadastral_auto.py --profile`로 활성화되며, 단계마다 다음 파일을 만듭니다:
+
+    <출력 디렉토리>/profile/<프로젝트>/
+    ├── <단계>.prof          # cProfile 원본 (snakeviz, pstats로 열기)
+    ├── <단계>_top.txt       # 누적 시간 상위 N개 함수
+    ├── <단계>_alloc.txt     # 단계 중 순증가 메모리 상위 N개 할당 위치 (tracemalloc)
+    └── <단계>.collapsed     # 접힌 스택 (flamegraph.pl, speedscope 등에서 사용)
+
+tracemalloc은 프로세스 전체 할당을 추적하므로, 프로파일링 중에는 단계를
+순차 실행해야 단계별 할당을 구분할 수 있습니다.
+
+QGIS 없이 동작합니다.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+# 접힌 스택 생성 시 탐색 제한 (호출 그래프가 넓은 경우 폭주 방지)
+MAX_STACK_DEPTH = 64
+MIN_PATH_SECONDS = 1e-5
+
+
+def _frame_label(func: tuple) -> str:
+    """pstats 함수 키 (파일, 줄, 이름)를 스택 프레임 이름으로 변환"""
+    filename, line, name = func
+    if filename == '~':
+        # 내장 함수 ("<built-in method ...>")
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    # 접힌 스택 형식의 구분자(;)와 줄바꿈 제거
+    return label.replace(';', ',').replace('\n', ' ')
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    cProfile 통계를 접힌 스택 {"a;b;c": 마이크로초}로 변환
+
+    cProfile은 호출자→피호출자 간선별 시간만 기록하므로, 각 함수의 자체 시간을
+    간선 누적 시간 비율로 호출 경로에 나누어 배분한 근사치입니다.
+    """
+    raw = stats.stats
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]  # 간선 누적 시간
+
+    roots = [func for func, value in raw.items() if not value[4]]
+    stacks = defaultdict(int)
+
+    def walk(func, path: List[str], on_path: set, share: float):
+        _, _, tottime, cumtime, _ = raw[func]
+        path = path + [_frame_label(func)]
+
+        self_us = int(tottime * share * 1e6)
+        if self_us > 0:
+            stacks[';'.join(path)] += self_us
+
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+
+        for callee, edge_time in callees[func].items():
+            if callee in on_path or callee not in raw:
+                continue  # 재귀 호출은 펼치지 않음
+            callee_cum = raw[callee][3]
+            if callee_cum <= 0:
+                continue
+            callee_share = min(1.0, share * edge_time / callee_cum)
+            if callee_cum * callee_share < MIN_PATH_SECONDS:
+                continue
+            walk(callee, path, on_path | {callee}, callee_share)
+
+    for root in roots:
+        walk(root, [], {root}, 1.0)
+
+    return dict(stacks)
+
+
+class StepProfiler:
+    """단계별 cProfile/tracemalloc 프로파일 기록기"""
+
+    def __init__(self, output_dir: Path, top_n: int = 25):
+        """
+        Args:
+            output_dir: 프로파일 출력 디렉토리 (프로젝트별)
+            top_n: 상위 함수/할당 위치 출력 개수
+        """
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.files: List[Path] = []
+
+    @contextmanager
+    def profile(self, name: str):
+        """블록 실행을 단계 name으로 프로파일링"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+            self._write_profile(name, profiler)
+            self._write_allocations(name, before, after, peak)
+
+    def _write_profile(self, name: str, profiler: cProfile.Profile):
+        """.prof, 상위 함수 목록, 접힌 스택 저장"""
+        prof_path = self.output_dir / f"{name}.prof"
+        profiler.dump_stats(str(prof_path))
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+        top_path = self.output_dir / f"{name}_top.txt"
+        top_path.write_text(buffer.getvalue(), encoding='utf-8')
+
+        collapsed_path = self.output_dir / f"{name}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, weight in sorted(collapsed_stacks(stats).items()):
+                f.write(f"{stack} {weight}\n")
+
+        self.files.extend([prof_path, top_path, collapsed_path])
+
+    def _write_allocations(self, name: str, before, after, peak: int):
+        """단계 중 순증가 메모리 상위 할당 위치 저장"""
+        alloc_path = self.output_dir / f"{name}_alloc.txt"
+        diffs = after.compare_to(before, 'lineno')
+
+        with open(alloc_path, 'w', encoding='utf-8') as f:
+            f.write(f"# {name}: tracemalloc 최대 추적 메모리 {peak / 1024 / 1024:,.1f}MB\n")
+            f.write(f"# 순증가 상위 {self.top_n}개 할당 위치\n\n")
+            for stat in diffs[:self.top_n]:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size_diff / 1024:>12,.1f}KB {stat.count_diff:>+10,}개  "
+                        f"{frame.filename}:{frame.lineno}\n")
+
+        self.files.append(alloc_path)
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+실거래가 가격 큐브 (단지 × 계약월 × 면적대)
+
+거래 저장소(trade_store.py)와 같은 SQLite 파일에 (지역코드, 계약년월, 단지명, 필지, 면적대)
+셀마다 거래 수, 금액 합계/최저/최고/중위와 평당가 합계/최저/최고를 미리 집계해 둡니다.
+웹맵과 보고서는 "최근 6개월, 84㎡(60~85㎡ 면적대)" 같은 질의를 거래를 다시 읽지 않고
+셀 범위 합산으로 답합니다.
+
+- 셀의 거래금액 목록(정렬된 만원 값)을 함께 저장하므로 여러 달을 합친 중위가도 정확합니다.
+- 저장소 파티션(지역 × 월)의 적재 시각이 큐브를 만든 시각보다 새로우면 그 파티션만 다시
+  집계합니다 (새 달 적재, 해제 반영). refresh()는 바뀐 파티션이 없으면 바로 끝납니다.
+- 필지는 "<10자리 법정동코드>-<본번>-<부번>" 문자열입니다 (trade_complex_join과 같은 키).
+  법정동 코드가 없는 예전 거래는 필지가 빈 문자열이고 단지명으로만 찾을 수 있습니다.
+- 해제된 거래와 거래금액/전용면적이 없는 거래는 집계하지 않습니다.
+
+사용법:
+    # 큐브 갱신 (바뀐 파티션만)
+    python scripts/price_cube.py refresh
+
+    # 서초구 최근 6개월, 84㎡ 면적대 단지별 중위가
+    python scripts/price_cube.py window --region 11650 --months 6 --area 84 --by apt
+
+    # 코드에서
+    with TradeStore() as store:
+        cube = PriceCube(store)
+        cube.refresh()
+        cells = cube.window('202405', '202410', lots=lots, by=('lot', 'band'))
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from trade_complex_join import parse_jibun
+from trade_stats import PYEONG_SQM
+from trade_store import DEFAULT_STORE_PATH, TradeStore
+
+# 면적대 (전용면적 상한 ㎡, 라벨) - 상한 포함 (84.99㎡는 60~85)
+AREA_BANDS = (
+    (60.0, '~60'),
+    (85.0, '60~85'),
+    (102.0, '85~102'),
+    (135.0, '102~135'),
+    (None, '135~'),
+)
+
+# 질의에서 묶을 수 있는 셀 차원
+GROUP_COLUMNS = ('lawd_cd', 'deal_ym', 'apt_nm', 'lot', 'band')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS price_cube (
+    lawd_cd TEXT NOT NULL,
+    deal_ym INTEGER NOT NULL,
+    apt_nm TEXT NOT NULL,
+    lot TEXT NOT NULL,
+    band TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    price_sum INTEGER NOT NULL,
+    price_min INTEGER NOT NULL,
+    price_max INTEGER NOT NULL,
+    price_median REAL NOT NULL,
+    prices TEXT NOT NULL,
+    area_sum REAL NOT NULL,
+    pyeong_sum REAL NOT NULL,
+    pyeong_min REAL NOT NULL,
+    pyeong_max REAL NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ym, apt_nm, lot, band)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS price_cube_lot ON price_cube (lot, deal_ym);
+
+CREATE TABLE IF NOT EXISTS price_cube_partitions (
+    lawd_cd TEXT NOT NULL,
+    deal_ym INTEGER NOT NULL,
+    cells INTEGER NOT NULL,
+    built_at REAL NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ym)
+) WITHOUT ROWID;
+'''
+
+
+def area_band(area) -> Optional[str]:
+    """전용면적(㎡) → 면적대 라벨 (면적이 없으면 None)"""
+    if not area or area <= 0:
+        return None
+    for upper, label in AREA_BANDS:
+        if upper is None or area <= upper:
+            return label
+    return None
+
+
+def lot_id(bjd_cd: str, bonbun: int, bubun: int) -> str:
+    """필지 키 → 큐브 필지 문자열"""
+    return f"{bjd_cd}-{bonbun}-{bubun}"
+
+
+def trade_lot_id(lawd_cd: str, umd_cd, bonbun, bubun, jibun) -> str:
+    """저장소 거래 행 → 큐브 필지 문자열 (법정동 코드나 지번이 없으면 빈 문자열)"""
+    umd_cd = str(umd_cd or '').strip()
+    if len(umd_cd) != 5:
+        return ''
+    bonbun = str(bonbun or '').strip()
+    if bonbun.isdigit():
+        bubun = str(bubun or '').strip()
+        lot = (int(bonbun), int(bubun) if bubun.isdigit() else 0)
+    else:
+        lot = parse_jibun(jibun)
+    return lot_id(lawd_cd + umd_cd, *lot) if lot else ''
+
+
+def months_back(ym: str, months: int) -> str:
+    """YYYYMM에서 months개월 전 (months_back('202410', 5) → '202405')"""
+    year, month = int(ym[:4]), int(ym[4:6])
+    index = year * 12 + month - 1 - months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def _median(values: Sequence[float]) -> float:
+    """정렬된 값의 중위수 (짝수 개면 가운데 두 값 평균)"""
+    middle = len(values) // 2
+    if len(values) % 2:
+        return float(values[middle])
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class PriceCube:
+    """거래 저장소 위의 단지 × 월 × 면적대 가격 큐브"""
+
+    def __init__(self, store: TradeStore):
+        self.store = store
+        self.conn = store.conn
+        self.conn.executescript(_SCHEMA)
+
+    def stale_partitions(self) -> List[Tuple[str, int]]:
+        """큐브를 만든 뒤 다시 적재된 (지역코드, 계약년월) 파티션"""
+        return self.conn.execute('''
+            SELECT p.lawd_cd, p.deal_ym FROM partitions p
+            LEFT JOIN price_cube_partitions c ON c.lawd_cd = p.lawd_cd AND c.deal_ym = p.deal_ym
+            WHERE c.built_at IS NULL OR c.built_at < p.ingested_at
+            ORDER BY p.lawd_cd, p.deal_ym
+        ''').fetchall()
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        바뀐 파티션의 셀 다시 집계 (한 트랜잭션)
+
+        Args:
+            force: 모든 파티션 다시 집계
+
+        Returns:
+            {'partitions': 집계한 파티션 수, 'cells': 쓴 셀 수}
+        """
+        if force:
+            partitions = self.conn.execute(
+                'SELECT lawd_cd, deal_ym FROM partitions ORDER BY lawd_cd, deal_ym').fetchall()
+        else:
+            partitions = self.stale_partitions()
+
+        counts = {'partitions': len(partitions), 'cells': 0}
+        with self.conn:
+            for lawd_cd, deal_ym in partitions:
+                cells = self._partition_cells(lawd_cd, deal_ym)
+                self.conn.execute('DELETE FROM price_cube WHERE lawd_cd = ? AND deal_ym = ?',
+                                  (lawd_cd, deal_ym))
+                self.conn.executemany(
+                    f"INSERT INTO price_cube VALUES ({', '.join('?' * 15)})", cells)
+                self.conn.execute('INSERT OR REPLACE INTO price_cube_partitions VALUES (?, ?, ?, ?)',
+                                  (lawd_cd, deal_ym, len(cells), time.time()))
+                counts['cells'] += len(cells)
+        return counts
+
+    def _partition_cells(self, lawd_cd: str, deal_ym: int) -> List[Tuple]:
+        """파티션 거래 → 셀 행"""
+        trades = defaultdict(list)
+        for apt_nm, umd_cd, bonbun, bubun, jibun, price, area in self.conn.execute('''
+                SELECT apt_nm, umd_cd, bonbun, bubun, jibun, deal_amount, area FROM trades
+                WHERE lawd_cd = ? AND deal_ym = ? AND cancel_date IS NULL
+                ''', (lawd_cd, deal_ym)):
+            band = area_band(area)
+            if not price or price <= 0 or band is None:
+                continue
+            lot = trade_lot_id(lawd_cd, umd_cd, bonbun, bubun, jibun)
+            trades[(apt_nm or '', lot, band)].append((price, area))
+
+        cells = []
+        for (apt_nm, lot, band), rows in trades.items():
+            prices = sorted(price for price, _ in rows)
+            per_pyeong = [price / (area / PYEONG_SQM) for price, area in rows]
+            cells.append((
+                lawd_cd, deal_ym, apt_nm, lot, band,
+                len(rows), sum(prices), prices[0], prices[-1], _median(prices),
+                ','.join(map(str, prices)),
+                sum(area for _, area in rows),
+                sum(per_pyeong), min(per_pyeong), max(per_pyeong),
+            ))
+        return cells
+
+    def latest_month(self, lawd_cds: Optional[Sequence[str]] = None) -> Optional[str]:
+        """큐브의 마지막 계약년월 (YYYYMM, 비었으면 None)"""
+        sql = 'SELECT MAX(deal_ym) FROM price_cube'
+        params: Tuple = ()
+        if lawd_cds:
+            sql += f" WHERE lawd_cd IN ({','.join('?' * len(lawd_cds))})"
+            params = tuple(str(code) for code in lawd_cds)
+        latest = self.conn.execute(sql, params).fetchone()[0]
+        return str(latest) if latest else None
+
+    def window(self, start: Optional[str] = None, end: Optional[str] = None,
+               lawd_cds: Optional[Sequence[str]] = None, lots: Optional[Iterable[str]] = None,
+               apt_names: Optional[Iterable[str]] = None, bands: Optional[Sequence[str]] = None,
+               by: Sequence[str] = ('lot', 'band')) -> Dict[Tuple, Dict]:
+        """
+        기간 범위 셀 합산
+
+        Args:
+            start, end: 계약년월 범위 YYYYMM (양끝 포함, None이면 제한 없음)
+            lawd_cds, lots, apt_names, bands: 지역코드 / 필지 / 단지명 / 면적대 조건
+            by: 묶을 차원 (GROUP_COLUMNS 중, 빈 튜플이면 전체 하나)
+
+        Returns:
+            {by 값 튜플: {'count', 'sum', 'min', 'max', 'median', 'avg', 'avg_area',
+                          'price_per_pyeong', 'pyeong_min', 'pyeong_max'}}
+            금액은 만원, 평당가는 만원/평 (거래별 평당가의 평균)
+        """
+        unknown = [column for column in by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"알 수 없는 차원: {unknown}")
+
+        where, params = [], []
+        if start:
+            where.append('c.deal_ym >= ?')
+            params.append(int(start))
+        if end:
+            where.append('c.deal_ym <= ?')
+            params.append(int(end))
+        for column, values in (('lawd_cd', lawd_cds), ('band', bands)):
+            if values:
+                where.append(f"c.{column} IN ({','.join('?' * len(values))})")
+                params.extend(str(value) for value in values)
+
+        # 필지/단지명 목록은 길 수 있어 임시 테이블과 조인
+        joins = []
+        for column, values in (('lot', lots), ('apt_nm', apt_names)):
+            if values is None:
+                continue
+            table = f"price_cube_filter_{column}"
+            self.conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} (value TEXT PRIMARY KEY)")
+            self.conn.execute(f"DELETE FROM {table}")
+            self.conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?)",
+                                  ((value,) for value in values))
+            joins.append(f"JOIN {table} ON {table}.value = c.{column}")
+
+        group = ', '.join(f"c.{column}" for column in by)
+        sql = f'''
+            SELECT {group + ', ' if group else ''}SUM(count), SUM(price_sum), MIN(price_min), MAX(price_max),
+                   GROUP_CONCAT(prices), SUM(area_sum), SUM(pyeong_sum), MIN(pyeong_min), MAX(pyeong_max)
+            FROM price_cube c {' '.join(joins)}
+        '''
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        if group:
+            sql += f' GROUP BY {group}'
+
+        result = {}
+        for row in self.conn.execute(sql, params):
+            key = tuple(row[:len(by)])
+            count, total, low, high, prices, area_sum, pyeong_sum, pyeong_min, pyeong_max = row[len(by):]
+            if not count:
+                continue
+            result[key] = {
+                'count': count,
+                'sum': total,
+                'min': low,
+                'max': high,
+                'median': _median(sorted(int(value) for value in prices.split(','))),
+                'avg': total / count,
+                'avg_area': area_sum / count,
+                'price_per_pyeong': pyeong_sum / count,
+                'pyeong_min': pyeong_min,
+                'pyeong_max': pyeong_max,
+            }
+        return result
+
+
+def band_for(area: Optional[float], band: Optional[str]) -> Optional[str]:
+    """CLI --area/--band → 면적대 라벨"""
+    if band:
+        labels = [label for _, label in AREA_BANDS]
+        if band not in labels:
+            raise ValueError(f"면적대는 {', '.join(labels)} 중 하나")
+        return band
+    return area_band(area) if area else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='실거래가 가격 큐브 (단지 × 계약월 × 면적대)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예시:
+  %(prog)s refresh
+  %(prog)s window --region 11650 --months 6 --area 84 --by apt
+  %(prog)s window --region 11650 --start 202301 --end 202312 --by band
+        '''
+    )
+    parser.add_argument('--db', default=str(DEFAULT_STORE_PATH),
+                        help='거래 저장소 경로 (기본값: data/apt_trades.sqlite)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    refresh_parser = sub.add_parser('refresh', help='바뀐 파티션 다시 집계')
+    refresh_parser.add_argument('--force', action='store_true', help='모든 파티션 다시 집계')
+
+    window_parser = sub.add_parser('window', help='기간 범위 셀 합산')
+    window_parser.add_argument('--region', '-r', action='append', help='지역코드 (여러 번 지정 가능)')
+    window_parser.add_argument('--start', help='시작 계약년월 (YYYYMM)')
+    window_parser.add_argument('--end', help='끝 계약년월 (YYYYMM, 기본값: 큐브의 마지막 달)')
+    window_parser.add_argument('--months', type=int, help='끝 달까지 최근 N개월 (--start 대신)')
+    window_parser.add_argument('--area', type=float, help='전용면적(㎡) - 해당 면적대만')
+    window_parser.add_argument('--band', help='면적대 라벨 (~60, 60~85, 85~102, 102~135, 135~)')
+    window_parser.add_argument('--by', choices=('apt', 'band', 'month', 'region'), default='apt',
+                               help='묶는 단위 (기본값: apt)')
+    window_parser.add_argument('--top', type=int, default=20, help='출력 행 수 (기본값: 20)')
+
+    args = parser.parse_args()
+
+    with TradeStore(args.db) as store:
+        cube = PriceCube(store)
+        started = time.perf_counter()
+        counts = cube.refresh(force=getattr(args, 'force', False))
+        if counts['partitions'] or args.command == 'refresh':
+            print(f"✓ 큐브 갱신: 파티션 {counts['partitions']}개, 셀 {counts['cells']:,}개 "
+                  f"({time.perf_counter() - started:.2f}초)")
+        if args.command == 'refresh':
+            return 0
+
+        try:
+            band = band_for(args.area, args.band)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        end = args.end or cube.latest_month(args.region)
+        if not end:
+            print("⚠ 큐브가 비어 있습니다 (trade_store.py ingest로 거래를 먼저 적재)")
+            return 1
+        start = months_back(end, args.months - 1) if args.months else args.start
+
+        by = {'apt': ('lawd_cd', 'apt_nm'), 'band': ('band',), 'month': ('deal_ym',),
+              'region': ('lawd_cd',)}[args.by]
+        started = time.perf_counter()
+        cells = cube.window(start, end, lawd_cds=args.region, bands=[band] if band else None, by=by)
+        elapsed = time.perf_counter() - started
+
+        print(f"\n📊 {start or '처음'} ~ {end}, 면적대 {band or '전체'}: {len(cells):,}행 ({elapsed:.3f}초)")
+        rows = sorted(cells.items(), key=lambda item: item[1]['count'], reverse=True)
+        if args.by in ('band', 'month'):
+            rows = sorted(cells.items())
+        for key, stats in rows[:args.top]:
+            print(f"  {' '.join(str(value) for value in key)}: {stats['count']:,}건, "
+                  f"중위 {stats['median']:,.0f}만원, 평균 {stats['avg']:,.0f}만원, "
+                  f"평당 {stats['price_per_pyeong']:,.0f}만원")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+원본 연속지적도 shapefile 색인 (PNU / 지번 / 레코드 위치 / bbox)
+
+원본 DBF와 SHX를 한 번 스캔해 레코드별 PNU, 지번, SHP 오프셋, bbox를 모아
+원본 옆의 `.cadidx` 파일에 저장합니다. 이후에는 색인만 읽고 필요한 레코드의
+DBF 행과 SHP 지오메트리만 오프셋으로 직접 읽습니다.
+
+원본(.shp/.shx/.dbf)의 크기나 수정 시각이 바뀌면 색인을 다시 만듭니다.
+
+사용 예:
+    index = SourceIndex.load_or_build('LSMD_CONT_LDREG_41461_202510.shp')
+    idxs = index.find_jibuns(['123', '124-1'], clean_func=clean_jibun)
+    records = index.read_records(idxs)
+    geometries = index.read_geometries(idxs)
+"""
+
+import bisect
+import os
+import pickle
+import struct
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from dbf_reader import DBFHeader, decode_record, read_dbf_header, scan_dbf
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.cadidx'
+
+
+def _source_signature(shp_path: Path) -> Tuple:
+    """원본 파일 세트의 (크기, 수정 시각) 서명"""
+    signature = []
+    for suffix in ('.shp', '.shx', '.dbf'):
+        stat = shp_path.with_suffix(suffix).stat()
+        signature.append((suffix, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class SourceIndex:
+    """원본 shapefile 레코드 색인"""
+
+    def __init__(self, shp_path: Path, signature: Tuple, dbf_header: DBFHeader,
+                 pnus: List[str], jibuns: List[str], offsets: array, lengths: array,
+                 bboxes: array):
+        """
+        Args:
+            shp_path: 원본 shapefile 경로
+            signature: 색인 생성 시점의 원본 파일 서명
+            dbf_header: 원본 DBF 헤더
+            pnus: 레코드별 PNU
+            jibuns: 레코드별 지번 (원본 그대로, 지목 접미사 포함)
+            offsets: 레코드별 SHP 오프셋 (16비트 워드, SHX 값)
+            lengths: 레코드별 SHP 콘텐츠 길이 (16비트 워드)
+            bboxes: 레코드별 (xmin, ymin, xmax, ymax) 평탄화 배열
+        """
+        self.shp_path = Path(shp_path)
+        self.signature = signature
+        self.dbf_header = dbf_header
+        self.pnus = pnus
+        self.jibuns = jibuns
+        self.offsets = offsets
+        self.lengths = lengths
+        self.bboxes = bboxes
+        self._jibun_lookup = None
+        self._pnu_sorted = None
+
+    def __len__(self) -> int:
+        return len(self.pnus)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # 조회용 캐시는 저장하지 않음 (로드 후 필요할 때 생성)
+        state['_jibun_lookup'] = None
+        state['_pnu_sorted'] = None
+        return state
+
+    @property
+    def index_path(self) -> Path:
+        """색인 파일 경로 (원본 옆)"""
+        return self.shp_path.with_suffix(INDEX_SUFFIX)
+
+    def is_stale(self) -> bool:
+        """원본 파일이 색인 생성 후 바뀌었는지 여부"""
+        try:
+            return _source_signature(self.shp_path) != self.signature
+        except OSError:
+            return True
+
+    @classmethod
+    def build(cls, shp_path: str, encoding: str = 'cp949',
+              workers: Optional[int] = None) -> 'SourceIndex':
+        """원본 DBF/SHX/SHP를 스캔해 색인 생성"""
+        shp_path = Path(shp_path)
+        signature = _source_signature(shp_path)
+        dbf_path = shp_path.with_suffix('.dbf')
+
+        header = read_dbf_header(str(dbf_path))
+        records = scan_dbf(str(dbf_path), encoding=encoding, workers=workers,
+                           fields=['PNU', 'JIBUN'])
+        pnus = [''] * header.num_records
+        jibuns = [''] * header.num_records
+        for idx, record in records.items():
+            pnus[idx] = record['PNU'] or ''
+            jibuns[idx] = record['JIBUN'] or ''
+
+        # SHX: 레코드별 (오프셋, 길이) - 빅엔디언 워드 단위
+        shx_data = shp_path.with_suffix('.shx').read_bytes()
+        count = (len(shx_data) - 100) // 8
+        entries = struct.unpack(f'>{count * 2}i', shx_data[100:100 + count * 8])
+        offsets = array('i', entries[0::2])
+        lengths = array('i', entries[1::2])
+
+        # SHP: 레코드별 bbox (콘텐츠의 shape type 뒤 32바이트)
+        bboxes = array('d')
+        nan_box = (float('nan'),) * 4
+        with open(shp_path, 'rb') as f:
+            for offset, length in zip(offsets, lengths):
+                f.seek(offset * 2 + 8)
+                head = f.read(36)
+                if length * 2 >= 36 and struct.unpack_from('<i', head, 0)[0] != 0:
+                    bboxes.extend(struct.unpack_from('<4d', head, 4))
+                else:
+                    bboxes.extend(nan_box)  # Null shape
+
+        return cls(shp_path, signature, header, pnus, jibuns, offsets, lengths, bboxes)
+
+    @classmethod
+    def load(cls, shp_path: str) -> Optional['SourceIndex']:
+        """저장된 색인 로드 (없거나 오래되었거나 형식이 다르면 None)"""
+        index_path = Path(shp_path).with_suffix(INDEX_SUFFIX)
+        if not index_path.exists():
+            return None
+        try:
+            with open(index_path, 'rb') as f:
+                version, index = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return None
+        if version != INDEX_VERSION or index.is_stale():
+            return None
+        index.shp_path = Path(shp_path)
+        return index
+
+    def save(self) -> Optional[Path]:
+        """색인 저장 (원본 디렉토리에 쓸 수 없으면 None)"""
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((INDEX_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠ 색인 저장 실패 (메모리에서만 사용): {e}")
+            return None
+        return self.index_path
+
+    @classmethod
+    def load_or_build(cls, shp_path: str, encoding: str = 'cp949',
+                      workers: Optional[int] = None) -> 'SourceIndex':
+        """저장된 색인을 읽고, 없거나 오래되었으면 새로 만들어 저장"""
+        index = cls.load(shp_path)
+        if index is not None:
+            return index
+
+        print(f"🔨 원본 색인 생성 중: {shp_path}")
+        index = cls.build(shp_path, encoding=encoding, workers=workers)
+        saved = index.save()
+        if saved:
+            print(f"✓ 색인 저장: {saved} ({len(index):,}개 레코드)")
+        return index
+
+    # ------------------------------------------------------------------
+    # 조회
+
+    def warm(self, clean_func: Optional[Callable[[str], str]] = None):
+        """지번/PNU 조회 캐시를 미리 생성 (상주 프로세스에서 첫 질의 지연 제거)"""
+        self.jibun_lookup(clean_func)
+        self._sorted_pnus()
+
+    def jibun_lookup(self, clean_func: Optional[Callable[[str], str]] = None) -> Dict[str, List[int]]:
+        """지번 → 레코드 번호 목록 (원본 지번과 접미사 제거 지번 모두 키로 사용, clean_func별 캐시)"""
+        if self._jibun_lookup is None:
+            self._jibun_lookup = {}
+        lookup = self._jibun_lookup.get(clean_func)
+        if lookup is None:
+            lookup = {}
+            for idx, jibun in enumerate(self.jibuns):
+                lookup.setdefault(jibun, []).append(idx)
+                if clean_func is not None:
+                    cleaned = clean_func(jibun)
+                    if cleaned != jibun:
+                        lookup.setdefault(cleaned, []).append(idx)
+            self._jibun_lookup[clean_func] = lookup
+        return lookup
+
+    def find_jibuns(self, jibuns: Iterable[str], clean_func: Optional[Callable[[str], str]] = None,
+                    pnu_prefix: Optional[str] = None) -> List[int]:
+        """지번 목록에 해당하는 레코드 번호 (정렬, 중복 제거)"""
+        lookup = self.jibun_lookup(clean_func)
+        found = set()
+        for jibun in jibuns:
+            for idx in lookup.get(jibun, ()):
+                if not pnu_prefix or self.pnus[idx].startswith(pnu_prefix):
+                    found.add(idx)
+        return sorted(found)
+
+    def _sorted_pnus(self) -> List[Tuple[str, int]]:
+        if self._pnu_sorted is None:
+            self._pnu_sorted = sorted((pnu, idx) for idx, pnu in enumerate(self.pnus))
+        return self._pnu_sorted
+
+    def find_pnu_prefix(self, prefix: str) -> List[int]:
+        """PNU 접두사로 시작하는 레코드 번호 (이진 탐색)"""
+        pairs = self._sorted_pnus()
+        start = bisect.bisect_left(pairs, (prefix, -1))
+        found = []
+        for pnu, idx in pairs[start:]:
+            if not pnu.startswith(prefix):
+                break
+            found.append(idx)
+        return sorted(found)
+
+    def bbox(self, idx: int) -> Tuple[float, float, float, float]:
+        """레코드 bbox (xmin, ymin, xmax, ymax)"""
+        return tuple(self.bboxes[idx * 4:idx * 4 + 4])
+
+    # ------------------------------------------------------------------
+    # 레코드 직접 읽기
+
+    def read_records(self, idxs: Iterable[int], encoding: str = 'cp949') -> Dict[int, Dict]:
+        """DBF에서 지정한 레코드만 오프셋으로 읽기"""
+        header = self.dbf_header
+        records = {}
+        with open(self.shp_path.with_suffix('.dbf'), 'rb') as f:
+            for idx in idxs:
+                f.seek(header.header_len + idx * header.record_len)
+                rec = f.read(header.record_len)
+                records[idx] = decode_record(rec, header, encoding)
+        return records
+
+    def read_geometries(self, idxs: Iterable[int]) -> Dict[int, Tuple[bytes, bytes]]:
+        """SHP에서 지정한 레코드의 (레코드 헤더, 콘텐츠) 바이트만 읽기"""
+        geometries = {}
+        with open(self.shp_path, 'rb') as f:
+            for idx in idxs:
+                f.seek(self.offsets[idx] * 2)
+                record_header = f.read(8)
+                content = f.read(self.lengths[idx] * 2)
+                geometries[idx] = (record_header, content)
+        return geometries
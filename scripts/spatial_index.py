@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+레코드 bbox 격자 공간 색인
+
+레코드별 bbox(xmin, ymin, xmax, ymax)를 균일 격자 셀에 등록해 두고,
+질의 범위와 겹치는 셀의 후보만 실제 bbox 교차 검사를 합니다.
+필지처럼 크기가 고르게 작은 객체에 적합하며 외부 라이브러리가 필요 없습니다.
+
+사용 예:
+    grid = GridIndex(index.bboxes)           # SourceIndex의 평탄화 bbox 배열
+    idxs = grid.query(210000, 520000, 210500, 520500)
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 셀당 평균 객체 수 목표 (셀 크기 자동 결정 시)
+TARGET_PER_CELL = 4
+
+
+class GridIndex:
+    """균일 격자 bbox 색인 (NaN bbox = 지오메트리 없음, 색인에서 제외)"""
+
+    def __init__(self, bboxes: Sequence[float], cell_size: Optional[float] = None):
+        """
+        Args:
+            bboxes: 레코드 순서의 (xmin, ymin, xmax, ymax) 평탄화 배열
+            cell_size: 격자 셀 크기 (None이면 객체 밀도로 자동 결정)
+        """
+        self.bboxes = bboxes if isinstance(bboxes, array) else array('d', bboxes)
+        count = len(self.bboxes) // 4
+
+        valid = [i for i in range(count) if not math.isnan(self.bboxes[i * 4])]
+        self.count = len(valid)
+        if not valid:
+            self.extent = None
+            self.cell_size = cell_size or 1.0
+            self.cells: Dict[Tuple[int, int], array] = {}
+            return
+
+        b = self.bboxes
+        self.extent = (min(b[i * 4] for i in valid), min(b[i * 4 + 1] for i in valid),
+                       max(b[i * 4 + 2] for i in valid), max(b[i * 4 + 3] for i in valid))
+
+        if cell_size is None:
+            width = max(self.extent[2] - self.extent[0], 1e-9)
+            height = max(self.extent[3] - self.extent[1], 1e-9)
+            cell_size = math.sqrt(width * height * TARGET_PER_CELL / len(valid))
+        self.cell_size = cell_size
+
+        cells = {}
+        for i in valid:
+            x0, y0, x1, y1 = self._cell_range(b[i * 4], b[i * 4 + 1], b[i * 4 + 2], b[i * 4 + 3])
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cell = cells[(cx, cy)] = array('i')
+                    cell.append(i)
+        self.cells = cells
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _cell_range(self, xmin: float, ymin: float, xmax: float, ymax: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (math.floor(xmin / size), math.floor(ymin / size),
+                math.floor(xmax / size), math.floor(ymax / size))
+
+    def query(self, xmin: float, ymin: float, xmax: float, ymax: float,
+              limit: Optional[int] = None) -> List[int]:
+        """범위와 bbox가 겹치는 레코드 번호 (정렬)"""
+        if self.extent is None:
+            return []
+        # 전체 범위 밖은 셀 순회 없이 잘라냄
+        xmin, ymin = max(xmin, self.extent[0]), max(ymin, self.extent[1])
+        xmax, ymax = min(xmax, self.extent[2]), min(ymax, self.extent[3])
+        if xmin > xmax or ymin > ymax:
+            return []
+
+        b = self.bboxes
+        found = set()
+        x0, y0, x1, y1 = self._cell_range(xmin, ymin, xmax, ymax)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    if i in found:
+                        continue
+                    if b[i * 4] <= xmax and b[i * 4 + 2] >= xmin and \
+                            b[i * 4 + 1] <= ymax and b[i * 4 + 3] >= ymin:
+                        found.add(i)
+
+        result = sorted(found)
+        return result[:limit] if limit is not None else result
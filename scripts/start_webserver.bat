@@ -6,5 +6,6 @@ echo.
 echo 서버 주소: http://localhost:8000
 echo 종료: Ctrl+C
 echo.
-cd /d C:\Users\ksj27\PROJECTS\QGIS\output\webmap
-python -m http.server 8000
+rem ETag/사전 압축/범위 질의 지원 서버 (캐시 재검증으로 Ctrl+F5 불필요)
+cd /d %~dp0..
+python scripts\webmap_server.py --root output\webmap --port 8000 %*
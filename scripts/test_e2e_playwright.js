@@ -7,6 +7,25 @@
  */
 
 const { chromium } = require('playwright');
+const fs = require('fs');
+
+// 법정동 기대값은 웹맵이 읽는 GeoJSON에서 bjd_cd 앞 10자리로 직접 센다
+// (코드는 input/bjd_codes.txt 기준, test_filter_logic.js의 bjdExpected와 같은 방식)
+const geojsonPath = '/mnt/c/Users/ksj27/PROJECTS/QGIS/output/webmap/apartments_with_prices.geojson';
+const allApartments = JSON.parse(fs.readFileSync(geojsonPath, 'utf-8')).features;
+
+const DONG_CODES = {
+    '방배동': '1165010100',
+    '잠원동': '1165010600',
+    '반포동': '1165010700',
+    '서초동': '1165010800'
+};
+
+function countByBjd(dong, predicate = () => true) {
+    return allApartments.filter(apt =>
+        String(apt.properties.bjd_cd || '').slice(0, 10) === DONG_CODES[dong] && predicate(apt.properties)
+    ).length;
+}
 
 async function runE2ETests() {
     console.log('='.repeat(80));
@@ -80,10 +99,10 @@ async function runE2ETests() {
 
         // ===== 테스트 2-5: 법정동 필터 =====
         const dongTests = [
-            { dong: '반포동', expected: 6 },
-            { dong: '방배동', expected: 369 },
-            { dong: '서초동', expected: 437 },
-            { dong: '잠원동', expected: 2 }
+            { dong: '반포동', expected: countByBjd('반포동') },
+            { dong: '방배동', expected: countByBjd('방배동') },
+            { dong: '서초동', expected: countByBjd('서초동') },
+            { dong: '잠원동', expected: countByBjd('잠원동') }
         ];
 
         for (let i = 0; i < dongTests.length; i++) {
@@ -173,7 +192,7 @@ async function runE2ETests() {
         await page.waitForTimeout(500);
 
         count = await getStatValue();
-        expected = 5;
+        expected = countByBjd('반포동', p => p.avg_price >= 100000);
         if (count === expected) {
             console.log(`✅ [10/16] 반포동 + 평균가 100,000만원 이상`);
             console.log(`   예상: ${expected}개 | 실제: ${count}개`);
@@ -193,7 +212,7 @@ async function runE2ETests() {
         await page.waitForTimeout(500);
 
         count = await getStatValue();
-        expected = 5;
+        expected = countByBjd('반포동', p => p.transaction_count > 0);
         if (count === expected) {
             console.log(`✅ [11/16] 반포동 + 실거래가 있는 아파트만`);
             console.log(`   예상: ${expected}개 | 실제: ${count}개`);
@@ -217,7 +236,7 @@ async function runE2ETests() {
         await page.waitForTimeout(500);
 
         count = await getStatValue();
-        expected = 100;
+        expected = countByBjd('서초동', p => p.transaction_count > 0 && p.avg_price >= 200000);
         if (count === expected) {
             console.log(`✅ [12/16] 서초동 + 평균가 200,000만원 이상 + 실거래가 있음`);
             console.log(`   예상: ${expected}개 | 실제: ${count}개`);
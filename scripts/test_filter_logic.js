@@ -83,6 +83,159 @@ function applyFilters(apartments, filterState) {
     });
 }
 
+// ============================================
+// 색인 필터 (filters/<레이어>.json, transform_geojson_for_webmap.py 출력)
+// 범위 조건은 정렬된 값에서 이진 탐색, 법정동은 비트셋 → 가장 작은 후보만 확인
+// ============================================
+
+function decodeBitset(b64) {
+    return Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+}
+
+function hasBit(bits, id) {
+    return (bits[id >> 3] >> (id & 7)) & 1;
+}
+
+// 비트셋 → 켜진 피처 id (오름차순)
+function bitsetIds(bits) {
+    const ids = [];
+    bits.forEach((byte, i) => {
+        for (let j = 0; byte; j++, byte >>= 1) {
+            if (byte & 1) ids.push(i * 8 + j);
+        }
+    });
+    return Int32Array.from(ids);
+}
+
+// 정렬된 id 배열 두 개의 합집합 (병합)
+function unionSorted(a, b) {
+    const out = new Int32Array(a.length + b.length);
+    let i = 0, j = 0, n = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] < b[j]) out[n++] = a[i++];
+        else if (a[i] > b[j]) out[n++] = b[j++];
+        else { out[n++] = a[i++]; j++; }
+    }
+    while (i < a.length) out[n++] = a[i++];
+    while (j < b.length) out[n++] = b[j++];
+    return out.subarray(0, n);
+}
+
+function prepareFilterIndex(index) {
+    // 피처 id → 값 (값 없음은 NaN), 비트셋 디코딩 (비트셋 + 정렬된 id 배열, 한 번만)
+    const ranges = {};
+    Object.entries(index.ranges).forEach(([key, r]) => {
+        const byId = new Float64Array(index.count).fill(NaN);
+        r.ids.forEach((id, i) => { byId[id] = r.values[i]; });
+        ranges[key] = Object.assign({}, r, { byId: byId });
+    });
+    const sets = {};
+    Object.entries(index.sets).forEach(([key, values]) => {
+        sets[key] = {};
+        Object.entries(values).forEach(([value, b64]) => {
+            const bits = decodeBitset(b64);
+            sets[key][value] = { bits: bits, ids: bitsetIds(bits) };
+        });
+    });
+    return { count: index.count, ranges: ranges, sets: sets };
+}
+
+// 첫 values[i] >= bound (strict면 > bound) 위치 - 오프셋 표로 구간을 찾고 그 안에서 이진 탐색
+function searchValues(r, bound, strict) {
+    const k = Math.floor((bound - r.offset_base) / r.offset_step);
+    let lo, hi;
+    if (k < 0) {
+        lo = 0; hi = r.offsets[0];
+    } else if (k >= r.offsets.length - 1) {
+        lo = r.offsets[r.offsets.length - 1]; hi = r.values.length;
+    } else {
+        lo = r.offsets[k]; hi = r.offsets[k + 1];
+    }
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (strict ? r.values[mid] <= bound : r.values[mid] < bound) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+function applyFiltersIndexed(apartments, index, filterState) {
+    // 조건별 (통과하는 id 목록, 확인 함수) - 후보가 된 목록의 조건은 다시 확인하지 않음
+    const checks = [];
+    let candidates = null;
+    function narrow(ids, check) {
+        if (candidates === null || ids.length < candidates.length) candidates = ids;
+        checks.push({ ids: ids, check: check });
+    }
+
+    // 범위 필터 (값이 없는 아파트는 슬라이더가 기본 범위일 때만 통과)
+    Object.entries(index.ranges).forEach(([key, r]) => {
+        const [lo, hi] = filterState[key];
+        const start = searchValues(r, lo, false);
+        const end = searchValues(r, hi, true);
+        const narrowed = lo > r.bounds[0] || hi < r.bounds[1];
+        if (start === 0 && end === r.values.length && (!narrowed || r.missing.length === 0)) return;
+
+        const ids = r.ids.slice(start, end);
+        narrow(narrowed ? ids : ids.concat(r.missing), id => {
+            const value = r.byId[id];
+            return Number.isNaN(value) ? !narrowed : (value >= lo && value <= hi);
+        });
+    });
+
+    // 실거래가 있는 아파트만 (거래건수 > 0)
+    if (filterState.has_transactions) {
+        const r = index.ranges.transaction_count;
+        narrow(r.ids.slice(searchValues(r, 0, true)), id => r.byId[id] > 0);
+    }
+
+    // 법정동 (선택한 동 id 배열의 합집합, 후보 확인은 비트셋)
+    if (filterState.dong.length > 0) {
+        const selected = filterState.dong.map(dong => index.sets.dong[dong]).filter(Boolean);
+        narrow(selected.reduce((ids, set) => unionSorted(ids, set.ids), new Int32Array(0)),
+               id => selected.some(set => hasBit(set.bits, id)));
+    }
+
+    // 아파트 이름 검색 (후보에만)
+    if (filterState.apt_nm) {
+        checks.push({ ids: null, check: id => apartments[id].properties.apt_nm.includes(filterState.apt_nm) });
+    }
+
+    if (candidates === null) candidates = Array.from({ length: index.count }, (_, id) => id);
+    const pending = checks.filter(c => c.ids !== candidates).map(c => c.check);
+    return Int32Array.from(candidates.filter(id => pending.every(check => check(id)))).sort();
+}
+
+const filterIndexPath = path.join(path.dirname(geojsonPath), 'filters',
+                                  path.basename(geojsonPath, '.geojson') + '.json');
+const filterIndex = fs.existsSync(filterIndexPath)
+    ? prepareFilterIndex(JSON.parse(fs.readFileSync(filterIndexPath, 'utf-8')))
+    : null;
+console.log(filterIndex ? `필터 색인: ${filterIndexPath}` : '필터 색인 없음 (색인 필터 비교 생략)');
+console.log();
+
+// ============================================
+// 법정동 기대값
+// dong 라벨(transform_geojson_for_webmap.py가 코드표로 붙인 이름)이 아니라
+// bjd_cd 앞 10자리로 직접 센다. 코드는 input/bjd_codes.txt 기준.
+// (예전 하드코딩 bjd_map은 1165010600/1165010700을 서초동, 1165010900을 잠원동으로
+//  잘못 붙였으므로 그 기준의 고정 개수는 쓰지 않음)
+// ============================================
+
+const DONG_CODES = {
+    '방배동': '1165010100',
+    '잠원동': '1165010600',
+    '반포동': '1165010700',
+    '서초동': '1165010800'
+};
+
+function bjdExpected(filterState) {
+    const codes = filterState.dong.map(dong => DONG_CODES[dong]);
+    return applyFilters(allApartments, { ...filterState, dong: [] })
+        .filter(apt => codes.includes(String(apt.properties.bjd_cd || '').slice(0, 10)))
+        .length;
+}
+
 // ============================================
 // 테스트 시나리오
 // ============================================
@@ -110,7 +263,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: false
         },
-        expected: 6
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "법정동: 방배동",
@@ -122,7 +275,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: false
         },
-        expected: 369
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "법정동: 서초동",
@@ -134,7 +287,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: false
         },
-        expected: 437
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "법정동: 잠원동",
@@ -146,7 +299,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: false
         },
-        expected: 2
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "실거래가 있는 아파트만",
@@ -206,7 +359,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: false
         },
-        expected: 5
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "반포동 + 실거래가 있는 아파트만",
@@ -218,7 +371,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: true
         },
-        expected: 5
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "서초동 + 평균가 200,000만원 이상 + 실거래가 있음",
@@ -230,7 +383,7 @@ const testScenarios = [
             transaction_count: [0, 27],
             has_transactions: true
         },
-        expected: 100
+        expected: null  // bjd_cd 기준 (bjdExpected)
     },
     {
         name: "아파트 이름: 래미안",
@@ -296,8 +449,18 @@ const failures = [];
 testScenarios.forEach((scenario, index) => {
     const filtered = applyFilters(allApartments, scenario.filterState);
     const actual = filtered.length;
-    const expected = scenario.expected;
-    const isPass = actual === expected;
+    const expected = scenario.expected ?? bjdExpected(scenario.filterState);
+    let isPass = actual === expected;
+
+    // 색인 필터가 전체 검사와 같은 아파트를 고르는지
+    if (filterIndex) {
+        const scanned = filtered.map(apt => apt.id).join(',');
+        const indexed = Array.from(applyFiltersIndexed(allApartments, filterIndex, scenario.filterState)).join(',');
+        if (indexed !== scanned) {
+            console.log(`   ⚠ 색인 필터 결과가 다릅니다: ${indexed.split(',').filter(Boolean).length}개`);
+            isPass = false;
+        }
+    }
 
     if (isPass) {
         console.log(`✅ [${index + 1}/${testScenarios.length}] ${scenario.name}`);
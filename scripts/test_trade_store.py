@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+거래 저장소(trade_store.py) 적재 테스트
+
+임시 디렉토리에 저장소를 만들어 다음을 확인합니다:
+  1. 같은 달을 두 번 적재해도 거래가 늘지 않고 파티션 적재 시각이 그대로인지
+  2. 나중 자료에 생긴 해제사유발생일이 반영되는지
+  3. 나중 자료에서 해제사유발생일이 지워지면 기존 해제일도 지워지는지
+  4. 버전 1 저장소(법정동 코드 컬럼 없음)를 열면 컬럼이 추가되고 다시 적재할 때 채워지는지
+
+사용법:
+    python scripts/test_trade_store.py
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from trade_store import SCHEMA_VERSION, TradeStore, trade_key
+
+# 버전 1 저장소 스키마 (umd_cd/bonbun/bubun 추가 전)
+V1_SCHEMA = '''
+CREATE TABLE trades (
+    lawd_cd TEXT NOT NULL,
+    deal_ym INTEGER NOT NULL,
+    trade_key TEXT NOT NULL,
+    apt_nm TEXT,
+    umd_nm TEXT,
+    jibun TEXT,
+    deal_amount INTEGER,
+    build_year INTEGER,
+    deal_year INTEGER,
+    deal_month INTEGER,
+    deal_day INTEGER,
+    area REAL,
+    floor INTEGER,
+    road_nm TEXT,
+    cancel_date TEXT,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ym, trade_key)
+) WITHOUT ROWID;
+
+CREATE TABLE partitions (
+    lawd_cd TEXT NOT NULL,
+    deal_ym INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    cancelled INTEGER NOT NULL,
+    source TEXT,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ym)
+) WITHOUT ROWID;
+
+PRAGMA user_version=1;
+'''
+
+
+def month_rows(cancel_date=''):
+    """서초구 2024-10 거래 3건 (첫 거래의 해제사유발생일만 바꿔 가며 사용)"""
+    base = {'법정동': '반포동', '년': 2024, '월': 10, '지역코드': '11650',
+            '건축년도': 2009, '도로명': '신반포로', '법정동읍면동코드': '10700',
+            '법정동본번코드': '0020', '법정동부번코드': '0000'}
+    return [
+        dict(base, 아파트='반포자이', 지번='20-43', 전용면적=84.94, 층=12, 일=3,
+             거래금액=345000, 해제사유발생일=cancel_date),
+        dict(base, 아파트='반포자이', 지번='20-43', 전용면적=59.98, 층=5, 일=11,
+             거래금액=268000, 해제사유발생일=''),
+        dict(base, 아파트='래미안퍼스티지', 지번='19', 전용면적=84.93, 층=20, 일=25,
+             거래금액=362000, 해제사유발생일=''),
+    ]
+
+
+def partition(store):
+    lawd_cd, deal_ym, rows, cancelled, source, ingested_at = store.partitions('11650')[0]
+    return rows, cancelled, ingested_at
+
+
+def run_tests(tmp: Path):
+    results = []
+
+    def check(name, ok, detail=''):
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} {name}" + (f" - {detail}" if detail else ''))
+
+    with TradeStore(tmp / 'trades.sqlite') as store:
+        # 1. 같은 달 두 번 적재
+        first = store.ingest(month_rows(), '11650', '202410', source='first')
+        _, _, loaded_at = partition(store)
+        time.sleep(0.01)
+        again = store.ingest(month_rows(), '11650', '202410', source='again')
+        rows, cancelled, reloaded_at = partition(store)
+        check("같은 달 다시 적재: 중복 없음",
+              first['inserted'] == 3 and again['inserted'] == 0 and rows == 3,
+              f"신규 {first['inserted']} → {again['inserted']}, 거래 {rows}건")
+        check("같은 달 다시 적재: 파티션 적재 시각 유지", reloaded_at == loaded_at)
+
+        # 2. 해제사유발생일이 생김
+        counts = store.ingest(month_rows('24.11.02'), '11650', '202410')
+        rows, cancelled, _ = partition(store)
+        live = list(store.query(['11650'], '202410', '202410'))
+        check("해제 반영", counts['cancelled'] == 1 and cancelled == 1 and len(live) == 2,
+              f"해제 반영 {counts['cancelled']}건, 파티션 해제 {cancelled}, 질의 {len(live)}건")
+
+        # 3. 해제사유발생일이 지워짐
+        counts = store.ingest(month_rows(''), '11650', '202410')
+        rows, cancelled, _ = partition(store)
+        live = list(store.query(['11650'], '202410', '202410'))
+        check("해제 취소 반영", counts['restored'] == 1 and cancelled == 0 and len(live) == 3,
+              f"해제 취소 {counts['restored']}건, 파티션 해제 {cancelled}, 질의 {len(live)}건")
+
+    # 4. 버전 1 저장소 열기
+    v1_path = tmp / 'trades_v1.sqlite'
+    conn = sqlite3.connect(str(v1_path))
+    conn.executescript(V1_SCHEMA)
+    row = month_rows()[0]
+    conn.execute(
+        'INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        ('11650', 202410, trade_key(row, 1), row['아파트'], row['법정동'], row['지번'], row['거래금액'],
+         row['건축년도'], row['년'], row['월'], row['일'], row['전용면적'], row['층'], row['도로명'],
+         None, 0.0, 0.0))
+    conn.commit()
+    conn.close()
+
+    with TradeStore(v1_path) as store:
+        version = store.conn.execute('PRAGMA user_version').fetchone()[0]
+        columns = {info[1] for info in store.conn.execute('PRAGMA table_info(trades)')}
+        check("버전 1 저장소: 컬럼 추가",
+              version == SCHEMA_VERSION and {'umd_cd', 'bonbun', 'bubun'} <= columns,
+              f"user_version {version}")
+
+        counts = store.ingest(month_rows(), '11650', '202410')
+        codes = store.conn.execute(
+            'SELECT umd_cd, bonbun, bubun FROM trades WHERE trade_key = ?', (trade_key(row, 1),)).fetchone()
+        check("버전 1 저장소: 다시 적재하면 기존 거래에 법정동 코드 채움",
+              counts['inserted'] == 2 and codes == ('10700', '0020', '0000'),
+              f"신규 {counts['inserted']}건, 코드 {codes}")
+
+    return all(results), len(results)
+
+
+def main():
+    print("=" * 70)
+    print("🧪 거래 저장소 적재 테스트")
+    print("=" * 70)
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ok, total = run_tests(Path(tmp))
+
+    print()
+    print("=" * 70)
+    print(f"{'✅ 모든 테스트 통과' if ok else '❌ 실패한 테스트가 있습니다'} ({total}개)")
+    print("=" * 70)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+실거래가 ↔ 아파트 단지 필지 키 정확 매칭
+
+거래 행과 단지 마스터(apt_mst_info)를 같은 필지 키
+(10자리 법정동코드, 본번, 부번)로 정규화해 해시 조인합니다.
+
+- 거래: 지역코드(5) + 법정동읍면동코드(5), 법정동본번코드/법정동부번코드.
+  코드 필드가 없는 예전 거래 파일은 지번("1-1")을 나누고, 법정동 이름은 단지 마스터
+  지번주소에서 얻은 (시군구코드, 법정동명) → 법정동코드 표로 코드를 찾습니다.
+- 단지: bjd_cd, 지번주소(lnmadr)의 마지막 지번
+- 한 필지에 단지가 여럿이면 단지명 유사도로 하나를 고릅니다 (이름은 동점 처리에만 사용).
+
+사용법:
+    # 저장소의 서초구/강남구 2024년 거래를 단지 마스터와 조인하고 매칭률 보고
+    python scripts/trade_complex_join.py data/apt_mst_info_202410_shp.zip \\
+        --region 11650 --region 11680 --start 202401 --end 202412 --report output/join_report.json
+
+    # 코드에서
+    index = ComplexIndex(master_records)
+    matches, report = join_trades(trades, index)
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from apt_name_index import normalize_apt_name
+from dbf_reader import scan_dbf
+from trade_store import DEFAULT_STORE_PATH, TradeStore
+
+# 필지 키: (10자리 법정동코드, 본번, 부번)
+LotKey = Tuple[str, int, int]
+
+# 지번 "1-1", "산12-3", "1317", "20번지"
+_JIBUN = re.compile(r'^(산)?\s*(\d+)(?:-(\d+))?(?:번지)?$')
+
+# 매칭 결과 상태
+EXACT = 'exact'            # 필지에 단지 하나
+TIE_BREAK = 'tie_break'    # 필지에 단지 여럿 → 단지명으로 선택
+NO_LOT = 'no_lot'          # 거래의 필지 키를 만들 수 없음 (지번/법정동 코드 없음)
+NO_COMPLEX = 'no_complex'  # 필지에 해당하는 단지 없음
+
+# 보고에 출력할 지역 수 (더 많으면 매칭률 낮은 순)
+REPORT_REGIONS = 15
+
+STATUS_LABELS = {
+    EXACT: '필지 일치',
+    TIE_BREAK: '필지 일치 (단지명으로 선택)',
+    NO_LOT: '필지 키 없음',
+    NO_COMPLEX: '단지 없음',
+}
+
+
+def parse_jibun(text) -> Optional[Tuple[int, int]]:
+    """지번 → (본번, 부번) ('1-1' → (1, 1), '1317' → (1317, 0), 형식이 다르면 None)"""
+    match = _JIBUN.match(str(text or '').strip())
+    if not match:
+        return None
+    return int(match.group(2)), int(match.group(3) or 0)
+
+
+def parse_lot_address(address: str) -> Optional[Tuple[str, int, int]]:
+    """
+    지번주소 → (법정동/리 이름, 본번, 부번)
+
+    '서울특별시 서초구 반포동 1-1' → ('반포동', 1, 1),
+    '경기도 용인시 처인구 원삼면 주북리 산 123 주북아파트' → ('주북리', 123, 0)
+    """
+    tokens = str(address or '').split()
+    for i in range(len(tokens) - 1, 0, -1):
+        lot = parse_jibun(tokens[i])
+        if lot is None:
+            continue
+        # "주북리 산 123"처럼 산이 떨어져 있으면 한 칸 앞이 법정동/리
+        j = i - 2 if tokens[i - 1] == '산' else i - 1
+        if j >= 0 and parse_jibun(tokens[j]) is None and not tokens[j][-1].isdigit():
+            return (tokens[j],) + lot
+    return None
+
+
+class ComplexIndex:
+    """
+    단지 마스터 필지 키 해시 색인
+
+    Args:
+        complexes: 단지 레코드 (apt_mst_info DBF 레코드, GeoJSON properties 등)
+        code_field, address_field, name_field: 법정동코드 / 지번주소 / 단지명 필드
+    """
+
+    def __init__(self, complexes: Iterable[Dict], code_field: str = 'bjd_cd',
+                 address_field: str = 'lnmadr', name_field: str = 'apt_nm'):
+        self.name_field = name_field
+        self.by_lot: Dict[LotKey, List[Dict]] = defaultdict(list)
+        # (시군구코드, 법정동명) → 법정동코드
+        self.dong_codes: Dict[Tuple[str, str], str] = {}
+        self.complexes = 0
+        self.unkeyed = 0
+
+        for record in complexes:
+            self.complexes += 1
+            bjd_cd = str(record.get(code_field) or '').strip()
+            lot = parse_lot_address(record.get(address_field))
+            if len(bjd_cd) != 10 or lot is None:
+                self.unkeyed += 1
+                continue
+            dong_name, bonbun, bubun = lot
+            self.by_lot[(bjd_cd, bonbun, bubun)].append(record)
+            self.dong_codes.setdefault((bjd_cd[:5], dong_name), bjd_cd)
+        self.by_lot = dict(self.by_lot)
+
+    def trade_lot(self, trade: Dict) -> Optional[LotKey]:
+        """거래 행 → 필지 키 (만들 수 없으면 None)"""
+        sgg_cd = str(trade.get('지역코드') or '').strip()
+        umd_cd = str(trade.get('법정동읍면동코드') or '').strip()
+        if umd_cd:
+            bjd_cd = sgg_cd + umd_cd
+        else:
+            bjd_cd = self.dong_codes.get((sgg_cd, str(trade.get('법정동') or '').strip()), '')
+        if len(bjd_cd) != 10:
+            return None
+
+        bonbun = str(trade.get('법정동본번코드') or '').strip()
+        if bonbun.isdigit():
+            bubun = str(trade.get('법정동부번코드') or '').strip()
+            lot = (int(bonbun), int(bubun) if bubun.isdigit() else 0)
+        else:
+            lot = parse_jibun(trade.get('지번'))
+        if lot is None:
+            return None
+        return (bjd_cd,) + lot
+
+    def candidates(self, lot: LotKey) -> List[Dict]:
+        return self.by_lot.get(lot, [])
+
+    def pick(self, records: Sequence[Dict], apt_name: str) -> Dict:
+        """한 필지의 단지 여럿 중 단지명이 가장 비슷한 단지"""
+        target = normalize_apt_name(apt_name)
+        return max(records, key=lambda record: SequenceMatcher(
+            None, target, normalize_apt_name(record.get(self.name_field) or '')).ratio())
+
+
+def join_trades(trades: Iterable[Dict], index: ComplexIndex) -> Tuple[List[Tuple[Dict, Optional[Dict]]], Dict]:
+    """
+    거래 ↔ 단지 해시 조인
+
+    같은 (필지 키, 단지명) 거래는 한 번만 판정합니다.
+
+    Returns:
+        ([(거래, 단지 또는 None)], 매칭률 보고)
+    """
+    started = time.perf_counter()
+    resolved: Dict[Tuple, Tuple[Optional[Dict], str]] = {}
+    matches = []
+    status_counts: Counter = Counter()
+    region_counts: Dict[str, Counter] = defaultdict(Counter)
+    unmatched: Counter = Counter()
+
+    for trade in trades:
+        apt_name = str(trade.get('아파트') or '').strip()
+        lot = index.trade_lot(trade)
+        group = (lot, apt_name)
+        if group not in resolved:
+            if lot is None:
+                resolved[group] = (None, NO_LOT)
+            else:
+                records = index.candidates(lot)
+                if not records:
+                    resolved[group] = (None, NO_COMPLEX)
+                elif len(records) == 1:
+                    resolved[group] = (records[0], EXACT)
+                else:
+                    resolved[group] = (index.pick(records, apt_name), TIE_BREAK)
+        record, status = resolved[group]
+
+        matches.append((trade, record))
+        status_counts[status] += 1
+        region_counts[str(trade.get('지역코드') or '')][status] += 1
+        if record is None:
+            unmatched[(trade.get('지역코드') or '', trade.get('법정동') or '',
+                       trade.get('지번') or '', apt_name, status)] += 1
+
+    total = len(matches)
+    matched = status_counts[EXACT] + status_counts[TIE_BREAK]
+    report = {
+        'trades': total,
+        'matched': matched,
+        'match_rate': matched / total if total else 0.0,
+        'status': {status: status_counts[status] for status in STATUS_LABELS},
+        'regions': {
+            region: {
+                'trades': sum(counts.values()),
+                'matched': counts[EXACT] + counts[TIE_BREAK],
+                'match_rate': (counts[EXACT] + counts[TIE_BREAK]) / sum(counts.values()),
+            }
+            for region, counts in sorted(region_counts.items())
+        },
+        'complexes': index.complexes,
+        'complexes_without_lot': index.unkeyed,
+        'top_unmatched': [
+            {'지역코드': region, '법정동': dong, '지번': jibun, '아파트': name,
+             'status': status, 'trades': count}
+            for (region, dong, jibun, name, status), count in unmatched.most_common(20)
+        ],
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    return matches, report
+
+
+def print_report(report: Dict):
+    """매칭률 보고 출력"""
+    print(f"\n📊 거래 ↔ 단지 매칭: {report['matched']:,}/{report['trades']:,}건 "
+          f"({report['match_rate']:.1%}), {report['seconds']:.2f}초")
+    for status, label in STATUS_LABELS.items():
+        print(f"   {label}: {report['status'][status]:,}건")
+    if report['complexes'] and report['complexes_without_lot'] == report['complexes']:
+        print(f"   ⚠️  모든 단지({report['complexes']:,}개)에 bjd_cd/지번주소가 없어 필지 키 매칭을 할 수 없습니다 "
+              f"(단지 레코드에 bjd_cd, lnmadr 필드가 있는지 확인하세요)")
+    elif report['complexes_without_lot']:
+        print(f"   ⚠️  지번주소로 필지 키를 만들 수 없는 단지: "
+              f"{report['complexes_without_lot']:,}/{report['complexes']:,}개")
+
+    if len(report['regions']) > 1:
+        regions = list(report['regions'].items())
+        if len(regions) > REPORT_REGIONS:
+            print(f"\n   지역별 매칭률 (전체 {len(regions)}개 중 낮은 순 {REPORT_REGIONS}개):")
+            regions = sorted(regions, key=lambda item: item[1]['match_rate'])[:REPORT_REGIONS]
+        else:
+            print("\n   지역별 매칭률:")
+        for region, stats in regions:
+            print(f"   {region}: {stats['matched']:,}/{stats['trades']:,}건 ({stats['match_rate']:.1%})")
+
+    if report['top_unmatched']:
+        print("\n   매칭 실패 상위 (거래 수):")
+        for item in report['top_unmatched'][:10]:
+            print(f"   - {item['지역코드']} {item['법정동']} {item['지번']} {item['아파트']}: "
+                  f"{item['trades']}건 ({STATUS_LABELS[item['status']]})")
+
+
+def load_master(path: str) -> List[Dict]:
+    """apt_mst_info DBF(또는 SHP ZIP) 단지 레코드"""
+    if path.lower().endswith('.zip'):
+        import zipfile
+        with zipfile.ZipFile(path) as zf:
+            member = next(n for n in zf.namelist() if n.lower().endswith('.dbf'))
+            source = zf.read(member)
+    else:
+        source = path
+    return list(scan_dbf(source, fields=['apt_nm', 'bjd_cd', 'lnmadr']).values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실거래가 ↔ 아파트 단지 필지 키 정확 매칭')
+    parser.add_argument('master', help='apt_mst_info DBF 또는 SHP ZIP 경로')
+    parser.add_argument('--trades', nargs='+', help='월별 거래 파일 (없으면 거래 저장소에서 질의)')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH),
+                        help='거래 저장소 경로 (기본값: data/apt_trades.sqlite)')
+    parser.add_argument('--region', '-r', action='append', help='지역코드 (여러 번 지정 가능, 없으면 전체)')
+    parser.add_argument('--start', help='시작 계약년월 (YYYYMM)')
+    parser.add_argument('--end', help='끝 계약년월 (YYYYMM)')
+    parser.add_argument('--report', help='매칭률 보고 JSON 저장 경로')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = ComplexIndex(load_master(args.master))
+    print(f"📂 단지 마스터: {index.complexes:,}개, 필지 키 {len(index.by_lot):,}개 "
+          f"({time.perf_counter() - started:.2f}초)")
+
+    started = time.perf_counter()
+    if args.trades:
+        trades = []
+        for path in args.trades:
+            with open(path, 'r', encoding='utf-8') as f:
+                trades.extend(json.load(f))
+    else:
+        with TradeStore(args.store) as store:
+            trades = list(store.query(args.region, args.start, args.end))
+    print(f"📂 거래: {len(trades):,}건 ({time.perf_counter() - started:.2f}초)")
+
+    _, report = join_trades(trades, index)
+    print_report(report)
+
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 보고 저장: {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+국토교통부 실거래가 공개시스템 CSV 내보내기(아파트 매매) 읽기
+
+내보낸 CSV는 EUC-KR(CP949)이고 헤더 앞에 조건/안내 문구가 15줄 정도 붙어 있습니다.
+전국 1년치(수십만 행, 수십 MB)를 한 행씩 DictReader로 읽지 않도록:
+
+- 헤더 행(시군구, 단지명 열이 있는 행)을 앞부분에서 찾아 그 다음 바이트부터 읽습니다.
+- 파일을 큰 블록(BLOCK_SIZE)으로 읽고, 시군구 조건이 있으면 인코딩된 바이트 그대로
+  ("서초구" → CP949 바이트) 블록에서 찾아 그 줄만 디코딩/CSV 파싱합니다.
+  바이트 일치는 후보일 뿐이라 파싱 후 시군구 열로 다시 확인합니다.
+- 결과는 블록마다 {열 이름: 값 목록} 배치로, 숫자 열은 타입을 변환해 돌려줍니다
+  (거래금액 "57,300" → 57300, 빈 값/형식 오류는 None).
+
+메모리는 블록 크기와 한 블록의 일치 행 수에만 비례합니다.
+
+사용법:
+    # 서초구 거래 요약
+    python scripts/trade_csv.py "data/아파트(매매)_실거래가_20251022152629.csv" --district 서초구
+
+    # 코드에서
+    for batch in iter_batches(csv_path, districts=['서초구'], columns=['단지명', '거래금액(만원)']):
+        for name, price in zip(batch['단지명'], batch['거래금액(만원)']):
+            ...
+    for row in iter_rows(csv_path, districts=['서초구']):   # 행 딕셔너리
+        ...
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+ENCODING = 'cp949'
+
+# 한 번에 읽는 바이트 수
+BLOCK_SIZE = 1024 * 1024
+
+# 헤더 행을 찾을 앞부분 바이트 수
+HEADER_SCAN_BYTES = 64 * 1024
+
+# 헤더 행 판별 열
+HEADER_MARKERS = ('시군구', '단지명')
+
+DISTRICT_COLUMN = '시군구'
+
+
+def parse_int(value: str) -> Optional[int]:
+    """"57,300" / " 5" → 정수 (빈 값/형식 오류는 None)"""
+    try:
+        return int(value)
+    except ValueError:
+        value = value.replace(',', '').strip()
+        try:
+            return int(value) if value else None
+        except ValueError:
+            return None
+
+
+def parse_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+# 숫자 열 변환 (그 외 열은 앞뒤 공백을 뺀 문자열)
+COLUMN_TYPES = {
+    'NO': parse_int,
+    '전용면적(㎡)': parse_float,
+    '계약년월': parse_int,
+    '계약일': parse_int,
+    '거래금액(만원)': parse_int,
+    '층': parse_int,
+    '건축년도': parse_int,
+}
+
+
+def find_header(path: Path) -> Tuple[int, List[str]]:
+    """
+    헤더 행 찾기
+
+    Returns:
+        (데이터 첫 행의 바이트 오프셋, 열 이름 목록)
+    """
+    with open(path, 'rb') as f:
+        head = f.read(HEADER_SCAN_BYTES)
+
+    offset = 0
+    for line in head.splitlines(keepends=True):
+        offset += len(line)
+        text = line.decode(ENCODING, errors='replace')
+        if all(marker in text for marker in HEADER_MARKERS):
+            return offset, [name.strip() for name in next(csv.reader([text]))]
+    raise ValueError(f"헤더 행({', '.join(HEADER_MARKERS)})을 찾을 수 없습니다: {path}")
+
+
+def _matching_lines(block: bytes, needles: Sequence[bytes]) -> bytes:
+    """블록에서 needle 중 하나라도 들어 있는 줄만 (원래 순서)"""
+    lines = block.split(b'\n')
+    if len(needles) == 1:
+        needle = needles[0]
+        kept = [line for line in lines if needle in line]
+    else:
+        kept = [line for line in lines if any(needle in line for needle in needles)]
+    return b'\n'.join(kept)
+
+
+def _blocks(path: Path, offset: int, block_size: int) -> Iterator[bytes]:
+    """offset부터 줄 단위로 끊은 블록"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        rest = b''
+        while True:
+            data = f.read(block_size)
+            if not data:
+                if rest:
+                    yield rest
+                return
+            data = rest + data
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+
+
+def iter_batches(path, districts: Optional[Sequence[str]] = None,
+                 columns: Optional[Sequence[str]] = None,
+                 block_size: int = BLOCK_SIZE) -> Iterator[Dict[str, list]]:
+    """
+    블록 단위 열 배치
+
+    Args:
+        path: 내보낸 CSV 경로
+        districts: 시군구 조건 (시군구 열에 하나라도 들어 있는 행만, 예: ['서초구'])
+        columns: 돌려줄 열 (None이면 전체)
+        block_size: 한 번에 읽는 바이트 수
+
+    Yields:
+        {열 이름: 값 목록} - 일치 행이 없는 블록은 건너뜀 (열이 모자란 행은 제외)
+    """
+    path = Path(path)
+    offset, header = find_header(path)
+    columns = list(columns or header)
+    missing = [name for name in columns if name not in header]
+    if missing:
+        raise ValueError(f"CSV에 없는 열: {missing}")
+
+    positions = [header.index(name) for name in columns]
+    converters = [COLUMN_TYPES.get(name, str.strip) for name in columns]
+    district_pos = header.index(DISTRICT_COLUMN)
+    last_pos = max(positions + [district_pos])
+    needles = [district.encode(ENCODING) for district in districts or ()]
+
+    for block in _blocks(path, offset, block_size):
+        if needles:
+            block = _matching_lines(block, needles)
+            if not block:
+                continue
+
+        rows = list(csv.reader(io.StringIO(block.decode(ENCODING, errors='replace'))))
+        rows = [row for row in rows if len(row) > last_pos]
+        if districts:
+            rows = [row for row in rows if any(district in row[district_pos] for district in districts)]
+        if not rows:
+            continue
+
+        # 열 단위 변환 (행마다 딕셔너리를 만들지 않음)
+        yield {name: [convert(row[pos]) for row in rows]
+               for name, pos, convert in zip(columns, positions, converters)}
+
+
+def iter_rows(path, districts: Optional[Sequence[str]] = None,
+              columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+    """행 딕셔너리 (iter_batches를 행으로 풀기)"""
+    for batch in iter_batches(path, districts, columns):
+        names = list(batch)
+        for values in zip(*batch.values()):
+            yield dict(zip(names, values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실거래가 공개시스템 CSV 내보내기 읽기')
+    parser.add_argument('csv', help='내보낸 CSV 경로 (EUC-KR)')
+    parser.add_argument('--district', '-d', action='append',
+                        help='시군구 조건 (여러 번 지정 가능, 예: 서초구)')
+    parser.add_argument('--output', '-o', help='일치 행 JSON 저장 경로 (없으면 요약만 출력)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = 0
+    complexes = set()
+    prices = []
+    records = [] if args.output else None
+    for batch in iter_batches(args.csv, args.district):
+        rows += len(batch['단지명'])
+        complexes.update(name for name in batch['단지명'] if name)
+        prices.extend(price for price in batch['거래금액(만원)'] if price)
+        if records is not None:
+            names = list(batch)
+            records.extend(dict(zip(names, values)) for values in zip(*batch.values()))
+    elapsed = time.perf_counter() - started
+
+    size = Path(args.csv).stat().st_size
+    print(f"📂 {Path(args.csv).name}: {size / 1024 / 1024:,.1f}MB, {elapsed:.2f}초 "
+          f"({size / 1024 / 1024 / max(elapsed, 1e-9):,.0f}MB/s)")
+    print(f"✅ {', '.join(args.district) if args.district else '전체'}: {rows:,}건, 단지 {len(complexes):,}개")
+    if prices:
+        print(f"   거래금액: {min(prices):,} ~ {max(prices):,}만원")
+
+    if records is not None:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        print(f"💾 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+실거래가 API 응답 디스크 캐시 (콘텐츠 주소 방식)
+
+요청 키 (엔드포인트, LAWD_CD, DEAL_YMD, pageNo, numOfRows)별로 받은 응답을 저장해 두고
+다시 요청하지 않습니다. 신고가 끝난 지난달 이전 자료는 거의 바뀌지 않으므로 무기한 사용하고,
+아직 신고가 들어오는 최근 두 달(이번 달, 지난달)은 짧은 TTL이 지나면 다시 받습니다.
+
+    <캐시>/objects/<해시 앞 2자리>/<sha256>.xml.gz   응답 본문 (gzip, 같은 내용은 한 번만 저장)
+    <캐시>/refs/<키 해시>.json                       요청 키 → 본문 해시, 크기, 받은 시각
+    <캐시>/stats.json                                누적 적중/절약 바이트
+
+정상 응답(resultCode 00/000)만 저장하므로 인증 오류나 호출 한도 초과 응답이 캐시되지 않습니다.
+오프라인 모드에서는 네트워크를 쓰지 않고 캐시만 사용합니다 (TTL이 지난 항목도 사용).
+
+응답은 스트림으로 주고받습니다. 캐시 적중이면 압축 본문을 풀면서 읽는 스트림을,
+아니면 네트워크 응답을 읽는 대로 캐시 파일에도 기록하는 스트림을 돌려주므로
+응답 전체를 메모리에 올리지 않습니다 (끝까지 읽은 응답만 저장).
+
+사용 예:
+    cache = ResponseCache()
+    key = cache.key(BASE_URL, '11650', '202301', 1, 1000)
+    with cache.urlopen(url, key) as response:  # 캐시 적중이면 네트워크 요청 없음
+        for trade in TradeStreamParser(response):
+            ...
+    print(cache.report())
+
+    # 캐시 상태 / 정리
+    python scripts/trade_response_cache.py stats
+    python scripts/trade_response_cache.py prune      # 참조되지 않는 본문 삭제
+    python scripts/trade_response_cache.py clear --recent   # 최근 두 달 항목만 삭제
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import DATA_DIR
+
+DEFAULT_CACHE_DIR = Path(os.getenv('MOLIT_CACHE_DIR', DATA_DIR / 'molit_cache'))
+
+# 최근 두 달 응답 유효 시간 (초)
+RECENT_TTL = 6 * 3600
+
+# 이 개월 수 이전의 계약년월은 마감된 것으로 보고 무기한 캐시 (0=이번 달, 1=지난달)
+OPEN_MONTHS = 2
+
+_RESULT_CODE = re.compile(rb'<resultCode>\s*(\d+)\s*</resultCode>')
+
+
+def response_ok(data: bytes) -> bool:
+    """정상 응답 여부 (resultCode 00/000 - 오류 응답은 캐시하지 않음)"""
+    match = _RESULT_CODE.search(data[:2048])
+    return bool(match) and match.group(1) in (b'00', b'000')
+
+
+def months_ago(deal_ymd: str, now: Optional[datetime] = None) -> int:
+    """계약년월이 현재로부터 몇 달 전인지 (이번 달 = 0, 미래는 음수)"""
+    now = now or datetime.now()
+    return (now.year * 12 + now.month) - (int(deal_ymd[:4]) * 12 + int(deal_ymd[4:6]))
+
+
+class CacheMiss(LookupError):
+    """오프라인 모드에서 캐시에 없는 요청"""
+
+
+class CachedResponse:
+    """캐시된 본문 스트림 (urlopen 응답처럼 getcode/read/with 지원)"""
+
+    def __init__(self, stream: BinaryIO, status: int = 200):
+        self.stream = stream
+        self.status = status
+
+    def getcode(self) -> int:
+        return self.status
+
+    def read(self, size: int = -1) -> bytes:
+        return self.stream.read(size)
+
+    def close(self):
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class RecordingResponse:
+    """
+    네트워크 응답을 읽는 대로 캐시 임시 파일(gzip)에도 기록하는 스트림
+
+    끝까지 읽고 닫으면 정상 응답일 때만 캐시에 등록하고, 중간에 닫거나
+    오류 응답이면 임시 파일을 버립니다.
+    """
+
+    def __init__(self, cache: 'ResponseCache', response, key: Dict):
+        self.cache = cache
+        self.response = response
+        self.key = key
+        self.status = response.getcode()
+        self._sha256 = hashlib.sha256()
+        self._size = 0
+        self._head = b''
+        self._eof = False
+        tmp_dir = cache.cache_dir / 'objects'
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = tmp_dir / f"incoming.{os.getpid()}.{threading.get_ident()}.{id(self)}.tmp"
+        self._gzip = gzip.GzipFile(self._tmp_path, 'wb', mtime=0)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.response.read(size)
+        if not data:
+            self._eof = True
+            return data
+        self._sha256.update(data)
+        self._gzip.write(data)
+        self._size += len(data)
+        if len(self._head) < 2048:
+            self._head += data[:2048 - len(self._head)]
+        return data
+
+    def close(self):
+        if self._gzip is None:
+            return
+        self.response.close()
+        self._gzip.close()
+        self._gzip = None
+        self.cache._count('bytes_fetched', self._size)
+        if self._eof and self.status == 200 and response_ok(self._head):
+            self.cache._commit(self.key, self._tmp_path, self._sha256.hexdigest(), self._size)
+        elif self._tmp_path.exists():
+            self._tmp_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ResponseCache:
+    """요청 키별 API 응답 디스크 캐시"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, offline: bool = False,
+                 recent_ttl: float = RECENT_TTL):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: data/molit_cache, MOLIT_CACHE_DIR 환경변수)
+            offline: 캐시만 사용 (없으면 CacheMiss)
+            recent_ttl: 최근 두 달 응답 유효 시간 (초)
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.offline = offline
+        self.recent_ttl = recent_ttl
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stored': 0,
+                      'bytes_saved': 0, 'bytes_fetched': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, lawd_cd: str, deal_ymd: str, page_no: int, num_of_rows: int) -> Dict:
+        """
+        요청 키 (엔드포인트는 URL의 마지막 경로 이름 - 호스트/포트가 바뀌어도 같은 키,
+        같은 페이지라도 numOfRows가 다르면 내용이 다름)
+        """
+        name = urllib.parse.urlparse(endpoint).path.rstrip('/').rsplit('/', 1)[-1]
+        return {'endpoint': name, 'lawd_cd': str(lawd_cd), 'deal_ymd': str(deal_ymd),
+                'page_no': int(page_no), 'num_of_rows': int(num_of_rows)}
+
+    @staticmethod
+    def _key_hash(key: Dict) -> str:
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _ref_path(self, key: Dict) -> Path:
+        return self.cache_dir / 'refs' / f"{self._key_hash(key)}.json"
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.cache_dir / 'objects' / sha256[:2] / f"{sha256}.xml.gz"
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def is_fresh(self, ref: Dict, now: Optional[float] = None) -> bool:
+        """마감된 달은 항상, 최근 두 달은 TTL 안에서만 유효"""
+        if months_ago(ref['key']['deal_ymd']) >= OPEN_MONTHS:
+            return True
+        return (now or time.time()) - ref['fetched_at'] < self.recent_ttl
+
+    def lookup(self, key: Dict) -> Optional[Dict]:
+        """참조 정보 - 만료 여부와 상관없이 본문이 있는 것 (없으면 None)"""
+        try:
+            with open(self._ref_path(key), 'r', encoding='utf-8') as f:
+                ref = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return ref if self._object_path(ref.get('sha256', '')).exists() else None
+
+    def open(self, key: Dict) -> Optional[CachedResponse]:
+        """
+        유효한 캐시 응답 스트림 (없거나 만료되면 None)
+
+        Raises:
+            CacheMiss: 오프라인 모드에서 캐시에 없음
+        """
+        ref = self.lookup(key)
+        if ref is not None and (self.offline or self.is_fresh(ref)):
+            try:
+                stream = gzip.open(self._object_path(ref['sha256']), 'rb')
+            except OSError:
+                stream = None
+            if stream is not None:
+                self._count('hits')
+                self._count('bytes_saved', ref['size'])
+                return CachedResponse(stream)
+
+        if ref is not None:
+            self._count('expired')
+        self._count('misses')
+        if self.offline:
+            raise CacheMiss(f"오프라인 모드: 캐시 없음 ({key['lawd_cd']} {key['deal_ymd']} "
+                            f"p{key['page_no']})")
+        return None
+
+    def get(self, key: Dict) -> Optional[bytes]:
+        """유효한 캐시 응답 본문 (open 참조)"""
+        response = self.open(key)
+        if response is None:
+            return None
+        with response:
+            return response.read()
+
+    def record(self, response, key: Dict) -> RecordingResponse:
+        """네트워크 응답을 읽는 대로 캐시에 기록하는 스트림으로 감싸기"""
+        return RecordingResponse(self, response, key)
+
+    def put(self, key: Dict, data: bytes) -> bool:
+        """정상 응답 저장 (오류 응답이면 저장하지 않고 False)"""
+        with self.record(CachedResponse(io.BytesIO(data)), key) as recording:
+            while recording.read(65536):
+                pass
+        return response_ok(data)
+
+    def _commit(self, key: Dict, tmp_path: Path, sha256: str, size: int):
+        """기록을 마친 임시 본문을 콘텐츠 주소로 옮기고 참조 등록"""
+        object_path = self._object_path(sha256)
+        if object_path.exists():
+            tmp_path.unlink()
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, object_path)
+
+        ref_path = self._ref_path(key)
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        ref = {'key': key, 'sha256': sha256, 'size': size, 'fetched_at': time.time()}
+        self._atomic_write(ref_path, json.dumps(ref, ensure_ascii=False).encode('utf-8'))
+        self._count('stored')
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def urlopen(self, request, key: Dict, timeout: float = 30):
+        """
+        urllib.request.urlopen 대용 - 캐시에 있으면 네트워크 없이 응답 스트림
+
+        Raises:
+            CacheMiss: 오프라인 모드에서 캐시에 없음
+        """
+        cached = self.open(key)
+        if cached is not None:
+            return cached
+        return self.record(urllib.request.urlopen(request, timeout=timeout), key)
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def report(self) -> str:
+        """이번 실행 캐시 통계 한 줄"""
+        s = self.stats
+        return (f"캐시 적중 {s['hits']}/{s['hits'] + s['misses']} ({self.hit_ratio():.0%}), "
+                f"만료 {s['expired']}, 저장 {s['stored']}, "
+                f"절약 {s['bytes_saved'] / 1024:.0f}KB / 수신 {s['bytes_fetched'] / 1024:.0f}KB")
+
+    def flush_stats(self) -> Dict:
+        """이번 실행 통계를 누적 통계(stats.json)에 더하고 카운터 초기화"""
+        path = self.cache_dir / 'stats.json'
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                total = json.load(f)
+        except (OSError, ValueError):
+            total = {}
+        with self._lock:
+            for name, value in self.stats.items():
+                total[name] = total.get(name, 0) + value
+                self.stats[name] = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(path, json.dumps(total, indent=2).encode('utf-8'))
+        return total
+
+    def refs(self):
+        """저장된 참조 정보 전체"""
+        for path in sorted((self.cache_dir / 'refs').glob('*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield path, json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def prune(self) -> Tuple[int, int]:
+        """참조되지 않는 본문 삭제 → (삭제 수, 삭제 바이트)"""
+        live = {ref['sha256'] for _, ref in self.refs()}
+        removed = freed = 0
+        # 중단된 실행이 남긴 임시 본문 (1시간 이상 지난 것)
+        for path in (self.cache_dir / 'objects').glob('incoming.*.tmp'):
+            if time.time() - path.stat().st_mtime > 3600:
+                freed += path.stat().st_size
+                path.unlink()
+        for path in (self.cache_dir / 'objects').glob('*/*.xml.gz'):
+            if path.name[:-len('.xml.gz')] not in live:
+                freed += path.stat().st_size
+                path.unlink()
+                removed += 1
+        return removed, freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실거래가 API 응답 캐시 관리')
+    parser.add_argument('command', choices=['stats', 'prune', 'clear'],
+                        help='stats: 상태, prune: 참조 없는 본문 삭제, clear: 항목 삭제')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR),
+                        help='캐시 디렉토리 (기본값: data/molit_cache)')
+    parser.add_argument('--recent', action='store_true', help='clear: 최근 두 달 항목만 삭제')
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.cache_dir)
+
+    if args.command == 'stats':
+        refs = [ref for _, ref in cache.refs()]
+        objects = list((cache.cache_dir / 'objects').glob('*/*.xml.gz'))
+        raw = sum(ref['size'] for ref in refs)
+        stored = sum(path.stat().st_size for path in objects)
+        closed = sum(1 for ref in refs if months_ago(ref['key']['deal_ymd']) >= OPEN_MONTHS)
+        print(f"📂 캐시: {cache.cache_dir}")
+        print(f"  요청 키 {len(refs)}개 (마감된 달 {closed}, 최근 두 달 {len(refs) - closed})")
+        print(f"  본문 {len(objects)}개: 응답 {raw / 1024:.0f}KB → 디스크 {stored / 1024:.0f}KB")
+        try:
+            with open(cache.cache_dir / 'stats.json', 'r', encoding='utf-8') as f:
+                total = json.load(f)
+        except (OSError, ValueError):
+            total = None
+        if total:
+            lookups = total.get('hits', 0) + total.get('misses', 0)
+            ratio = total.get('hits', 0) / lookups if lookups else 0.0
+            print(f"  누적 적중 {total.get('hits', 0)}/{lookups} ({ratio:.0%}), "
+                  f"절약 {total.get('bytes_saved', 0) / 1024 / 1024:.1f}MB")
+
+    elif args.command == 'prune':
+        removed, freed = cache.prune()
+        print(f"✓ 참조 없는 본문 {removed}개 삭제 ({freed / 1024:.0f}KB)")
+
+    elif args.command == 'clear':
+        removed = 0
+        for path, ref in cache.refs():
+            if args.recent and months_ago(ref['key']['deal_ymd']) >= OPEN_MONTHS:
+                continue
+            path.unlink()
+            removed += 1
+        pruned, freed = cache.prune()
+        print(f"✓ 요청 키 {removed}개, 본문 {pruned}개 삭제 ({freed / 1024:.0f}KB)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+단지별 실거래가 통계 (pandas 벡터 연산)
+
+거래 행 목록을 DataFrame 생성 한 번으로 컬럼 프레임으로 바꾸고 (행별 필드 조회 없음)
+컬럼 단위로 타입을 변환한 뒤, 단지 키별 groupby로 거래건수/최고가/최저가/평균가/분위수/
+평당가/최빈 건축년도를 한꺼번에 계산합니다. 최근 거래는 (단지, 계약일 역순) 정렬 한 번으로
+단지별 상위 N건을 고르고, 고른 행의 프레임 컬럼으로 거래내역 항목을 만듭니다.
+
+match_trade_with_apartments.calculate_statistics와 같은 필드를 돌려줍니다:
+    {단지 키: {'거래건수', '최고가', '최저가', '평균가', '거래내역', '건축년도',
+              '평균면적_㎡', '평균면적_평', '중위가', '하위25%가', '상위25%가', '평당가'}}
+
+사용 예:
+    frame = trade_frame(trades)                       # 단지명별
+    stats = apartment_statistics(frame)
+    frame = trade_frame(trades, keys=feature_ids)     # 임의 키별 (행마다 키 지정)
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# 평 환산 (1평 = 3.3058㎡)
+PYEONG_SQM = 3.3058
+
+# 거래내역에 담을 최근 거래 수
+RECENT_TRADES = 5
+
+# 프레임으로 읽는 거래 행 필드 (월별 거래 파일 필드명)
+RAW_FIELDS = ('아파트', '거래금액', '전용면적', '건축년도', '년', '월', '일', '층', '법정동', '지번')
+
+
+def _numeric(values: pd.Series, commas: bool = False) -> pd.Series:
+    """
+    값 컬럼 → 숫자 (정수/실수/숫자 문자열, 그 외는 NaN)
+
+    년/월/건축년도/거래금액처럼 같은 값이 반복되는 컬럼이라 서로 다른 값만 변환해서 펼칩니다.
+
+    Args:
+        commas: 쉼표가 있는 문자열('108,880')도 쉼표를 지우고 변환
+    """
+    codes, uniques = pd.factorize(values.to_numpy(), sort=False)
+    uniques = pd.Series(uniques, dtype=object)
+    numbers = pd.to_numeric(uniques, errors='coerce')
+    if commas:
+        failed = numbers.isna().to_numpy()
+        if failed.any():
+            text = uniques[failed].astype(str).str.replace(',', '', regex=False).str.strip()
+            numbers = numbers.astype(float)
+            numbers[failed] = pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+    # 값이 없는 행(-1)은 끝에 붙인 NaN
+    return pd.Series(np.append(numbers.to_numpy(dtype=float), np.nan)[codes])
+
+
+def _price_column(values: pd.Series) -> np.ndarray:
+    """거래금액 컬럼 → 만원 int64 (쉼표 문자열도 변환, 실패는 0)"""
+    return _numeric(values, commas=True).fillna(0).to_numpy(dtype=np.int64)
+
+
+def raw_frame(trades: Iterable[Dict]) -> pd.DataFrame:
+    """
+    거래 행 → RAW_FIELDS 원래 값 컬럼 (object, 없는 필드는 NaN)
+
+    행 딕셔너리 목록을 DataFrame 생성 한 번으로 컬럼으로 바꿉니다 (타입 추론 없이 원래 값 그대로).
+    """
+    if not isinstance(trades, list):
+        trades = list(trades)
+    return pd.DataFrame(trades, columns=list(RAW_FIELDS), dtype=object)
+
+
+def trade_frame(trades: Iterable[Dict],
+                keys: Optional[Sequence[Hashable]] = None) -> pd.DataFrame:
+    """
+    거래 행 → 타입이 지정된 컬럼 프레임
+
+    Args:
+        trades: 월별 거래 파일 형식의 행 (문자열 값인 예전 파일도 가능)
+        keys: 행별 단지 키 (None이면 단지명, 단지명이 빈 거래는 제외)
+
+    Columns:
+        단지(키), 단지번호(처음 나온 순서의 정수 키), 거래금액(int, 없으면 0),
+        전용면적(float, 없으면 NaN), 건축년도(int, 없으면 0), 계약일(YYYYMMDD int),
+        원본(원래 거래 행 번호), 원래 값 (거래금액_원본, 전용면적_원본, 건축년도_원본,
+        아파트, 년, 월, 일, 층, 법정동, 지번 - 거래내역 항목용)
+    """
+    raw = raw_frame(trades)
+    if keys is None:
+        # 단지명은 서로 다른 이름만 다듬음 (행마다 문자열 처리하지 않음)
+        codes, names = pd.factorize(raw['아파트'].to_numpy(), sort=False)
+        name_codes, uniques = pd.factorize(np.array([str(name or '').strip() for name in names], dtype=object))
+        codes = np.where(codes >= 0, name_codes[codes], -1) if len(names) else codes
+    else:
+        codes, uniques = pd.factorize(pd.Series(list(keys), dtype=object), sort=False)
+    # 빈 키는 제외 (번호는 처음 나온 순서라 정렬해도 순서 유지)
+    uniques = np.asarray(uniques, dtype=object)
+    empty = np.flatnonzero(uniques == '')
+    if len(empty):
+        codes = np.where(codes == empty[0], -1, codes - (codes > empty[0]))
+        uniques = np.delete(uniques, empty[0])
+
+    build_year = _numeric(raw['건축년도'])
+    build_year = build_year.where(build_year.mod(1) == 0)
+    contract_day = (_numeric(raw['년']).fillna(0) * 10000 + _numeric(raw['월']).fillna(0) * 100
+                    + _numeric(raw['일']).fillna(0))
+    typed = {
+        '단지번호': codes,
+        '거래금액': _price_column(raw['거래금액']),
+        '전용면적': _numeric(raw['전용면적']).astype(float).to_numpy(),
+        '건축년도': build_year.fillna(0).to_numpy(dtype=np.int64),
+        '계약일': contract_day.to_numpy(dtype=np.int64),
+        '원본': np.arange(len(raw), dtype=np.int64),
+    }
+
+    # 원래 값 컬럼 블록은 그대로 두고 타입 컬럼만 붙임 (새 프레임으로 합치면 object 컬럼 전체를 복사)
+    frame = raw.rename(columns={name: f"{name}_원본" for name in ('거래금액', '전용면적', '건축년도')},
+                       copy=False)
+    # 제외할 행(-1)은 끝에 붙인 None
+    frame.insert(0, '단지', np.append(uniques, None)[codes])
+    for name, values in typed.items():
+        frame[name] = values
+    keep = codes >= 0
+    if not keep.all():
+        frame = frame[keep].reset_index(drop=True)
+    return frame
+
+
+def _mode_build_year(codes: np.ndarray, years: np.ndarray) -> pd.Series:
+    """단지번호별 최빈 건축년도 (동률이면 먼저 나온 값)"""
+    known = years > 0
+    if not known.any():
+        return pd.Series(dtype=float)
+    span = int(years.max()) + 1
+    pairs = codes[known].astype(np.int64) * span + years[known]
+    uniques, first, count = np.unique(pairs, return_index=True, return_counts=True)
+    pair_codes = uniques // span
+    order = np.lexsort((first, -count, pair_codes))
+    pair_codes, uniques = pair_codes[order], uniques[order]
+    top = np.r_[True, pair_codes[1:] != pair_codes[:-1]]
+    return pd.Series(uniques[top] % span, index=pair_codes[top])
+
+
+def recent_rows(frame: pd.DataFrame, n: int = RECENT_TRADES) -> pd.DataFrame:
+    """
+    단지별 최근 거래 n건 (계약일 내림차순, 같은 날은 먼저 나온 거래)
+
+    groupby().nlargest()는 단지마다 따로 정렬하므로, 전체를 (단지번호, 계약일 역순)
+    정수 키 하나로 한 번 안정 정렬하고 단지 안 순번이 n보다 작은 행만 남깁니다
+    (trade_frame의 행은 원본 순서라 같은 날은 먼저 나온 거래가 앞).
+    """
+    codes = frame['단지번호'].to_numpy()
+    days = frame['계약일'].to_numpy()
+    if not len(days):
+        return frame
+    newest = days.max()
+    sort_key = codes.astype(np.int64) * (newest - days.min() + 1) + (newest - days)
+    order = np.argsort(sort_key, kind='stable')
+    sorted_codes = codes[order]
+    group_start = np.searchsorted(sorted_codes, sorted_codes, side='left')
+    rank = np.arange(len(order)) - group_start
+    return frame.iloc[order[rank < n]]
+
+
+def recent_records(frame: pd.DataFrame, n: int = RECENT_TRADES) -> Dict[int, List[Dict]]:
+    """
+    단지번호별 최근 거래 n건의 거래내역 항목
+
+    고른 행의 프레임 컬럼을 필드별 목록으로 꺼내 항목을 만듭니다 (원래 거래 행은 다시 읽지 않음).
+    없는 필드의 원래 값은 빈 문자열입니다.
+    """
+    latest = recent_rows(frame, n)
+    if latest.empty:
+        return {}
+
+    def original(column):
+        # NaN은 필드가 없던 행 (NaN != NaN)
+        return [value if value == value else '' for value in latest[column].tolist()]
+
+    # 계약일 문자열은 서로 다른 날짜마다 한 번만
+    days, day_index = np.unique(latest['계약일'].to_numpy(), return_inverse=True)
+    day_labels = np.array([f"{day // 10000 or ''}-{day // 100 % 100:02d}-{day % 100:02d}"
+                           for day in days.tolist()], dtype=object)
+
+    areas = latest['전용면적']
+    fields = {
+        '거래금액': latest['거래금액'].tolist(),
+        '거래금액_원본': original('거래금액_원본'),
+        '거래일': day_labels[day_index].tolist(),
+        '전용면적': _optional(areas),
+        '전용면적_원본': original('전용면적_원본'),
+        '층': original('층'),
+        '법정동': original('법정동'),
+        '지번': original('지번'),
+        '건축년도': original('건축년도_원본'),
+    }
+    names = list(fields)
+    records = [dict(zip(names, values)) for values in zip(*fields.values())]
+
+    # recent_rows는 단지번호 순이라 단지별 항목은 연속 구간
+    codes = latest['단지번호'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+    return {int(codes[start]): records[start:end] for start, end in zip(starts.tolist(), ends.tolist())}
+
+
+def _optional(values: pd.Series, dtype=None) -> List:
+    """컬럼 → 값 목록 (NaN은 None, dtype이 주어지면 그 타입의 파이썬 값)"""
+    present = values.notna()
+    if dtype is not None:
+        values = values.where(present, 0).astype(dtype)
+    return values.astype(object).where(present, None).tolist()
+
+
+def apartment_statistics(frame: pd.DataFrame, recent: int = RECENT_TRADES) -> Dict[Hashable, Dict]:
+    """
+    단지별 거래 통계
+
+    집계는 단지번호(정수) 배열에 대한 Series groupby로 하고, DataFrame 필터링은
+    하지 않습니다 (열이 많은 프레임을 조건마다 복사하는 비용이 집계보다 큼).
+    결과 딕셔너리도 집계 컬럼을 필드별 목록으로 꺼내 한 번에 묶습니다.
+
+    Args:
+        frame: trade_frame 결과
+        recent: 거래내역에 담을 최근 거래 수
+    """
+    if frame.empty:
+        return {}
+    codes = frame['단지번호'].to_numpy()
+    prices = frame['거래금액'].to_numpy()
+    areas = frame['전용면적'].to_numpy()
+
+    priced = prices > 0
+    if not priced.any():
+        return {}
+    sized = areas > 0
+    both = priced & sized
+
+    price = pd.Series(prices[priced]).groupby(codes[priced])
+    # 평당가: 면적이 있는 거래별 만원/평의 중앙값
+    per_pyeong = pd.Series(prices[both] / (areas[both] / PYEONG_SQM)).groupby(codes[both])
+    # 단지번호 → 단지 키 (같은 번호의 행은 키가 같음)
+    keys = np.empty(codes.max() + 1, dtype=object)
+    keys[codes] = frame['단지'].to_numpy()
+
+    table = pd.DataFrame(index=pd.RangeIndex(len(keys)), data={
+        'key': keys,
+        'count': np.bincount(codes),
+        'max': price.max(),
+        'min': price.min(),
+        'sum': price.sum(),
+        'n': price.size(),
+        'p25': price.quantile(0.25),
+        'p50': price.median(),
+        'p75': price.quantile(0.75),
+        'area': pd.Series(areas[sized]).groupby(codes[sized]).mean(),
+        'pyeong': per_pyeong.median(),
+        'year': _mode_build_year(codes, frame['건축년도'].to_numpy()),
+    })
+    # 가격 있는 단지만 (단지번호 순 = 처음 나온 거래 순)
+    table = table[table['n'].notna()]
+
+    recent_by_code = recent_records(frame, recent)
+
+    area = table['area'].where(table['area'] > 0)
+    columns = {
+        '거래건수': table['count'].astype(np.int64).tolist(),
+        '최고가': table['max'].astype(np.int64).tolist(),
+        '최저가': table['min'].astype(np.int64).tolist(),
+        '평균가': (table['sum'].astype(np.int64) // table['n'].astype(np.int64)).tolist(),
+        '거래내역': [recent_by_code.get(code, []) for code in table.index.tolist()],
+        '건축년도': _optional(table['year'], np.int64),
+        '평균면적_㎡': _optional(table['area']),
+        '평균면적_평': _optional(area / PYEONG_SQM),
+        '중위가': table['p50'].astype(np.int64).tolist(),
+        '하위25%가': table['p25'].astype(np.int64).tolist(),
+        '상위25%가': table['p75'].astype(np.int64).tolist(),
+        '평당가': _optional(table['pyeong'], np.int64),
+    }
+    names = list(columns)
+    return {key: dict(zip(names, values))
+            for key, *values in zip(table['key'].tolist(), *columns.values())}
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+아파트 매매 실거래가 로컬 저장소 (SQLite, 지역 × 월 파티션)
+
+월별 거래 파일(apt_trade_<LAWD_CD>_<YYYYMM>.json)을 한 데이터베이스에 모아 두고
+지역/기간 범위 질의에 필요한 파티션만 읽습니다.
+
+- 거래 테이블의 기본 키가 (지역코드, 계약년월, 거래 키)인 WITHOUT ROWID 테이블이라
+  같은 지역/월의 거래가 디스크에 모여 있고, "서초구 2023-01 ~ 2024-10" 같은 질의는
+  기본 키 범위 검색으로 끝납니다.
+- 거래 키는 거래를 식별하는 필드(단지명, 법정동, 지번, 전용면적, 층, 계약일, 거래금액)의
+  해시입니다. 같은 달을 다시 넣어도 중복되지 않습니다. 필드가 모두 같은 거래가 한 달에
+  여러 건이면 파일 안의 순번을 키에 넣어 따로 저장합니다.
+- 나중에 받은 자료의 해제사유발생일을 기존 거래에 반영합니다 (새로 생기거나 바뀌거나
+  지워진 경우 모두). 질의는 기본적으로 해제된 거래를 뺍니다.
+
+사용법:
+    # 월별 거래 파일 적재 (molit_trade_api.py --store로 수집하면서 바로 적재 가능)
+    python scripts/trade_store.py ingest data/apt_trade_11650_*.json
+
+    # 범위 질의 / 파티션 현황
+    python scripts/trade_store.py query --region 11650 --start 202301 --end 202410
+    python scripts/trade_store.py stats
+
+    # 코드에서
+    store = TradeStore()
+    for trade in store.query(['11650'], '202301', '202410'):
+        ...
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DATA_DIR
+from trade_stream import FIELD_TYPES
+
+DEFAULT_STORE_PATH = DATA_DIR / 'apt_trades.sqlite'
+
+SCHEMA_VERSION = 2
+
+# (거래 행 키, 컬럼) - 행 키는 월별 거래 파일(trade_stream.TRADE_FIELDS)과 같음
+COLUMNS = (
+    ('아파트', 'apt_nm'),
+    ('법정동', 'umd_nm'),
+    ('거래금액', 'deal_amount'),
+    ('건축년도', 'build_year'),
+    ('년', 'deal_year'),
+    ('월', 'deal_month'),
+    ('일', 'deal_day'),
+    ('전용면적', 'area'),
+    ('지번', 'jibun'),
+    ('지역코드', 'lawd_cd'),
+    ('층', 'floor'),
+    ('도로명', 'road_nm'),
+    ('해제사유발생일', 'cancel_date'),
+    ('법정동읍면동코드', 'umd_cd'),
+    ('법정동본번코드', 'bonbun'),
+    ('법정동부번코드', 'bubun'),
+)
+
+# 버전 2에서 추가된 컬럼 (예전 저장소는 열 때 추가)
+_ADDED_COLUMNS = {2: ('umd_cd', 'bonbun', 'bubun')}
+
+# 거래 식별 필드 (해제사유발생일처럼 나중에 바뀌는 필드는 제외)
+KEY_FIELDS = ('지역코드', '법정동', '지번', '아파트', '전용면적', '층', '년', '월', '일', '거래금액')
+
+_TRADE_FILE = re.compile(r'apt_trade_(?:(\d{5})_)?(\d{6})\.json$')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS trades (
+    lawd_cd TEXT NOT NULL,
+    deal_ym INTEGER NOT NULL,
+    trade_key TEXT NOT NULL,
+    apt_nm TEXT,
+    umd_nm TEXT,
+    jibun TEXT,
+    deal_amount INTEGER,
+    build_year INTEGER,
+    deal_year INTEGER,
+    deal_month INTEGER,
+    deal_day INTEGER,
+    area REAL,
+    floor INTEGER,
+    road_nm TEXT,
+    cancel_date TEXT,
+    umd_cd TEXT,
+    bonbun TEXT,
+    bubun TEXT,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ym, trade_key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS partitions (
+    lawd_cd TEXT NOT NULL,
+    deal_ym INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    cancelled INTEGER NOT NULL,
+    source TEXT,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (lawd_cd, deal_ym)
+) WITHOUT ROWID;
+'''
+
+# 값 순서: 지역코드, 계약년월, 거래 키, COLUMNS(지역코드 제외) 순서, 처음 본 시각, 갱신 시각
+_VALUE_COLUMNS = tuple(column for _, column in COLUMNS if column != 'lawd_cd')
+
+_UPSERT = f'''
+INSERT INTO trades (lawd_cd, deal_ym, trade_key, {', '.join(_VALUE_COLUMNS)}, first_seen, updated_at)
+VALUES ({', '.join('?' * (len(_VALUE_COLUMNS) + 5))})
+ON CONFLICT (lawd_cd, deal_ym, trade_key) DO UPDATE SET
+    cancel_date = excluded.cancel_date,
+    road_nm = COALESCE(excluded.road_nm, trades.road_nm),
+    build_year = COALESCE(excluded.build_year, trades.build_year),
+    umd_cd = COALESCE(trades.umd_cd, excluded.umd_cd),
+    bonbun = COALESCE(trades.bonbun, excluded.bonbun),
+    bubun = COALESCE(trades.bubun, excluded.bubun),
+    updated_at = excluded.updated_at
+WHERE excluded.cancel_date IS NOT trades.cancel_date
+   OR (trades.umd_cd IS NULL AND excluded.umd_cd IS NOT NULL)
+'''
+
+
+def _typed(key: str, value):
+    """예전 문자열 파일 값도 수집기 파일과 같은 타입으로"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        convert = FIELD_TYPES.get(key)
+        return convert(value) if convert else value
+    return value
+
+
+def _ym(value: str) -> int:
+    return int(str(value).replace('-', '')[:6])
+
+
+def trade_key(row: Dict, occurrence: int) -> str:
+    """거래 식별 해시 (같은 필드의 거래가 여러 건이면 occurrence로 구분)"""
+    parts = [str(row.get(field)) for field in KEY_FIELDS]
+    parts.append(str(occurrence))
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:20]
+
+
+class TradeStore:
+    """지역 × 월 파티션 실거래가 저장소"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or DEFAULT_STORE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """예전 버전 저장소에 추가된 컬럼 생성 (기존 거래의 값은 다시 적재할 때 채워짐)"""
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(trades)')}
+        with self.conn:
+            for added_in, columns in sorted(_ADDED_COLUMNS.items()):
+                if version < added_in:
+                    for column in columns:
+                        if column not in existing:
+                            self.conn.execute(f'ALTER TABLE trades ADD COLUMN {column} TEXT')
+            self.conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def ingest(self, rows: Iterable[Dict], lawd_cd: Optional[str] = None,
+               deal_ym: Optional[str] = None, source: Optional[str] = None) -> Dict[str, int]:
+        """
+        거래 행 적재 (한 트랜잭션)
+
+        Args:
+            rows: 월별 거래 파일 형식의 행 (문자열 값인 예전 파일도 가능)
+            lawd_cd: 행에 지역코드가 없을 때 쓸 지역코드
+            deal_ym: 입력이 한 달치일 때 그 계약년월 (거래가 0건이어도 파티션을 적재됨으로 기록)
+            source: 파티션 기록용 출처 (파일명 등)
+
+        Returns:
+            {'rows': 입력 행, 'inserted': 새 거래, 'cancelled': 새로 해제된 거래,
+             'restored': 해제일이 지워진 거래, 'skipped': 계약년월 없음}
+            (해제/해제 취소 수는 파티션별 해제 수 증감으로 셈)
+        """
+        now = time.time()
+        occurrences: Counter = Counter()
+        partitions = set()
+        if lawd_cd and deal_ym:
+            partitions.add((str(lawd_cd), _ym(deal_ym)))
+        counts = {'rows': 0, 'inserted': 0, 'cancelled': 0, 'restored': 0, 'skipped': 0}
+        batch = []
+
+        with self.conn:
+            for raw in rows:
+                counts['rows'] += 1
+                row = {key: _typed(key, raw.get(key)) for key, _ in COLUMNS}
+                if not row['지역코드']:
+                    row['지역코드'] = lawd_cd
+                if not (row['지역코드'] and row['년'] and row['월']):
+                    counts['skipped'] += 1
+                    continue
+
+                ident = tuple(row.get(field) for field in KEY_FIELDS)
+                occurrences[ident] += 1
+                row_ym = row['년'] * 100 + row['월']
+                partitions.add((row['지역코드'], row_ym))
+                batch.append((row['지역코드'], row_ym, trade_key(row, occurrences[ident]))
+                             + tuple(row[key] for key, column in COLUMNS if column in _VALUE_COLUMNS)
+                             + (now, now))
+
+            # 새 거래/해제 수 = 적재한 파티션의 거래 수/해제 수 증가분
+            before = self._partition_counts(partitions)
+            if batch:
+                self.conn.executemany(_UPSERT, batch)
+            after = self._partition_counts(partitions)
+            counts['inserted'] = sum(after[part][0] - before[part][0] for part in partitions)
+            changes = [after[part][1] - before[part][1] for part in partitions]
+            counts['cancelled'] = sum(change for change in changes if change > 0)
+            counts['restored'] = -sum(change for change in changes if change < 0)
+
+            # 적재 시각은 파티션이 실제로 바뀐 경우에만 갱신 (같은 파일을 다시 적재해도 큐브를 다시 집계하지 않도록)
+            recorded = self._recorded_partitions(partitions)
+            for part, (total, cancelled) in after.items():
+                if part in recorded and after[part] == before[part] and not self._updated_rows(part, now):
+                    continue
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?, ?)',
+                    part + (total, cancelled, source, now))
+        return counts
+
+    def _recorded_partitions(self, partitions) -> set:
+        """partitions 중 이미 기록된 파티션"""
+        return {part for part in partitions if self.conn.execute(
+            'SELECT 1 FROM partitions WHERE lawd_cd = ? AND deal_ym = ?', part).fetchone()}
+
+    def _updated_rows(self, part: Tuple[str, int], now: float) -> int:
+        """이번 적재에서 추가/갱신된 거래 수 (upsert는 바뀐 거래만 updated_at을 갱신)"""
+        return self.conn.execute(
+            'SELECT COUNT(*) FROM trades WHERE lawd_cd = ? AND deal_ym = ? AND updated_at = ?',
+            part + (now,)).fetchone()[0]
+
+    def _partition_counts(self, partitions) -> Dict[Tuple[str, int], Tuple[int, int]]:
+        """파티션별 (거래 수, 해제 수)"""
+        return {part: self.conn.execute(
+            'SELECT COUNT(*), COUNT(cancel_date) FROM trades WHERE lawd_cd = ? AND deal_ym = ?',
+            part).fetchone() for part in partitions}
+
+    def ingest_file(self, path: Path) -> Dict[str, int]:
+        """월별 거래 파일 적재 (파일명의 지역코드를 기본값으로 사용)"""
+        path = Path(path)
+        match = _TRADE_FILE.search(path.name)
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        return self.ingest(rows, lawd_cd=match.group(1) if match else None,
+                           deal_ym=match.group(2) if match else None, source=path.name)
+
+    def query(self, lawd_cds: Optional[Sequence[str]] = None, start: Optional[str] = None,
+              end: Optional[str] = None, include_cancelled: bool = False,
+              apt_name: Optional[str] = None) -> Iterator[Dict]:
+        """
+        지역/기간 범위 거래 (월별 거래 파일과 같은 형식의 행)
+
+        Args:
+            lawd_cds: 지역코드 목록 (None이면 전체)
+            start, end: 계약년월 범위 YYYYMM (양끝 포함, None이면 제한 없음)
+            include_cancelled: 해제된 거래 포함 여부
+            apt_name: 단지명 일치 조건
+        """
+        where, params = [], []
+        if lawd_cds:
+            where.append(f"lawd_cd IN ({','.join('?' * len(lawd_cds))})")
+            params.extend(str(code) for code in lawd_cds)
+        if start:
+            where.append('deal_ym >= ?')
+            params.append(_ym(start))
+        if end:
+            where.append('deal_ym <= ?')
+            params.append(_ym(end))
+        if not include_cancelled:
+            where.append('cancel_date IS NULL')
+        if apt_name:
+            where.append('apt_nm = ?')
+            params.append(apt_name)
+
+        columns = ', '.join(column for _, column in COLUMNS)
+        sql = f"SELECT {columns} FROM trades"
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY lawd_cd, deal_ym, deal_day, trade_key'
+
+        keys = [key for key, _ in COLUMNS]
+        for values in self.conn.execute(sql, params):
+            row = dict(zip(keys, values))
+            row['해제사유발생일'] = row['해제사유발생일'] or ''
+            yield row
+
+    def partitions(self, lawd_cd: Optional[str] = None) -> List[Tuple]:
+        """(지역코드, 계약년월, 거래 수, 해제 수, 출처, 적재 시각) 목록"""
+        sql = 'SELECT * FROM partitions'
+        params: Tuple = ()
+        if lawd_cd:
+            sql += ' WHERE lawd_cd = ?'
+            params = (lawd_cd,)
+        return self.conn.execute(sql + ' ORDER BY lawd_cd, deal_ym', params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='아파트 실거래가 로컬 저장소 (지역 × 월 파티션)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예시:
+  %(prog)s ingest data/apt_trade_11650_*.json
+  %(prog)s query --region 11650 --start 202301 --end 202410
+  %(prog)s stats
+        '''
+    )
+    parser.add_argument('--db', default=str(DEFAULT_STORE_PATH),
+                        help='저장소 경로 (기본값: data/apt_trades.sqlite)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = sub.add_parser('ingest', help='월별 거래 파일 적재')
+    ingest_parser.add_argument('files', nargs='+', help='apt_trade_<LAWD_CD>_<YYYYMM>.json 파일')
+
+    query_parser = sub.add_parser('query', help='지역/기간 범위 질의')
+    query_parser.add_argument('--region', '-r', action='append', help='지역코드 (여러 번 지정 가능)')
+    query_parser.add_argument('--start', help='시작 계약년월 (YYYYMM)')
+    query_parser.add_argument('--end', help='끝 계약년월 (YYYYMM)')
+    query_parser.add_argument('--apt', help='단지명')
+    query_parser.add_argument('--include-cancelled', action='store_true', help='해제된 거래 포함')
+    query_parser.add_argument('--output', '-o', help='결과 JSON 파일 (없으면 요약만 출력)')
+
+    stats_parser = sub.add_parser('stats', help='파티션 현황')
+    stats_parser.add_argument('--region', '-r', help='지역코드')
+
+    args = parser.parse_args()
+
+    with TradeStore(args.db) as store:
+        if args.command == 'ingest':
+            total = Counter()
+            start_time = time.time()
+            for path in args.files:
+                counts = store.ingest_file(path)
+                total.update(counts)
+                print(f"  ✓ {Path(path).name}: {counts['rows']}건 (신규 {counts['inserted']}, "
+                      f"해제 반영 {counts['cancelled']}, 해제 취소 {counts['restored']})")
+            print(f"\n✅ 적재 완료: {len(args.files)}개 파일, {total['rows']:,}건 → 신규 {total['inserted']:,}건, "
+                  f"해제 반영 {total['cancelled']}건 ({time.time() - start_time:.1f}초)")
+            if total['skipped']:
+                print(f"⚠ 계약년월/지역코드 없는 행 {total['skipped']}건 건너뜀")
+
+        elif args.command == 'query':
+            start_time = time.time()
+            trades = list(store.query(args.region, args.start, args.end,
+                                      include_cancelled=args.include_cancelled, apt_name=args.apt))
+            elapsed = time.time() - start_time
+            print(f"📊 {len(trades):,}건 ({elapsed * 1000:.0f}ms)")
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(trades, f, ensure_ascii=False, indent=2)
+                print(f"💾 저장: {args.output}")
+            else:
+                by_apt = Counter(trade['아파트'] for trade in trades)
+                for name, count in by_apt.most_common(10):
+                    print(f"  {name}: {count}건")
+
+        elif args.command == 'stats':
+            rows = store.partitions(args.region)
+            print(f"📂 저장소: {store.path} ({store.path.stat().st_size / 1024:.0f}KB)")
+            for lawd_cd, deal_ym, count, cancelled, source, ingested_at in rows:
+                loaded = time.strftime('%Y-%m-%d %H:%M', time.localtime(ingested_at))
+                print(f"  {lawd_cd} {deal_ym}: {count:,}건 (해제 {cancelled}) - {source or '-'}, {loaded}")
+            print(f"  파티션 {len(rows)}개, 거래 {sum(row[2] for row in rows):,}건")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+실거래가 API 응답 스트리밍 파싱 / 월별 거래 파일 기록
+
+응답을 통째로 읽지 않고 iterparse로 읽으면서 <item>이 끝날 때마다 타입이 지정된
+거래 행을 만들고 요소를 바로 비웁니다. 행은 곧바로 월별 파일에 기록하므로
+페이지당 결과 수와 상관없이 메모리 사용량이 일정합니다.
+
+월별 파일은 한 줄에 거래 한 건인 JSON 배열입니다 (json.load로 그대로 읽을 수 있음):
+    [
+    {"아파트":"래미안퍼스티지","법정동":"반포동","거래금액":285000,...},
+    ...
+    ]
+
+사용 예:
+    with urllib.request.urlopen(url) as response, TradeFileWriter(path) as writer:
+        parser = TradeStreamParser(response)
+        for trade in parser:
+            writer.write(trade)
+    print(parser.total_count, parser.rows)
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+# 정상 응답 코드 (API 버전에 따라 '00' 또는 '000')
+SUCCESS_CODES = ('00', '000')
+# 데이터 없음 (빈 결과로 처리)
+NO_DATA_CODES = ('03',)
+# 재시도할 오류 코드: 01 어플리케이션 에러, 04 HTTP 에러, 05 서비스 연결 실패, 22 호출 한도 초과
+RETRYABLE_CODES = ('01', '04', '05', '22')
+
+# 거래 행 필드 (출력 키, XML 태그) - fetch_apt_trade_api.py의 JSON과 같은 키
+TRADE_FIELDS = (
+    ('아파트', 'aptNm'),
+    ('법정동', 'umdNm'),
+    ('거래금액', 'dealAmount'),
+    ('건축년도', 'buildYear'),
+    ('년', 'dealYear'),
+    ('월', 'dealMonth'),
+    ('일', 'dealDay'),
+    ('전용면적', 'excluUseAr'),
+    ('지번', 'jibun'),
+    ('지역코드', 'sggCd'),
+    ('층', 'floor'),
+    ('도로명', 'roadNm'),
+    ('해제사유발생일', 'cdealDay'),
+    # 단지 매칭용 필지 키 (지역코드 + 법정동읍면동코드 = 10자리 법정동코드)
+    ('법정동읍면동코드', 'umdCd'),
+    ('법정동본번코드', 'bonbun'),
+    ('법정동부번코드', 'bubun'),
+)
+
+# 응답 읽기 단위
+READ_SIZE = 64 * 1024
+
+
+def parse_amount(text: str) -> Optional[int]:
+    """거래금액 '108,880' → 108880 (만원)"""
+    text = text.replace(',', '').strip()
+    return int(text) if text.isdigit() else None
+
+
+def parse_int(text: str) -> Optional[int]:
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def parse_float(text: str) -> Optional[float]:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+# 숫자 필드 변환 (나머지는 문자열, 빈 값은 None)
+FIELD_TYPES: Dict[str, Callable[[str], object]] = {
+    '거래금액': parse_amount,
+    '건축년도': parse_int,
+    '년': parse_int,
+    '월': parse_int,
+    '일': parse_int,
+    '전용면적': parse_float,
+    '층': parse_int,
+}
+
+
+class ApiError(Exception):
+    """API 호출 실패 (retryable이면 재시도 대상)"""
+
+    def __init__(self, message: str, code: Optional[str] = None, retryable: bool = False):
+        super().__init__(message)
+        self.code = code
+        self.retryable = retryable
+
+
+def parse_trade_item(item: ET.Element,
+                     fields: Sequence[Tuple[str, str]] = TRADE_FIELDS) -> Dict[str, object]:
+    """<item> 요소 → 타입이 지정된 거래 행"""
+    row = {}
+    for key, tag in fields:
+        text = (item.findtext(tag) or '').strip()
+        convert = FIELD_TYPES.get(key)
+        row[key] = (convert(text) if text else None) if convert else text
+    return row
+
+
+class _CountingReader:
+    """읽은 바이트 수 집계"""
+
+    def __init__(self, source: BinaryIO):
+        self.source = source
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class TradeStreamParser:
+    """
+    응답 스트림 → 거래 행 반복자
+
+    반복이 끝나면 result_code, total_count, rows, bytes_read가 채워집니다.
+    오류 응답이면 반복 중 ApiError가 발생합니다 (헤더가 <items>보다 앞에 오므로 행을 내기 전).
+    """
+
+    def __init__(self, source: BinaryIO, fields: Sequence[Tuple[str, str]] = TRADE_FIELDS):
+        self._reader = _CountingReader(source)
+        self.fields = fields
+        self.result_code: Optional[str] = None
+        self.total_count = 0
+        self.rows = 0
+
+    @property
+    def bytes_read(self) -> int:
+        return self._reader.bytes_read
+
+    def _check_code(self, code: str, message: str):
+        self.result_code = code
+        if code not in SUCCESS_CODES and code not in NO_DATA_CODES:
+            raise ApiError(f"API 오류 {code}: {message}", code=code, retryable=code in RETRYABLE_CODES)
+
+    def __iter__(self) -> Iterator[Dict[str, object]]:
+        items = None
+        message = ''
+        try:
+            for event, elem in ET.iterparse(self._reader, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    if tag == 'items':
+                        items = elem
+                    continue
+
+                if tag == 'item':
+                    yield parse_trade_item(elem, self.fields)
+                    self.rows += 1
+                    # 끝난 <item>을 부모에서 떼어 내 메모리를 일정하게 유지
+                    if items is not None:
+                        items.clear()
+                    else:
+                        elem.clear()
+                elif tag in ('resultMsg', 'returnAuthMsg'):
+                    message = (elem.text or '').strip()
+                elif tag == 'totalCount':
+                    self.total_count = parse_int((elem.text or '').strip()) or 0
+                elif tag == 'header':
+                    self._check_code((elem.findtext('resultCode') or '').strip(), message)
+                elif tag == 'cmmMsgHeader':
+                    # 공공데이터포털 게이트웨이 오류 형식
+                    self._check_code((elem.findtext('returnReasonCode') or '').strip(),
+                                     (elem.findtext('returnAuthMsg') or '').strip())
+        except ET.ParseError as e:
+            # 게이트웨이가 HTML 오류 페이지를 돌려주거나 전송이 끊긴 경우
+            raise ApiError(f"응답 XML 파싱 실패: {e}", retryable=True)
+
+        if self.result_code is None:
+            raise ApiError("응답에 결과 코드가 없습니다", retryable=True)
+        if self.result_code in NO_DATA_CODES:
+            self.total_count = 0
+
+
+class TradeFileWriter:
+    """
+    거래 행을 JSON 배열 파일로 바로 기록 (임시 파일에 쓰고 close 때 교체)
+
+    with 블록이 예외로 끝나면 임시 파일을 지우고 기존 파일은 그대로 둡니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self._file.write('[')
+
+    def write(self, row: Dict):
+        self._file.write(',\n' if self.rows else '\n')
+        self._file.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+        self.rows += 1
+
+    def write_lines(self, path: Path):
+        """write_jsonl로 기록한 파일의 행을 순서대로 이어 붙임"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if line:
+                    self._file.write(',\n' if self.rows else '\n')
+                    self._file.write(line)
+                    self.rows += 1
+
+    def close(self):
+        self._file.write('\n]\n' if self.rows else ']\n')
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_jsonl(parser: TradeStreamParser, path: Path) -> int:
+    """파서의 행을 한 줄에 하나씩 기록 (페이지별 임시 파일용) → 행 수"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in parser:
+            f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+            count += 1
+    return count
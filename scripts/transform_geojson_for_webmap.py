@@ -2,48 +2,118 @@
 # -*- coding: utf-8 -*-
 """
 GeoJSON 데이터를 웹맵 형식으로 변환
+
+출력 GeoJSON에는 지오메트리, Feature id, 지도 필터에 쓰는 속성(FILTER_KEYS)만 남기고
+전체 속성(주소, 최근 거래 내역 등)은 attrs/<레이어>/<시작 id>.json 샤드로 분리합니다.
+팝업은 클릭한 아파트의 속성을 다음 URL에서 가져옵니다:
+    data.attributes.shards[Math.floor(feature.id / data.attributes.shard_size)][feature.id]
+
+필터 색인(webmap_filters.py)은 filters/<레이어>.json에 따로 두고 페이로드의 "filters"
+멤버로 연결합니다: 평균가/평당가/거래건수는 값 순 정렬 id와 오프셋 표, 법정동은 비트셋입니다.
+페이지는 슬라이더 범위를 이진 탐색으로 찾고 후보 피처만 확인합니다.
+
+거래 저장소가 있으면 가격 큐브(price_cube.py)에서 단지 필지의 최근 6개월 면적대별
+거래 수/중위가/평균가/평당가를 recent_prices 속성으로 붙입니다 (거래를 다시 읽지 않음).
 """
 
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bjd_codes import BjdCodeTable
+from price_cube import PriceCube, lot_id, months_back
+from trade_complex_join import parse_lot_address
+from trade_store import DEFAULT_STORE_PATH, TradeStore
+from webmap_assets import update_manifest
+from webmap_chunks import write_geometry_layer
+from webmap_filters import FILTER_DIR, write_filter_index
+
+# 지오메트리 페이로드에 남기는 속성 (웹맵 필터/마커 스타일에 필요한 것만)
+FILTER_KEYS = ('apt_nm', 'dong', 'avg_price', 'price_per_pyeong', 'transaction_count')
+
+# 필터 색인 범위 속성: (슬라이더 단위, 값이 없으면 0으로 볼지) - 웹맵 applyFilters와 같은 기준
+FILTER_RANGES = {
+    'avg_price': (1, False),
+    'price_per_pyeong': (10000, False),     # 원/평 → 만원/평
+    'transaction_count': (1, True),
+}
+
+# 필터 색인 값 속성 (비트셋)
+FILTER_SETS = ('dong',)
+
+# recent_prices 기간 (큐브의 마지막 달까지 최근 N개월)
+RECENT_MONTHS = 6
+
+
+def feature_lot(props):
+    """단지 속성 → 큐브 필지 문자열 (bjd_cd, 지번주소로 만들 수 없으면 None)"""
+    bjd_cd = str(props.get('bjd_cd') or '').strip()
+    lot = parse_lot_address(props.get('lnmadr'))
+    if len(bjd_cd) != 10 or lot is None:
+        return None
+    return lot_id(bjd_cd, lot[1], lot[2])
 
-def transform_geojson():
+
+def load_recent_prices(lots, store_path=DEFAULT_STORE_PATH, months=RECENT_MONTHS):
+    """
+    가격 큐브에서 필지별 최근 months개월 면적대별 가격
+
+    Returns:
+        (기간 라벨, {필지: {면적대: {'count', 'median', 'avg', 'price_per_pyeong'}}})
+        저장소가 없거나 비어 있으면 (None, {})
+    """
+    if not Path(store_path).exists():
+        return None, {}
+
+    with TradeStore(store_path) as store:
+        cube = PriceCube(store)
+        cube.refresh()
+        end = cube.latest_month()
+        if not end:
+            return None, {}
+        start = months_back(end, months - 1)
+        cells = cube.window(start, end, lots=lots, by=('lot', 'band'))
+
+    recent = {}
+    for (lot, band), stats in cells.items():
+        recent.setdefault(lot, {})[band] = {
+            'count': stats['count'],
+            'median': int(stats['median']),
+            'avg': int(stats['avg']),
+            'price_per_pyeong': int(stats['price_per_pyeong']),
+        }
+    period = f"{start[:4]}-{start[4:]}~{end[:4]}-{end[4:]}"
+    return period, recent
+
+
+def transform_geojson(store_path=DEFAULT_STORE_PATH):
     """웹맵에 맞는 형식으로 GeoJSON 변환"""
     input_file = '/mnt/c/Users/ksj27/PROJECTS/QGIS/output/webmap/apartments_with_real_prices.geojson'
     output_file = '/mnt/c/Users/ksj27/PROJECTS/QGIS/output/webmap/apartments_with_prices.geojson'
 
-    # 법정동코드 매핑
-    bjd_map = {
-        '1165010100': '방배동',
-        '1165010200': '방배동',
-        '1165010300': '방배동',
-        '1165010400': '방배동',
-        '1165010500': '서초동',
-        '1165010600': '서초동',
-        '1165010700': '서초동',
-        '1165010800': '서초동',
-        '1165010900': '잠원동',
-        '1165011000': '반포동',
-        '1165011100': '반포동',
-        '1165011200': '반포동',
-        '1165011300': '반포동',
-        '1165011400': '양재동',
-        '1165011500': '내곡동',
-        '1165011600': '내곡동',
-    }
-
     print("📂 GeoJSON 데이터 로드 중...")
     with open(input_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
     print(f"   총 아파트: {len(data['features'])}개")
 
+    # 법정동 이름 (코드표에서 한 번에 조회)
+    dong_names = BjdCodeTable.load().resolve(
+        [str(feature['properties'].get('bjd_cd') or '') for feature in data['features']])['eupmyeondong']
+
+    lots = [feature_lot(feature['properties']) for feature in data['features']]
+    period, recent_prices = load_recent_prices({lot for lot in lots if lot}, store_path)
+    if period:
+        print(f"   최근 면적대별 가격 ({period}): {len(recent_prices)}개 단지")
+
     transformed_features = []
     matched_count = 0
 
-    for feature in data['features']:
+    for feature, lot, dong in zip(data['features'], lots, dong_names):
         props = feature['properties']
-        bjd_cd = props.get('bjd_cd', '')
-        dong = bjd_map.get(bjd_cd[:10], '기타')
+        dong = dong or '기타'
 
         household_count = props.get('household_count')
         if household_count in (None, '', 0):
@@ -131,23 +201,34 @@ def transform_geojson():
                     'floor': trans.get('층', '')
                 })
 
+        if lot in recent_prices:
+            new_props['recent_prices'] = {'period': period, 'bands': recent_prices[lot]}
+
         transformed_features.append({
             'type': 'Feature',
             'geometry': feature['geometry'],
             'properties': new_props
         })
 
-    # 변환된 GeoJSON 저장
-    output_data = {
-        'type': 'FeatureCollection',
-        'features': transformed_features
-    }
+    # 필터 색인 + 지오메트리 페이로드 + 속성 샤드 저장 (공백 없는 JSON + .gz/.br 압축본, 매니페스트 갱신)
+    output_path = Path(output_file)
+    filters, entries = write_filter_index(output_path.parent, output_path.stem, transformed_features,
+                                          FILTER_RANGES, FILTER_SETS)
+    attributes, layer_entries = write_geometry_layer(output_path.parent, output_path.stem,
+                                                     transformed_features, inline_keys=FILTER_KEYS,
+                                                     filters=filters)
+    entries.update(layer_entries)
+    update_manifest(output_path.parent, entries)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    entry = entries[output_path.name]
+    filter_name = f"{FILTER_DIR}/{output_path.stem}.json"
+    shard_bytes = sum(e['size'] for name, e in entries.items() if name not in (output_path.name, filter_name))
 
     print(f"\n✅ 변환 완료!")
     print(f"   저장 위치: {output_file}")
+    print(f"   지오메트리: {entry['size']:,}바이트 (gzip {entry['gzip']:,}바이트)")
+    print(f"   속성 샤드: {len(attributes['shards'])}개, {shard_bytes:,}바이트 (클릭 시 로드)")
+    print(f"   필터 색인: {entries[filter_name]['size']:,}바이트 (gzip {entries[filter_name]['gzip']:,}바이트)")
     print(f"   총 아파트: {len(transformed_features):,}개")
     print(f"   실거래가 매칭: {matched_count:,}개 ({matched_count/len(transformed_features)*100:.1f}%)")
 
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+웹맵 산출물 기록 (사전 압축본 + 콘텐츠 해시 매니페스트)
+
+웹맵 파일을 쓸 때 같은 위치에 `.gz`(항상)와 `.br`(brotli 설치 시) 압축본을 함께
+만들고, 디렉토리의 `manifest.json`에 파일별 콘텐츠 해시와 크기를 기록합니다.
+
+- 정적 서버는 압축본을 그대로 보내면 되므로 요청마다 압축하지 않습니다.
+- 페이지가 `parcels.geojson?v=<해시>`처럼 해시가 붙은 URL로 요청하면
+  내용이 바뀔 때만 URL이 바뀌므로 immutable 캐시 헤더를 쓸 수 있습니다.
+
+사용 예:
+    entry = write_json_asset(webmap_dir / 'parcels.geojson', geojson_data)
+    update_manifest(webmap_dir, {'parcels.geojson': entry})
+    url = asset_url('parcels.geojson', entry)       # 'parcels.geojson?v=3f2a...'
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# URL 버전 파라미터에 쓰는 해시 길이
+URL_HASH_LENGTH = 16
+
+
+def compress_variants(data: bytes) -> Dict[str, bytes]:
+    """{'gzip': ..., 'br': ...} 압축본 (br은 brotli 설치 시에만)"""
+    # mtime=0: 같은 내용이면 같은 .gz 바이트 (재생성 시 불필요한 변경 방지)
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def write_asset(path: Path, data: Union[str, bytes]) -> Dict:
+    """
+    파일과 압축본(.gz/.br)을 함께 기록
+
+    Returns:
+        매니페스트 항목 {'sha256', 'size', 'gzip', 'br'} (압축본 크기, 없으면 None)
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    path.write_bytes(data)
+    entry = {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data), 'gzip': None, 'br': None}
+
+    # 압축본은 원본보다 나중에 써서 수정 시각이 원본 이상이 되도록 함 (서버의 최신 여부 판단)
+    for encoding, compressed in compress_variants(data).items():
+        suffix = '.gz' if encoding == 'gzip' else '.br'
+        path.with_name(path.name + suffix).write_bytes(compressed)
+        entry[encoding] = len(compressed)
+
+    # brotli가 없어진 환경에서 재생성하면 예전 .br이 남지 않도록 정리
+    if entry['br'] is None:
+        stale = path.with_name(path.name + '.br')
+        if stale.exists():
+            stale.unlink()
+
+    return entry
+
+
+def write_json_asset(path: Path, data) -> Dict:
+    """공백 없는 JSON으로 기록 (write_asset 참조)"""
+    return write_asset(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+
+def asset_url(name: str, entry: Dict) -> str:
+    """콘텐츠 해시가 붙은 상대 URL"""
+    return f"{name}?v={entry['sha256'][:URL_HASH_LENGTH]}"
+
+
+def load_manifest(directory: Path) -> Dict:
+    """디렉토리의 매니페스트 ({'files': {상대 경로: 항목}}, 없으면 빈 매니페스트)"""
+    path = Path(directory) / MANIFEST_NAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}}
+    manifest.setdefault('files', {})
+    return manifest
+
+
+def update_manifest(directory: Path, entries: Dict[str, Dict]) -> Path:
+    """
+    매니페스트에 항목 추가/갱신 (다른 스크립트가 쓴 항목은 유지)
+
+    Args:
+        directory: 웹맵 디렉토리
+        entries: {디렉토리 기준 상대 경로: write_asset 반환값}
+    """
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    manifest['files'].update(entries)
+
+    # 지워진 파일 항목 정리
+    manifest['files'] = {name: entry for name, entry in sorted(manifest['files'].items())
+                         if (directory / name).exists()}
+
+    path = directory / MANIFEST_NAME
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def manifest_hash(directory: Path, name: str) -> Optional[str]:
+    """매니페스트에 기록된 파일의 sha256 (없으면 None)"""
+    entry = load_manifest(directory)['files'].get(name)
+    return entry['sha256'] if entry else None
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+웹맵 지오메트리/속성 분리 기록 (화면 범위 청크 + 속성 샤드)
+
+웹맵이 처음 받는 데이터를 그리기에 필요한 것으로 줄이기 위해, 레이어를
+지오메트리 위주 페이로드와 피처 id 범위별 속성 샤드로 나누어 기록합니다.
+큰 레이어는 경위도 격자 셀 단위 청크로도 나눕니다.
+
+    <webmap>/<레이어>.geojson                 지오메트리 + Feature id + 그리기/필터용 속성만
+    <webmap>/attrs/<레이어>/<시작 id>.json    {id: 전체 속성} (id 범위 SHARD_SIZE개 단위)
+    <webmap>/chunks/<레이어>/index.json       청크 목록 (셀별 실제 범위, 피처 수, URL)
+    <webmap>/chunks/<레이어>/<cx>_<cy>.json   청크 GeoJSON (레이어 페이로드와 같은 형식)
+
+지오메트리 페이로드와 청크 색인에는 샤드 위치가 "attributes" 멤버로 들어 있어
+페이지는 클릭한 피처의 속성을 다음 URL에서 가져오면 됩니다:
+    attributes.shards[Math.floor(feature.id / attributes.shard_size)][feature.id]
+
+청크에서 피처는 bbox 중심이 속한 셀 하나에만 들어가므로 중복 전송이 없고,
+청크 범위는 구성 피처 bbox의 합집합이라 셀 경계에 걸친 피처도 누락되지 않습니다.
+"""
+
+import math
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from webmap_assets import asset_url, write_json_asset
+
+# 청크당 평균 피처 수 목표
+CHUNK_TARGET = 2000
+
+# 속성 샤드당 피처 수
+SHARD_SIZE = 1000
+
+# 화면에 이보다 많은 청크가 걸치면 웹맵은 필지 대신 청크 윤곽만 표시
+MAX_VISIBLE_CHUNKS = 64
+
+# 청크 셀 최소 크기 (도, 약 200m) - 너무 잘게 나뉘어 요청 수가 늘지 않도록
+MIN_CELL_DEGREES = 0.002
+
+CHUNK_DIR = 'chunks'
+ATTR_DIR = 'attrs'
+
+
+def geometry_bbox(geometry: Optional[Dict]) -> Optional[Tuple[float, float, float, float]]:
+    """GeoJSON geometry의 bbox (좌표가 없으면 None)"""
+    if not geometry:
+        return None
+    box = [math.inf, math.inf, -math.inf, -math.inf]
+
+    def walk(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            box[0], box[1] = min(box[0], coords[0]), min(box[1], coords[1])
+            box[2], box[3] = max(box[2], coords[0]), max(box[3], coords[1])
+            return
+        for item in coords:
+            walk(item)
+
+    walk(geometry.get('coordinates') or [])
+    return tuple(box) if box[0] != math.inf else None
+
+
+def _union(a: Optional[List[float]], b: Sequence[float]) -> List[float]:
+    if a is None:
+        return list(b)
+    return [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+
+
+def _reset_dir(directory: Path):
+    """이전 실행의 청크/샤드 정리 (셀 구성이 바뀌면 남은 파일이 섞이지 않도록)"""
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+
+def chunk_cell_size(bboxes: List[Tuple[float, float, float, float]],
+                    target: int = CHUNK_TARGET) -> float:
+    """전체 범위와 피처 수로 청크 셀 크기(도) 결정"""
+    extent = None
+    for box in bboxes:
+        extent = _union(extent, box)
+    if extent is None:
+        return MIN_CELL_DEGREES
+    area = max(extent[2] - extent[0], 1e-9) * max(extent[3] - extent[1], 1e-9)
+    return max(math.sqrt(area * target / len(bboxes)), MIN_CELL_DEGREES)
+
+
+def write_attribute_shards(directory: Path, layer: str, attributes: List[Dict],
+                           shard_size: int = SHARD_SIZE) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    속성을 id 범위별 샤드로 기록 (id = attributes 목록 순서)
+
+    Returns:
+        (샤드 정보 {'shard_size', 'shards': URL 목록 - 샤드 번호 순}, 매니페스트 항목)
+    """
+    directory = Path(directory)
+    _reset_dir(directory / ATTR_DIR / layer)
+
+    urls = []
+    entries = {}
+    for start in range(0, len(attributes), shard_size):
+        shard = {str(i): attributes[i] for i in range(start, min(start + shard_size, len(attributes)))}
+        name = f"{ATTR_DIR}/{layer}/{start}.json"
+        entries[name] = write_json_asset(directory / name, shard)
+        urls.append(asset_url(name, entries[name]))
+    return {'shard_size': shard_size, 'shards': urls}, entries
+
+
+def slim_feature(feature_id: int, feature: Dict, inline_keys: Sequence[str]) -> Dict:
+    """지오메트리 + Feature id + inline_keys 속성만 남긴 피처"""
+    props = feature.get('properties') or {}
+    return {'type': 'Feature', 'id': feature_id, 'geometry': feature.get('geometry'),
+            'properties': {key: props.get(key) for key in inline_keys}}
+
+
+def write_geometry_layer(directory: Path, layer: str, features: List[Dict],
+                         inline_keys: Sequence[str] = ('category',),
+                         shard_size: int = SHARD_SIZE,
+                         filters: Optional[Dict] = None) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    레이어를 지오메트리 페이로드(<레이어>.geojson) + 속성 샤드로 기록
+
+    Args:
+        directory: 웹맵 디렉토리
+        layer: 레이어 이름 (파일명)
+        features: GeoJSON Feature 목록 (목록 순서가 피처 id)
+        inline_keys: 페이로드에 남길 속성 (스타일/필터에 필요한 것만)
+        shard_size: 속성 샤드당 피처 수
+        filters: 필터 색인 위치 (webmap_filters.write_filter_index 반환값, 있으면 "filters" 멤버)
+
+    Returns:
+        (샤드 정보, 매니페스트 항목 {상대 경로: 항목})
+    """
+    directory = Path(directory)
+    attributes, entries = write_attribute_shards(
+        directory, layer, [feature.get('properties') or {} for feature in features], shard_size)
+
+    payload = {'type': 'FeatureCollection', 'attributes': attributes}
+    if filters:
+        payload['filters'] = filters
+    payload['features'] = [slim_feature(i, feature, inline_keys) for i, feature in enumerate(features)]
+
+    name = f"{layer}.geojson"
+    entries[name] = write_json_asset(directory / name, payload)
+    return attributes, entries
+
+
+def write_viewport_chunks(directory: Path, layer: str, features: List[Dict],
+                          attributes: Dict, inline_keys: Sequence[str] = ('category',),
+                          target: int = CHUNK_TARGET) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    피처를 화면 범위 청크로 기록
+
+    Args:
+        directory: 웹맵 디렉토리
+        layer: 레이어 이름
+        features: EPSG:4326 GeoJSON Feature 목록 (목록 순서가 피처 id)
+        attributes: write_geometry_layer가 반환한 샤드 정보
+        inline_keys: 청크에 남길 속성 (지도 스타일에 필요한 것만)
+        target: 청크당 평균 피처 수 목표
+
+    Returns:
+        (청크 색인, 매니페스트 항목 {상대 경로: 항목})
+    """
+    directory = Path(directory)
+    chunk_dir = f"{CHUNK_DIR}/{layer}"
+    bboxes = [geometry_bbox(feature.get('geometry')) for feature in features]
+    cell = chunk_cell_size([box for box in bboxes if box], target)
+
+    # bbox 중심이 속한 셀에 배정
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i, box in enumerate(bboxes):
+        if box is None:
+            continue
+        key = (math.floor((box[0] + box[2]) / 2 / cell), math.floor((box[1] + box[3]) / 2 / cell))
+        cells.setdefault(key, []).append(i)
+
+    _reset_dir(directory / chunk_dir)
+    entries = {}
+    chunks = []
+    extent = None
+    for (cx, cy), members in sorted(cells.items()):
+        chunk_bbox = None
+        for i in members:
+            chunk_bbox = _union(chunk_bbox, bboxes[i])
+        chunk_features = [slim_feature(i, features[i], inline_keys) for i in members]
+
+        name = f"{chunk_dir}/{cx}_{cy}.json"
+        entries[name] = write_json_asset(directory / name, {'type': 'FeatureCollection',
+                                                            'features': chunk_features})
+        chunks.append({'id': f"{cx}_{cy}", 'bbox': [round(v, 7) for v in chunk_bbox],
+                       'count': len(members), 'url': asset_url(name, entries[name])})
+        extent = _union(extent, chunk_bbox)
+
+    index = {
+        'count': len(features),
+        'bounds': extent,
+        'cell_degrees': cell,
+        'attributes': attributes,
+        'chunks': chunks,
+    }
+    name = f"{chunk_dir}/index.json"
+    entries[name] = write_json_asset(directory / name, index)
+    return index, entries
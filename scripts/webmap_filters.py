@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+웹맵 필터 색인 (범위 필터 정렬 배열 + 값별 비트셋)
+
+아파트 웹맵은 슬라이더를 움직일 때마다 모든 피처의 속성을 검사합니다(applyFilters).
+내보내기 단계에서 필터 색인을 미리 만들어 두면 페이지는 범위 조건을 이진 탐색으로,
+법정동 같은 값 조건을 비트셋으로 풀고 후보 피처만 확인하면 됩니다.
+
+    <webmap>/filters/<레이어>.json
+
+    {
+      "count": 피처 수,
+      "ranges": {
+        "<속성>": {
+          "unit": 슬라이더 단위 (값 = 속성 / unit),
+          "bounds": [floor(최소), ceil(최대)] - 슬라이더 기본 범위,
+          "ids": 값이 있는 피처 id (값 오름차순, 같은 값은 id 순),
+          "values": ids 순서의 값,
+          "missing": 값이 없는 피처 id (0/빈 값, missing_as_zero면 빈 목록),
+          "offset_base", "offset_step",
+          "offsets": offsets[k] = values 중 offset_base + k * offset_step 미만인 개수
+        }
+      },
+      "sets": {"<속성>": {"<값>": 비트셋 (base64, 바이트 i의 비트 j = 피처 id 8i + j)}}
+    }
+
+범위 [lo, hi]의 피처는 values에서 lo 이상 첫 위치와 hi 초과 첫 위치 사이의 ids입니다.
+오프셋 표로 lo/hi가 속한 구간을 바로 찾고 그 구간 안에서만 이진 탐색합니다.
+피처 id는 레이어 페이로드(webmap_chunks.write_geometry_layer)의 Feature id와 같은 목록 순서입니다.
+"""
+
+import base64
+import math
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from webmap_assets import asset_url, write_json_asset
+
+FILTER_DIR = 'filters'
+
+# 오프셋 표 최대 구간 수 (구간 폭은 슬라이더 단위의 정수배)
+OFFSET_BUCKETS = 256
+
+
+def _is_missing(value) -> bool:
+    """웹맵 필터와 같은 기준 (0, 빈 값, None은 값 없음)"""
+    return not value or (isinstance(value, float) and math.isnan(value))
+
+
+def encode_bitset(ids: Sequence[int], count: int) -> str:
+    """피처 id 목록 → 비트셋 base64 (count비트, 바이트 i의 비트 j = id 8i + j)"""
+    bits = bytearray((count + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode('ascii')
+
+
+def decode_bitset(data: str) -> List[int]:
+    """비트셋 base64 → 피처 id 목록 (오름차순)"""
+    bits = base64.b64decode(data)
+    return [i * 8 + j for i, byte in enumerate(bits) if byte for j in range(8) if byte >> j & 1]
+
+
+def range_index(values: Sequence, unit: float = 1, missing_as_zero: bool = False) -> Dict:
+    """
+    범위 필터 색인 (값 = 속성 / unit)
+
+    Args:
+        values: 피처 id 순서의 속성 값
+        unit: 슬라이더 단위 (예: 평당가 원 → 만원이면 10000)
+        missing_as_zero: 값이 없으면 0으로 범위 검사 (거래건수처럼)
+    """
+    present = []
+    missing = []
+    for i, value in enumerate(values):
+        if _is_missing(value):
+            if missing_as_zero:
+                present.append((0, i))
+            else:
+                missing.append(i)
+            continue
+        present.append((value / unit if unit != 1 else value, i))
+    present.sort()
+
+    sorted_values = [value for value, _ in present]
+    index = {
+        'unit': unit,
+        'bounds': [math.floor(sorted_values[0]), math.ceil(sorted_values[-1])] if present else [0, 0],
+        'ids': [i for _, i in present],
+        'values': sorted_values,
+        'missing': missing,
+    }
+
+    # 오프셋 표: 기본 범위를 OFFSET_BUCKETS개 이하의 정수 폭 구간으로
+    base, top = index['bounds']
+    step = max(1, math.ceil((top - base) / OFFSET_BUCKETS))
+    offsets = []
+    position = 0
+    for k in range((top - base) // step + 2):
+        edge = base + k * step
+        while position < len(sorted_values) and sorted_values[position] < edge:
+            position += 1
+        offsets.append(position)
+    index.update({'offset_base': base, 'offset_step': step, 'offsets': offsets})
+    return index
+
+
+def set_index(values: Sequence, count: int) -> Dict[str, str]:
+    """값 필터 색인 {값: 비트셋} (값이 없는 피처는 제외)"""
+    members: Dict[str, List[int]] = {}
+    for i, value in enumerate(values):
+        if value not in (None, ''):
+            members.setdefault(str(value), []).append(i)
+    return {value: encode_bitset(ids, count) for value, ids in sorted(members.items())}
+
+
+def build_filter_index(features: List[Dict], ranges: Mapping[str, Tuple[float, bool]],
+                       sets: Sequence[str] = ()) -> Dict:
+    """
+    피처 목록 → 필터 색인
+
+    Args:
+        features: GeoJSON Feature 목록 (목록 순서가 피처 id)
+        ranges: {속성: (슬라이더 단위, 값이 없으면 0으로 볼지)}
+        sets: 값 비트셋을 만들 속성
+    """
+    props = [feature.get('properties') or {} for feature in features]
+    return {
+        'count': len(features),
+        'ranges': {key: range_index([p.get(key) for p in props], unit, missing_as_zero)
+                   for key, (unit, missing_as_zero) in ranges.items()},
+        'sets': {key: set_index([p.get(key) for p in props], len(features)) for key in sets},
+    }
+
+
+def write_filter_index(directory: Path, layer: str, features: List[Dict],
+                       ranges: Mapping[str, Tuple[float, bool]],
+                       sets: Sequence[str] = ()) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    필터 색인을 filters/<레이어>.json으로 기록
+
+    Returns:
+        (페이로드에 넣을 위치 정보 {'url'}, 매니페스트 항목 {상대 경로: 항목})
+    """
+    directory = Path(directory)
+    (directory / FILTER_DIR).mkdir(parents=True, exist_ok=True)
+
+    name = f"{FILTER_DIR}/{layer}.json"
+    entries = {name: write_json_asset(directory / name, build_filter_index(features, ranges, sets))}
+    return {'url': asset_url(name, entries[name])}, entries
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+웹맵 로컬 서버 (캐시 검증 + 사전 압축 + 범위별 피처 질의)
+
+`python -m http.server`를 대체합니다.
+- 정적 파일에 ETag/Last-Modified를 붙이고 If-None-Match/If-Modified-Since에 304로 응답
+  (ETag는 보내는 인코딩마다 다름: "<태그>", "<태그>-gz", "<태그>-br")
+  (Cache-Control: no-cache → 매번 재검증하므로 Ctrl+F5 없이도 새 출력이 보임)
+- `<파일>.br` / `<파일>.gz`가 있으면 Accept-Encoding에 맞춰 그대로 전송,
+  없으면 텍스트 파일은 gzip으로 한 번 압축해 메모리에 캐시
+- `?v=<해시>`가 manifest.json의 콘텐츠 해시와 같으면 immutable로 1년 캐시
+- 루트 아래 GeoJSON 파일마다 피처 bbox 격자 색인을 만들어
+  범위(bbox) 질의와 타일 요청으로 화면에 보이는 피처만 전송
+
+사용법:
+    python scripts/webmap_server.py                       # output/webmap, 포트 8000
+    python scripts/webmap_server.py --root output/jubulli/webmap --port 8080
+
+엔드포인트 (레이어 이름 = 루트 기준 GeoJSON 경로에서 확장자 제외):
+    GET /<파일 경로>                                    정적 파일
+    GET /api/layers                                      레이어 목록 (피처 수, 범위)
+    GET /api/features/<레이어>?bbox=minLon,minLat,maxLon,maxLat[&limit=N]
+    GET /api/tiles/<레이어>/<z>/<x>/<y>.geojson          XYZ 타일 범위의 피처
+"""
+
+import argparse
+import email.utils
+import gzip
+import json
+import math
+import mimetypes
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import OUTPUT_DIR
+from spatial_index import GridIndex
+from webmap_assets import MANIFEST_NAME, URL_HASH_LENGTH, load_manifest
+from webmap_chunks import geometry_bbox
+
+DEFAULT_PORT = 8000
+
+# 즉석 gzip 대상 (이미 압축된 이미지 등은 제외)
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/geo+json',
+                      'application/javascript', 'image/svg+xml')
+MIN_COMPRESS_BYTES = 1024
+
+# 한 번의 범위 질의로 보내는 최대 피처 수 (기본값)
+DEFAULT_FEATURE_LIMIT = 20000
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+mimetypes.add_type('application/geo+json', '.geojson')
+mimetypes.add_type('application/javascript', '.js')
+
+
+def file_etag(stat) -> str:
+    """파일 크기 + 수정 시각 기반 ETag"""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+# Content-Encoding → ETag 접미사
+ETAG_ENCODING_SUFFIX = {'br': 'br', 'gzip': 'gz'}
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """표현별 ETag (같은 URL의 원본/gzip/br 응답이 서로 다른 ETag를 갖도록 인코딩을 붙임)"""
+    if not encoding:
+        return etag
+    return f'"{etag.strip(chr(34))}-{ETAG_ENCODING_SUFFIX[encoding]}"'
+
+
+def tile_bbox(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """XYZ 타일의 경위도 범위 (minLon, minLat, maxLon, maxLat)"""
+    n = 2 ** z
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return (x / n * 360 - 180, lat(y + 1), (x + 1) / n * 360 - 180, lat(y))
+
+
+def feature_limit(params: Dict) -> int:
+    """limit 파라미터 (0 이상의 정수, 없으면 DEFAULT_FEATURE_LIMIT). 잘못된 값은 ValueError → 400"""
+    try:
+        limit = int(params.get('limit', DEFAULT_FEATURE_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError(f"limit 값은 정수여야 합니다: {params.get('limit')!r}")
+    if limit < 0:
+        raise ValueError(f"limit 값은 0 이상이어야 합니다: {limit}")
+    return limit
+
+
+class FeatureLayer:
+    """GeoJSON 파일 하나의 피처 + bbox 격자 색인 (파일이 바뀌면 다시 로드)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = None
+        self.features: List[bytes] = []
+        self.grid: Optional[GridIndex] = None
+        self.attributes: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self):
+        """파일 수정 시각이 바뀌었으면 다시 읽어 색인"""
+        version = file_etag(self.path.stat())
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            features = []
+            bboxes = []
+            nan_box = [math.nan] * 4
+            for feature in data.get('features', []):
+                bboxes.extend(geometry_bbox(feature.get('geometry')) or nan_box)
+                # 응답 시 다시 직렬화하지 않도록 피처 단위 압축 JSON으로 보관
+                features.append(json.dumps(feature, ensure_ascii=False,
+                                           separators=(',', ':')).encode('utf-8'))
+
+            self.features, self.grid, self.version = features, GridIndex(bboxes), version
+            # 속성 샤드 위치 (webmap_chunks.write_geometry_layer 출력이면)
+            self.attributes = data.get('attributes')
+            print(f"✓ 레이어 색인: {self.path.name} ({len(features):,}개 피처)")
+
+    def query(self, bbox: Tuple[float, float, float, float], limit: int) -> Tuple[bytes, int]:
+        """범위와 겹치는 피처의 FeatureCollection 바이트와 전체 매칭 수"""
+        self.ensure_loaded()
+        idxs = self.grid.query(*bbox)
+        body = b'{"type":"FeatureCollection","features":[' + \
+            b','.join(self.features[i] for i in idxs[:limit]) + b']}'
+        return body, len(idxs)
+
+
+class WebmapServer(ThreadingHTTPServer):
+    """정적 파일 + 레이어 질의 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address, root: Path, verbose: bool = False):
+        super().__init__(address, WebmapRequestHandler)
+        self.root = root.resolve()
+        self.verbose = verbose
+        self.layers: Dict[str, FeatureLayer] = {}
+        self.gzip_cache: Dict[Path, Tuple[str, bytes]] = {}
+        self.manifests: Dict[Path, Tuple[int, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def layer(self, name: str) -> Optional[FeatureLayer]:
+        """레이어 이름 → FeatureLayer (루트 밖 경로/없는 파일은 None)"""
+        path = self.resolve_path(name + '.geojson')
+        if path is None:
+            return None
+        with self._lock:
+            if name not in self.layers:
+                self.layers[name] = FeatureLayer(path)
+            return self.layers[name]
+
+    def resolve_path(self, rel: str) -> Optional[Path]:
+        """요청 경로를 루트 안의 실제 파일로 변환"""
+        path = (self.root / rel.lstrip('/')).resolve()
+        try:
+            path.relative_to(self.root)
+        except ValueError:
+            return None
+        if path.is_dir():
+            path = path / 'index.html'
+        return path if path.is_file() else None
+
+    def content_hash(self, path: Path) -> Optional[str]:
+        """가장 가까운 상위 manifest.json에 기록된 파일 해시 (수정 시각별 캐시)"""
+        for directory in path.parents:
+            manifest_path = directory / MANIFEST_NAME
+            try:
+                mtime = manifest_path.stat().st_mtime_ns
+            except OSError:
+                if directory == self.root:
+                    return None
+                continue
+            cached = self.manifests.get(manifest_path)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, load_manifest(directory)['files'])
+                self.manifests[manifest_path] = cached
+            entry = cached[1].get(path.relative_to(directory).as_posix())
+            return entry['sha256'] if entry else None
+        return None
+
+    def gzipped(self, path: Path, etag: str) -> bytes:
+        """텍스트 파일 즉석 gzip (수정 시각별 메모리 캐시)"""
+        cached = self.gzip_cache.get(path)
+        if cached and cached[0] == etag:
+            return cached[1]
+        data = gzip.compress(path.read_bytes(), compresslevel=6)
+        self.gzip_cache[path] = (etag, data)
+        return data
+
+
+class WebmapRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD 요청 처리"""
+
+    server_version = 'CadastralWebmap/1.0'
+
+    def do_HEAD(self):
+        self._dispatch(head=True)
+
+    def do_GET(self):
+        self._dispatch(head=False)
+
+    def _dispatch(self, head: bool):
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if path == '/api/layers':
+                self._send_json(self._layers(), head)
+            elif path.startswith('/api/features/'):
+                self._features(path[len('/api/features/'):], params, head)
+            elif path.startswith('/api/tiles/'):
+                self._tile(path[len('/api/tiles/'):], params, head)
+            else:
+                self._static(path, head, params.get('v'))
+        except ValueError as e:
+            self._send_json({'error': str(e)}, head, status=HTTPStatus.BAD_REQUEST)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    # ------------------------------------------------------------------
+    # 정적 파일
+
+    def _accepts(self, encoding: str) -> bool:
+        accepted = self.headers.get('Accept-Encoding', '')
+        return any(part.split(';')[0].strip() == encoding for part in accepted.split(','))
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match == '*'
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def _static(self, path: str, head: bool, version: Optional[str] = None):
+        file_path = self.server.resolve_path(path)
+        if file_path is None:
+            self._send_json({'error': f'파일 없음: {path}'}, head, status=HTTPStatus.NOT_FOUND)
+            return
+
+        stat = file_path.stat()
+        etag = file_etag(stat)
+        content_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type.endswith('json'):
+            content_type += '; charset=utf-8'
+
+        # 보낼 표현: 사전 압축본 (원본보다 오래되었으면 무시) → 즉석 gzip → 원본
+        encoding, variant = None, None
+        for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+            candidate = file_path.with_name(file_path.name + suffix)
+            if self._accepts(name) and candidate.is_file() and \
+                    candidate.stat().st_mtime_ns >= stat.st_mtime_ns:
+                encoding, variant = name, candidate
+                break
+        if encoding is None and self._accepts('gzip') and stat.st_size >= MIN_COMPRESS_BYTES and \
+                content_type.startswith(COMPRESSIBLE_TYPES):
+            encoding = 'gzip'
+
+        headers = {
+            'ETag': encoded_etag(etag, encoding),
+            'Last-Modified': email.utils.formatdate(stat.st_mtime, usegmt=True),
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+        if version:
+            # 해시가 붙은 URL은 내용이 바뀌면 URL도 바뀜 → 재검증 불필요
+            content_hash = self.server.content_hash(file_path)
+            if content_hash and len(version) >= 8 and \
+                    content_hash[:URL_HASH_LENGTH].startswith(version):
+                headers['Cache-Control'] = IMMUTABLE_CACHE
+        if self._not_modified(headers['ETag'], stat.st_mtime):
+            self._send(HTTPStatus.NOT_MODIFIED, headers, b'', head=True)
+            return
+
+        headers['Content-Type'] = content_type
+        if variant is not None:
+            body = variant.read_bytes()
+        elif encoding:
+            body = self.server.gzipped(file_path, etag)
+        else:
+            body = file_path.read_bytes()
+        if encoding:
+            headers['Content-Encoding'] = encoding
+
+        self._send(HTTPStatus.OK, headers, body, head)
+
+    # ------------------------------------------------------------------
+    # 레이어 질의
+
+    def _layers(self) -> Dict:
+        layers = []
+        for path in sorted(self.server.root.rglob('*.geojson')):
+            name = path.relative_to(self.server.root).with_suffix('').as_posix()
+            layer = self.server.layer(name)
+            layer.ensure_loaded()
+            layers.append({'name': name, 'features': len(layer.features),
+                           'extent': list(layer.grid.extent) if layer.grid.extent else None,
+                           'attributes': layer.attributes})
+        return {'layers': layers}
+
+    def _get_layer(self, name: str, head: bool) -> Optional[FeatureLayer]:
+        layer = self.server.layer(name)
+        if layer is None:
+            self._send_json({'error': f'레이어 없음: {name}'}, head, status=HTTPStatus.NOT_FOUND)
+        return layer
+
+    def _features(self, name: str, params: Dict, head: bool):
+        layer = self._get_layer(name, head)
+        if layer is None:
+            return
+        try:
+            bbox = tuple(float(v) for v in params['bbox'].split(','))
+            if len(bbox) != 4:
+                raise ValueError
+        except (KeyError, ValueError):
+            raise ValueError('bbox=minLon,minLat,maxLon,maxLat 형식이 필요합니다')
+        limit = feature_limit(params)
+        self._send_layer(layer, bbox, limit, head)
+
+    def _tile(self, rest: str, params: Dict, head: bool):
+        try:
+            name, z, x, y = rest.rsplit('/', 3)
+            z, x, y = int(z), int(x), int(y.split('.')[0])
+        except ValueError:
+            raise ValueError('타일 경로는 /api/tiles/<레이어>/<z>/<x>/<y>.geojson 형식입니다')
+        layer = self._get_layer(name, head)
+        if layer is None:
+            return
+        limit = feature_limit(params)
+        self._send_layer(layer, tile_bbox(z, x, y), limit, head)
+
+    def _send_layer(self, layer: FeatureLayer, bbox: Tuple, limit: int, head: bool):
+        layer.ensure_loaded()
+        # 레이어 파일 버전 + 질의 범위 + 받는 인코딩이 같으면 응답도 같음
+        # (gzip 여부는 응답 크기로 정해지지만 같은 질의면 크기도 같음)
+        accepts_gzip = self._accepts('gzip')
+        etag = encoded_etag(f'"{layer.version.strip(chr(34))}-{hash((bbox, limit)) & 0xffffffff:x}"',
+                            'gzip' if accepts_gzip else None)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if self.headers.get('If-None-Match') == etag:
+            self._send(HTTPStatus.NOT_MODIFIED, headers, b'', head=True)
+            return
+
+        body, total = layer.query(bbox, limit)
+        headers['Content-Type'] = 'application/geo+json; charset=utf-8'
+        headers['X-Feature-Count'] = str(total)
+        if accepts_gzip and len(body) >= MIN_COMPRESS_BYTES:
+            headers['Content-Encoding'] = 'gzip'
+            body = gzip.compress(body, compresslevel=5)
+        self._send(HTTPStatus.OK, headers, body, head)
+
+    # ------------------------------------------------------------------
+    # 응답
+
+    def _send_json(self, data: Dict, head: bool, status=HTTPStatus.OK):
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._send(status, {'Content-Type': 'application/json; charset=utf-8',
+                            'Cache-Control': 'no-cache'}, body, head)
+
+    def _send(self, status, headers: Dict[str, str], body: bytes, head: bool):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='웹맵 로컬 서버 (ETag/사전 압축/범위 질의)')
+    parser.add_argument('--root', '-r', default=str(OUTPUT_DIR / 'webmap'),
+                        help='서비스할 디렉토리 (기본값: output/webmap)')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT,
+                        help=f'포트 (기본값: {DEFAULT_PORT})')
+    parser.add_argument('--verbose', '-v', action='store_true', help='요청 로그 출력')
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"❌ 디렉토리를 찾을 수 없습니다: {root}")
+        return 1
+
+    server = WebmapServer((args.host, args.port), root, verbose=args.verbose)
+    print("=" * 70)
+    print("웹맵 로컬 서버 시작")
+    print("=" * 70)
+    print(f"\n📂 루트: {server.root}")
+    print(f"🌐 서버 주소: http://{args.host}:{args.port}")
+    print("   종료: Ctrl+C\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())